@@ -17,7 +17,7 @@ def gen_id():
     return randint(1, 2147483647)
 def gen_priority():
     return randint(1, 100)
-def generate(length, serial):
+def generate(length, serial, path="stdin.txt"):
     ans = []
     time_ans = []
     if(HW == 1):
@@ -46,7 +46,7 @@ def generate(length, serial):
             time_ans.append(float(format(uniform(1.0, 2.0), '.1f')))
             ans.append()
         time_ans.sort()
-    f = open("stdin.txt", "w")
+    f = open(path, "w")
     for i in range(length):
         f.write('[' + str(time_ans[i]) + ']'+str(nique_ids[i]) + ans[i])
     f.close()
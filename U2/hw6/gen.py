@@ -32,7 +32,7 @@ def gen_time():
 # [0.8]SCHE-6-0.2-F1
 # [1.2]417-PRI-15-FROM-B2-TO-B4
 
-def generate(length, serial):
+def generate(length, serial, path="stdin.txt"):
     ans = []
     time_ans = []
     combined = []
@@ -71,7 +71,7 @@ def generate(length, serial):
         """ print(combined)
         print("\n") """
         combined.sort(key=lambda x: float(x.split(']')[0][1:]))        
-    f = open("stdin.txt", "w")
+    f = open(path, "w")
     for i in range(length):
             f.write(combined[i])
     f.close()
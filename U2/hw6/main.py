@@ -1,6 +1,9 @@
 import os
 import time
+import shutil
+import subprocess
 import traceback
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
 from prettytable import PrettyTable
 
@@ -9,43 +12,116 @@ import Checker
 
 LENGTH = 60
 SERIAL = 50
+MAX_THREAD = os.cpu_count() or 4
+MAX_TIME_LIMIT = 120
+# False: 与原来一样在第一个失败用例处停止（未开始的运行会被取消）；True: 跑完全部用例
+CONTINUE_ON_FAIL = False
+EXE_PATH = os.path.abspath('datainput_student_win64.exe')
+WORK_DIR = 'work'  # 每个(用例, jar)在 work/<用例>/<jar>/ 下独立运行，互不共享 stdin.txt/output.txt
+
+def run_jar(file_name, i):
+    """在独立工作目录中运行一个jar并检查，返回结果表格的一行。"""
+    workdir = os.path.join(WORK_DIR, str(i), file_name)
+    os.makedirs(workdir, exist_ok=True)
+    shutil.copyfile(f'in/{i}/stdin.txt', os.path.join(workdir, 'stdin.txt'))
+    output_path = os.path.join(workdir, 'output.txt')
+    print(f'case{i}: running jar: {file_name}...')
+    error = None
+    with open(output_path, 'w') as fout:
+        exe_proc = subprocess.Popen([EXE_PATH], cwd=workdir, stdout=subprocess.PIPE)
+        jar_proc = subprocess.Popen(['java', '-jar', os.path.abspath(f'jar/{file_name}')],
+                                    stdin=exe_proc.stdout, stdout=fout)
+        exe_proc.stdout.close()
+        try:
+            jar_proc.wait(timeout=MAX_TIME_LIMIT)
+        except subprocess.TimeoutExpired:
+            jar_proc.kill()
+            exe_proc.kill()
+            jar_proc.wait()
+            error = f"Time limit exceeded ({MAX_TIME_LIMIT}s).\n"
+        exe_proc.wait()
+    if error is None:
+        try:
+            performanceInfo = Checker.check(os.path.join(workdir, 'stdin.txt'), output_path)
+        except Exception:
+            error = traceback.format_exc()
+    if error is not None:
+        print(f"case{i}: {file_name} failed.\n{error}")
+        with open(f"judge_result/test{i}_errorInfo_{file_name}.txt", mode='w') as f:
+            f.write("Fail.\n")
+            f.write(error)
+        return [file_name, "Fail", "N/A", "N/A", "N/A"]
+    print(f"case{i}: {file_name} passed.")
+    return [file_name, "Pass", format(performanceInfo[0], ".4f"), format(performanceInfo[1], ".4f"), format(performanceInfo[2], ".2f")]
+
 def test(length, total_case, file_name_list):
+    os.makedirs('judge_result', exist_ok=True)
+    # gen 依赖模块级状态，输入数据按顺序生成，只有运行与检查并行
+    print('generate input...')
     for i in range(total_case):
-        print(f'testcase:{i}.')
-        print('generate input...')
-        gen.generate(length,i)
-        time.sleep(0.02)
+        os.makedirs(f'in/{i}', exist_ok=True)
+        gen.generate(length, i, f'in/{i}/stdin.txt')
 
-        allPassed = True
-        table = PrettyTable(['file_name', 'state','systemRunTime','avgTaskCompleteTime','powerConsumption'])
-
-        for file_name in file_name_list:
-            print(f'running jar: {file_name}...')
-            os.system(f'datainput_student_win64.exe | java -jar jar/{file_name} > output.txt')
-            time.sleep(0.2)
-            print("check vadility...")
+    results = {i: {} for i in range(total_case)}
+    stopped = False
+    stop_case = total_case  # 失败后只取消此用例之后的运行，同一用例的其他jar照常跑完
+    with ThreadPoolExecutor(max_workers=MAX_THREAD) as executor:
+        futures = {executor.submit(run_jar, file_name, i): (i, file_name)
+                   for i in range(total_case) for file_name in file_name_list}
+        for future in as_completed(futures):
+            i, file_name = futures[future]
+            if future.cancelled():
+                continue
             try:
-                performanceInfo = Checker.check("stdin.txt", "output.txt")
-            except Exception as exc:
+                row = future.result()
+            except Exception:
                 print(traceback.format_exc())
-                print(f"{file_name} failed.")
-                table.add_row([file_name, "Fail", "N/A", "N/A", "N/A"])
-                with open(f"judge_result/test{i}_errorInfo_{file_name}.txt", mode='w') as f:
-                    f.write("Fail.\n")
-                    f.write(traceback.format_exc())
-                allPassed = False
+                row = [file_name, "Fail", "N/A", "N/A", "N/A"]
+            results[i][file_name] = row
+            if row[1] == "Fail" and not CONTINUE_ON_FAIL and i < stop_case:
+                stopped = True
+                stop_case = i
+                for pending, (case, _) in futures.items():
+                    if case > stop_case:
+                        pending.cancel()
+
+    # 每个jar的汇总: [pass, fail, total_rt, total_tct, total_pc]
+    summary = {file_name: [0, 0, 0.0, 0.0, 0.0] for file_name in file_name_list}
+    for i in range(total_case):
+        if not results[i]:
+            continue  # 停止后被取消的用例
+        table = PrettyTable(['file_name', 'state','systemRunTime','avgTaskCompleteTime','powerConsumption'])
+        for file_name in file_name_list:
+            row = results[i].get(file_name, [file_name, "Cancelled", "N/A", "N/A", "N/A"])
+            table.add_row(row)
+            if row[1] == "Cancelled":
+                continue
+            if row[1] == "Pass":
+                summary[file_name][0] += 1
+                summary[file_name][2] += float(row[2])
+                summary[file_name][3] += float(row[3])
+                summary[file_name][4] += float(row[4])
             else:
-                print(f"{file_name} passed.")
-                table.add_row([file_name, "Pass", format(performanceInfo[0], ".4f"), format(performanceInfo[1], ".4f"), format(performanceInfo[2], ".2f")])
+                summary[file_name][1] += 1
         with open(f"judge_result/test{i}_table.txt", mode='w') as f:
             f.write(table.get_string())
+        print(f'testcase {i}:')
         print(table)
-        print(f'testcase {i} end.')
 
-        if (not allPassed):
-            break
+    final_table = PrettyTable(['file_name', 'pass', 'fail', 'avg_systemRunTime', 'avg_avgTaskCompleteTime', 'avg_powerConsumption'])
+    for file_name, (passed, failed, total_rt, total_tct, total_pc) in summary.items():
+        if passed:
+            final_table.add_row([file_name, passed, failed, format(total_rt / passed, ".4f"),
+                                 format(total_tct / passed, ".4f"), format(total_pc / passed, ".2f")])
+        else:
+            final_table.add_row([file_name, passed, failed, "N/A", "N/A", "N/A"])
+    with open("final_table.txt", mode='w') as f:
+        f.write(final_table.get_string())
+    print(final_table)
+    if stopped:
+        print("stopped after the first failure (set CONTINUE_ON_FAIL = True to run all cases).")
     print("test end.")
-    
+
 def single_check(jar_path):
     os.system(f'datainput_student_win64.exe | java -jar {jar_path} > output.txt')
     time.sleep(0.2)
@@ -57,7 +133,7 @@ def single_check(jar_path):
     print('Passed.')
 
 file_name_list = []
-for file_name in os.listdir('jar'): 
+for file_name in os.listdir('jar'):
     file_name_list.append(f'{file_name}')
 test(LENGTH, SERIAL, file_name_list)
 
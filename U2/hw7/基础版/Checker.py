@@ -1,15 +1,23 @@
 from Elevator import *
-from Person import Person
+from Person import Person, PERSON_PATTERN, TIMESTAMP_PATTERN, FLOOR_PATTERN, parseFloor
 from Operation import *
 from TwinElevator import *
+from collections import Counter, OrderedDict
+import os
+import re
+import threading
+from typing import Optional
 
 class Checker:
     elevators: dict[int, Elevator]
     persons: dict[int, Person]
     operations: list[Operation]
     twinElevators: list[TwinElevator]
+    scheRequests: Optional[list[tuple]]  # 输入中的 (时间, 电梯ID, 临时运行速度, 目标楼层)，None 表示不检查
+    updateRequests: Optional[list[tuple]]  # 输入中的 (时间, 上层电梯ID, 下层电梯ID, 改造楼层)，None 表示不检查
 
-    def __init__(self, elevators: list[Elevator], persons: list[Person], operations: list[Operation]):
+    def __init__(self, elevators: list[Elevator], persons: list[Person], operations: list[Operation],
+                 scheRequests: Optional[list[tuple]] = None, updateRequests: Optional[list[tuple]] = None):
         self.elevators = {}
         self.persons = {}
         for elevator in elevators:
@@ -21,6 +29,8 @@ class Checker:
                 raise Exception(f"Re-exist index in person {person.index}.")
             self.persons[person.index] = person
         self.operations = operations
+        self.scheRequests = scheRequests
+        self.updateRequests = updateRequests
         self.reset()
     
     def reset(self):
@@ -29,6 +39,9 @@ class Checker:
         for person in self.persons.values():
             person.reset()
         self.twinElevators = []
+        # 尚未被 ACCEPT 的请求，按 (电梯, 速度, 楼层) / (上层, 下层, 楼层) 计数
+        self.pendingSche = None if self.scheRequests is None else Counter(request[1:] for request in self.scheRequests)
+        self.pendingUpdate = None if self.updateRequests is None else Counter(request[1:] for request in self.updateRequests)
 
     # [时间戳]ARRIVE-所在层-电梯ID
     # [时间戳]OPEN-所在层-电梯ID
@@ -44,8 +57,8 @@ class Checker:
         self.reset()
         lastTimestamp = -10000
         for operation in self.operations:
-            if (operation.timestamp - lastTimestamp < -0.000001):
-                raise Exception(f"The order of operation is incorrect: {operation.timestamp} > {lastTimestamp}.")
+            if (operation.timestamp < lastTimestamp):
+                raise Exception(f"The order of operation is incorrect: {formatTicks(operation.timestamp)} > {formatTicks(lastTimestamp)}.")
             if (operation.opType == OperationType.ARRIVE):
                 self.processArrive(operation.timestamp, operation.floor, operation.elevatorIndex)
             elif (operation.opType == OperationType.OPEN):
@@ -74,11 +87,17 @@ class Checker:
                 raise Exception(f"The person {person.index} is trapped in the elevator.")
             if (person.currentFloor != person.toFloor):
                 raise Exception(f"The person {person.index} is not in the correct floor.")
+        for (elevatorIndex, speed, scheFloor), count in (self.pendingSche or {}).items():
+            if (count > 0):
+                raise Exception(f"The SCHE request to elevator {elevatorIndex} (speed {formatTicks(speed)}, floor {scheFloor}) is not accepted.")
+        for (topElevatorIndex, bottomElevatorIndex, transFloor), count in (self.pendingUpdate or {}).items():
+            if (count > 0):
+                raise Exception(f"The UPDATE request to elevator {topElevatorIndex} and {bottomElevatorIndex} (floor {transFloor}) is not accepted.")
 
     def calcPerfomanceInfo(self):
-        systemRunTime = self.operations[-1].timestamp
+        systemRunTime = self.operations[-1].timestamp / TICKS_PER_SECOND
         avgTaskCompleteTime = 0
-        powerConsumption = 0
+        powerConsumption = 0  # 单位 0.1，最后换算
 
         taskCompleteTimeSum = 0
         taskWeightSum = 0
@@ -88,51 +107,51 @@ class Checker:
                 personLeaveTime[operation.personIndex] = operation.timestamp
             
             if (operation.opType == OperationType.ARRIVE):
-                powerConsumption += 0.4
+                powerConsumption += 4
             elif (operation.opType == OperationType.OPEN):
-                powerConsumption += 0.1
+                powerConsumption += 1
             elif (operation.opType == OperationType.CLOSE):
-                powerConsumption += 0.1
+                powerConsumption += 1
         for person in self.persons.values():
             taskCompleteTimeSum += person.priority * (personLeaveTime[person.index] - person.arriveTime)
             taskWeightSum += person.priority
         if(taskWeightSum == 0):
             avgTaskCompleteTime = 0
         else:
-            avgTaskCompleteTime = taskCompleteTimeSum / taskWeightSum
-        return (systemRunTime, avgTaskCompleteTime, powerConsumption) 
+            avgTaskCompleteTime = taskCompleteTimeSum / taskWeightSum / TICKS_PER_SECOND
+        return (systemRunTime, avgTaskCompleteTime, powerConsumption / 10) 
 
-    def processArrive(self, timestamp: float, floor: int, elevatorIndex: int):
+    def processArrive(self, timestamp: int, floor: int, elevatorIndex: int):
         if (not (elevatorIndex in self.elevators.keys())):
             raise Exception(f"Unexist index in elevator {elevatorIndex}.")
         self.elevators[elevatorIndex].move(timestamp, floor)
     
-    def processOpen(self, timestamp: float, floor: int, elevatorIndex: int):
+    def processOpen(self, timestamp: int, floor: int, elevatorIndex: int):
         if (not (elevatorIndex in self.elevators.keys())):
             raise Exception(f"Unexist index in elevator {elevatorIndex}.")
         self.elevators[elevatorIndex].openDoor(timestamp, floor)
     
-    def processClose(self, timestamp: float, floor: int, elevatorIndex: int):
+    def processClose(self, timestamp: int, floor: int, elevatorIndex: int):
         if (not (elevatorIndex in self.elevators.keys())):
         
             raise Exception(f"Unexist index in elevator {elevatorIndex}.")
         self.elevators[elevatorIndex].closeDoor(timestamp, floor)
     
-    def processIn(self, timestamp: float, personIndex: int, floor: int, elevatorIndex: int):
+    def processIn(self, timestamp: int, personIndex: int, floor: int, elevatorIndex: int):
         if (not (elevatorIndex in self.elevators.keys())):
             raise Exception(f"Unexist index in elevator {elevatorIndex}.")
         if (not (personIndex in self.persons.keys())):
             raise Exception(f"Unexist index in person {personIndex}.")
         self.elevators[elevatorIndex].addPerson(timestamp, self.persons[personIndex], floor)
     
-    def processOut(self, timestamp: float, outType: OutOperationType, personIndex: int, floor: int, elevatorIndex: int):
+    def processOut(self, timestamp: int, outType: OutOperationType, personIndex: int, floor: int, elevatorIndex: int):
         if (not (elevatorIndex in self.elevators.keys())):
             raise Exception(f"Unexist index in elevator {elevatorIndex}.")
         if (not (personIndex in self.persons.keys())):
             raise Exception(f"Unexist index in person {personIndex}.")
         self.elevators[elevatorIndex].removePerson(timestamp, self.persons[personIndex], floor, outType)
 
-    def processSche(self, timestamp: float, scheType: ScheOperationType, elevatorIndex: int, speed: float, scheFloor: int):
+    def processSche(self, timestamp: int, scheType: ScheOperationType, elevatorIndex: int, speed: int, scheFloor: int):
         if (not (elevatorIndex in self.elevators.keys())):
             raise Exception(f"Unexist index in elevator {elevatorIndex}.")
         if (scheType == ScheOperationType.END):
@@ -140,21 +159,29 @@ class Checker:
         elif (scheType == ScheOperationType.BEGIN):
             self.elevators[elevatorIndex].beginSche(timestamp)
         elif (scheType == ScheOperationType.ACCEPT):
+            if (self.pendingSche is not None):
+                if (self.pendingSche[(elevatorIndex, speed, scheFloor)] <= 0):
+                    raise Exception(f"SCHE-ACCEPT in elevator {elevatorIndex} at {formatTicks(timestamp)} matches no issued SCHE request.")
+                self.pendingSche[(elevatorIndex, speed, scheFloor)] -= 1
             self.elevators[elevatorIndex].acceptSche(timestamp, speed, scheFloor)
         
-    def processReceive(self, timestamp: float, personIndex: int, elevatorIndex: int):
+    def processReceive(self, timestamp: int, personIndex: int, elevatorIndex: int):
         if (not (elevatorIndex in self.elevators.keys())):
             raise Exception(f"Unexist index in elevator {elevatorIndex}.")
         if (not (personIndex in self.persons.keys())):
             raise Exception(f"Unexist index in person {personIndex}.")
         self.elevators[elevatorIndex].receivePerson(timestamp, self.persons[personIndex])
     
-    def processUpdate(self, timestamp: float, updateType: UpdateOperationType, topElevatorIndex: int, bottomElevatorIndex: int, transFloor: int):
+    def processUpdate(self, timestamp: int, updateType: UpdateOperationType, topElevatorIndex: int, bottomElevatorIndex: int, transFloor: int):
         if (not (topElevatorIndex in self.elevators.keys())):
             raise Exception(f"Unexist index in elevator {topElevatorIndex}.")
         if (not (bottomElevatorIndex in self.elevators.keys())):
             raise Exception(f"Unexist index in elevator {bottomElevatorIndex}.")
         if (updateType == UpdateOperationType.ACCEPT):
+            if (self.pendingUpdate is not None):
+                if (self.pendingUpdate[(topElevatorIndex, bottomElevatorIndex, transFloor)] <= 0):
+                    raise Exception(f"UPDATE-ACCEPT in elevator {topElevatorIndex} and {bottomElevatorIndex} at {formatTicks(timestamp)} matches no issued UPDATE request.")
+                self.pendingUpdate[(topElevatorIndex, bottomElevatorIndex, transFloor)] -= 1
             self.elevators[topElevatorIndex].acceptUpdate(timestamp, True, transFloor)
             self.elevators[bottomElevatorIndex].acceptUpdate(timestamp, False, transFloor)
         elif (updateType == UpdateOperationType.BEGIN):
@@ -165,15 +192,76 @@ class Checker:
             self.elevators[bottomElevatorIndex].endUpdate(timestamp)
             self.twinElevators.append(TwinElevator(self.elevators[topElevatorIndex], self.elevators[bottomElevatorIndex]))
 
-def getPersons(filepath: str):
+# 输入的三种请求一次匹配: 分组 1-5 乘客，6-9 SCHE，10-13 UPDATE
+_inputPattern = re.compile(
+    PERSON_PATTERN
+    + "|" + TIMESTAMP_PATTERN + "SCHE-(\\d+)-(\\d*\\.?\\d+)-" + FLOOR_PATTERN
+    + "|" + TIMESTAMP_PATTERN + "UPDATE-(\\d+)-(\\d+)-" + FLOOR_PATTERN
+)
+INPUT_CACHE_SIZE = 256
+
+class InputRecords:
+    persons: list[tuple]  # Person 构造参数，每次检查都新建 Person，缓存本身不被修改
+    scheRequests: list[tuple]
+    updateRequests: list[tuple]
+
+    def __init__(self, persons: list[tuple], scheRequests: list[tuple], updateRequests: list[tuple]):
+        self.persons = persons
+        self.scheRequests = scheRequests
+        self.updateRequests = updateRequests
+
+def parseInputText(text: str):
     persons = []
-    with open(filepath, mode='r') as f:
-        personInfos = f.readlines()
-        for personInfo in personInfos:
-            if (("SCHE" in personInfo) or ("UPDATE" in personInfo)):
-                continue
-            persons.append(Person.parse(personInfo))
-    return persons
+    scheRequests = []
+    updateRequests = []
+    for line in text.splitlines():
+        line = line.strip()
+        if (not line):
+            continue
+        match = _inputPattern.fullmatch(line)
+        if (not match):
+            line = line.replace(" ", "")
+            match = _inputPattern.fullmatch(line)
+        if (not match):
+            raise Exception(f"Invalid format of input info: {line}")
+        groups = match.groups()
+        if (groups[0] is not None):
+            persons.append(Person.parseArgs(groups[0:5], line))
+        elif (groups[5] is not None):
+            scheRequests.append((parseTicks(groups[5]), int(groups[6]), parseTicks(groups[7]), parseFloor(groups[8])))
+        else:
+            updateRequests.append((parseTicks(groups[9]), int(groups[10]), int(groups[11]), parseFloor(groups[12])))
+    return InputRecords(persons, scheRequests, updateRequests)
+
+_inputCache: "OrderedDict[str, tuple]" = OrderedDict()
+_inputCacheLock = threading.Lock()
+
+def parseInput(filepath: str):
+    """解析输入文件，按 (路径, mtime, 大小) 缓存，同一用例的多个 jar 只解析一次。"""
+    path = os.path.abspath(filepath)
+    stat = os.stat(path)
+    version = (stat.st_mtime_ns, stat.st_size, stat.st_ino)
+    with _inputCacheLock:
+        entry = _inputCache.get(path)
+        if (entry is not None and entry[0] == version):
+            _inputCache.move_to_end(path)
+            return entry[1]
+    with open(path, mode='r', encoding='utf-8') as f:
+        records = parseInputText(f.read())
+    with _inputCacheLock:
+        _inputCache[path] = (version, records)
+        _inputCache.move_to_end(path)
+        if (len(_inputCache) > INPUT_CACHE_SIZE):
+            _inputCache.popitem(last=False)
+    return records
+
+def getPersons(filepath: str):
+    return [Person(*args) for args in parseInput(filepath).persons]
+
+def createChecker(records: InputRecords, operations: list[Operation]):
+    """用解析好的输入构造 Checker，同时检查 SCHE/UPDATE-ACCEPT 与输入中的请求一一对应。"""
+    persons = [Person(*args) for args in records.persons]
+    return Checker(getElevators(), persons, operations, records.scheRequests, records.updateRequests)
 
 def getOperations(filepath: str):
     operations = []
@@ -186,11 +274,11 @@ def getOperations(filepath: str):
 def getElevators():
     elevators = []
     for i in range(6):
-        elevators.append(Elevator(i + 1, -3, 7, 0.4, 0.4, 6, 1))
+        elevators.append(Elevator(i + 1, -3, 7, DEFAULT_MOVE_INTERVAL, DEFAULT_MOVE_INTERVAL, 6, 1))
     return elevators
 
 def check(input, output):
-    checker = Checker(getElevators(), getPersons(input), getOperations(output))
+    checker = createChecker(parseInput(input), getOperations(output))
     checker.check()
     return checker.calcPerfomanceInfo()
 
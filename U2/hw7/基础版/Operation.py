@@ -2,6 +2,22 @@ from enum import Enum
 import Operation
 import re
 
+# 时间戳与时间间隔统一用万分之一秒的整数（tick）表示，所有间隔检查均为精确的整数比较
+TICKS_PER_SECOND = 10000
+DEFAULT_MOVE_INTERVAL = 4000  # 0.4s
+UPDATED_MOVE_INTERVAL = TICKS_PER_SECOND // 5  # 0.2s，改造完成后的移动间隔
+
+def parseTicks(info: str) -> int:
+    """将 "12.3456" 形式的秒数直接解析为整数 tick，不经过浮点数。"""
+    whole, _, frac = info.partition(".")
+    ticks = int(whole or "0") * TICKS_PER_SECOND + int((frac + "0000")[:4])
+    if (len(frac) > 4 and frac[4] >= "5"):
+        ticks += 1
+    return ticks
+
+def formatTicks(ticks: int) -> str:
+    return f"{ticks // TICKS_PER_SECOND}.{ticks % TICKS_PER_SECOND:04d}"
+
 class OperationType(Enum):
     ARRIVE = 0
     OPEN = 1
@@ -34,11 +50,11 @@ class Operation:
     elevatorIndex: int
     floor: int
     personIndex: int
-    timestamp: float
+    timestamp: int
 
     outType: OutOperationType
     scheType: ScheOperationType
-    scheSpeed: float
+    scheSpeed: int
     updateType: UpdateOperationType
     updateTopElevatorIndex: int
     updateBottomElevatorIndex: int
@@ -54,12 +70,12 @@ class Operation:
             personIndex: int, 
             outType: OutOperationType, 
             scheType: ScheOperationType, 
-            scheMoveInterval: float, 
+            scheMoveInterval: int, 
             updateType: UpdateOperationType, 
             updateTopElevatorIndex: int, 
             updateBottomElevatorIndex: int, 
             updateTransFloor: int, 
-            timestamp: float
+            timestamp: int
             ):
         self.opType = opType
         self.elevatorIndex = elevatorIndex
@@ -113,7 +129,7 @@ class Operation:
 
     @staticmethod
     def parseArrive(match: re.Match[str]):
-        timestamp = float(match.group(1))
+        timestamp = parseTicks(match.group(1))
         floor = Operation.parseFloor(match.group(2))
         elevatorIndex = Operation.parseElevatorIndex(match.group(3))
         return Operation(
@@ -123,7 +139,7 @@ class Operation:
             personIndex=-1,
             outType=OutOperationType.NONE,
             scheType=ScheOperationType.NONE, 
-            scheMoveInterval=0.4,
+            scheMoveInterval=DEFAULT_MOVE_INTERVAL,
             updateType=UpdateOperationType.NONE,
             updateTopElevatorIndex=-1,
             updateBottomElevatorIndex=-1,
@@ -133,7 +149,7 @@ class Operation:
     
     @staticmethod
     def parseOpen(match: re.Match[str]):
-        timestamp = float(match.group(1))
+        timestamp = parseTicks(match.group(1))
         floor = Operation.parseFloor(match.group(2))
         elevatorIndex = Operation.parseElevatorIndex(match.group(3))
         return Operation(
@@ -143,7 +159,7 @@ class Operation:
             personIndex=-1,
             outType=OutOperationType.NONE,
             scheType=ScheOperationType.NONE, 
-            scheMoveInterval=0.4,
+            scheMoveInterval=DEFAULT_MOVE_INTERVAL,
             updateType=UpdateOperationType.NONE,
             updateTopElevatorIndex=-1,
             updateBottomElevatorIndex=-1,
@@ -153,7 +169,7 @@ class Operation:
     
     @staticmethod
     def parseClose(match: re.Match[str]):
-        timestamp = float(match.group(1))
+        timestamp = parseTicks(match.group(1))
         floor = Operation.parseFloor(match.group(2))
         elevatorIndex = Operation.parseElevatorIndex(match.group(3))
         return Operation(
@@ -163,7 +179,7 @@ class Operation:
             personIndex=-1,
             outType=OutOperationType.NONE,
             scheType=ScheOperationType.NONE, 
-            scheMoveInterval=0.4,
+            scheMoveInterval=DEFAULT_MOVE_INTERVAL,
             updateType=UpdateOperationType.NONE,
             updateTopElevatorIndex=-1,
             updateBottomElevatorIndex=-1,
@@ -173,7 +189,7 @@ class Operation:
 
     @staticmethod
     def parseIn(match: re.Match[str]):
-        timestamp = float(match.group(1))
+        timestamp = parseTicks(match.group(1))
         personIndex = Operation.parsePersonIndex(match.group(2))
         floor = Operation.parseFloor(match.group(3))
         elevatorIndex = Operation.parseElevatorIndex(match.group(4))
@@ -184,7 +200,7 @@ class Operation:
             personIndex=personIndex,
             outType=OutOperationType.NONE,
             scheType=ScheOperationType.NONE, 
-            scheMoveInterval=0.4,
+            scheMoveInterval=DEFAULT_MOVE_INTERVAL,
             updateType=UpdateOperationType.NONE,
             updateTopElevatorIndex=-1,
             updateBottomElevatorIndex=-1,
@@ -194,7 +210,7 @@ class Operation:
     
     @staticmethod
     def parseOut(match: re.Match[str]):
-        timestamp = float(match.group(1))
+        timestamp = parseTicks(match.group(1))
         outType = match.group(2)
         if (outType == 'S'):
             outType = OutOperationType.S
@@ -210,7 +226,7 @@ class Operation:
             personIndex=personIndex,
             outType=outType,
             scheType=ScheOperationType.NONE, 
-            scheMoveInterval=0.4,
+            scheMoveInterval=DEFAULT_MOVE_INTERVAL,
             updateType=UpdateOperationType.NONE,
             updateTopElevatorIndex=-1,
             updateBottomElevatorIndex=-1,
@@ -220,7 +236,7 @@ class Operation:
 
     @staticmethod
     def parseReceive(match: re.Match[str]):
-        timestamp = float(match.group(1))
+        timestamp = parseTicks(match.group(1))
         personIndex = Operation.parsePersonIndex(match.group(2))
         elevatorIndex = Operation.parseElevatorIndex(match.group(3))
         return Operation(
@@ -230,7 +246,7 @@ class Operation:
             personIndex=personIndex,
             outType=OutOperationType.NONE,
             scheType=ScheOperationType.NONE, 
-            scheMoveInterval=0.4,
+            scheMoveInterval=DEFAULT_MOVE_INTERVAL,
             updateType=UpdateOperationType.NONE,
             updateTopElevatorIndex=-1,
             updateBottomElevatorIndex=-1,
@@ -240,9 +256,9 @@ class Operation:
     
     @staticmethod
     def parseScheAccept(match: re.Match[str]):
-        timestamp = float(match.group(1))
+        timestamp = parseTicks(match.group(1))
         elevatorIndex = Operation.parseElevatorIndex(match.group(2))
-        speed = float(match.group(3))                
+        speed = parseTicks(match.group(3))                
         floor = Operation.parseFloor(match.group(4))
         return Operation(
             opType=OperationType.SCHE, 
@@ -261,7 +277,7 @@ class Operation:
     
     @staticmethod
     def parseSche(match: re.Match[str]):
-        timestamp = float(match.group(1))
+        timestamp = parseTicks(match.group(1))
         scheType = match.group(2)
         if (scheType == "BEGIN"):
             scheType = ScheOperationType.BEGIN
@@ -275,7 +291,7 @@ class Operation:
             personIndex=-1,
             outType=OutOperationType.NONE,
             scheType=scheType, 
-            scheMoveInterval=0.4,
+            scheMoveInterval=DEFAULT_MOVE_INTERVAL,
             updateType=UpdateOperationType.NONE,
             updateTopElevatorIndex=-1,
             updateBottomElevatorIndex=-1,
@@ -285,7 +301,7 @@ class Operation:
 
     @staticmethod
     def parseUpdateAccept(match: re.Match[str]):
-        timestamp = float(match.group(1))
+        timestamp = parseTicks(match.group(1))
         topElevatorIndex = Operation.parseElevatorIndex(match.group(2))
         bottomElevatorIndex = Operation.parseElevatorIndex(match.group(3))
         transFloor = Operation.parseFloor(match.group(4))
@@ -296,7 +312,7 @@ class Operation:
             personIndex=-1,
             outType=OutOperationType.NONE,
             scheType=ScheOperationType.NONE, 
-            scheMoveInterval=0.4,
+            scheMoveInterval=DEFAULT_MOVE_INTERVAL,
             updateType=UpdateOperationType.ACCEPT,
             updateTopElevatorIndex=topElevatorIndex,
             updateBottomElevatorIndex=bottomElevatorIndex,
@@ -306,7 +322,7 @@ class Operation:
     
     @staticmethod
     def parseUpdate(match: re.Match[str]):
-        timestamp = float(match.group(1))
+        timestamp = parseTicks(match.group(1))
         updateType = match.group(2)
         if (updateType == "BEGIN"):
             updateType = UpdateOperationType.BEGIN
@@ -321,7 +337,7 @@ class Operation:
             personIndex=-1,
             outType=OutOperationType.NONE,
             scheType=ScheOperationType.NONE, 
-            scheMoveInterval=0.4,
+            scheMoveInterval=DEFAULT_MOVE_INTERVAL,
             updateType=updateType,
             updateTopElevatorIndex=topElevatorIndex,
             updateBottomElevatorIndex=bottomElevatorIndex,
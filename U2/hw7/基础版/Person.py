@@ -1,4 +1,16 @@
 import re
+from Operation import parseTicks
+
+TIMESTAMP_PATTERN = "\\[(\\d*\\.?\\d+)]"
+FLOOR_PATTERN = "(F\\d+|B\\d+)"
+PERSON_PATTERN = TIMESTAMP_PATTERN + "(\\d+)-PRI-(\\d+)-FROM-" + FLOOR_PATTERN + "-TO-" + FLOOR_PATTERN
+_personPattern = re.compile(PERSON_PATTERN)
+
+def parseFloor(floorInfo: str):
+    if (floorInfo[0] == 'B'):
+        return -int(floorInfo[1:]) + 1
+    else:
+        return int(floorInfo[1:])
 
 class Person:
     index: int
@@ -6,11 +18,11 @@ class Person:
     fromFloor: int
     toFloor: int
     targetElevator: int
-    arriveTime: float
+    arriveTime: int
     currentFloor: int
     isInElevator: bool
     
-    def __init__(self, index: int, priority: int, fromFloor: int, toFloor: int, targetElevator: int, arriveTime: float):
+    def __init__(self, index: int, priority: int, fromFloor: int, toFloor: int, targetElevator: int, arriveTime: int):
         self.index = index
         self.priority = priority
         self.fromFloor = fromFloor
@@ -25,26 +37,23 @@ class Person:
 
     @staticmethod
     def parse(personInfo: str):
-        personInfo = personInfo.replace(" ", "")
-        personInfo = personInfo.replace("\n", "")
-        float_pattern = "(\\d*\\.?\\d+)"
-        int_pattern = "(\\d+)"
-        floor_pattern = "(F\\d+|B\\d+)"
-        pattern = "\\[" + float_pattern + "]" + int_pattern + "-PRI-" + int_pattern + "-FROM-" + floor_pattern + "-TO-" + floor_pattern
-        def parseFloor(floorInfo: str):
-            if (floorInfo[0] == 'B'):
-                return -int(floorInfo[1:]) + 1
-            else:
-                return int(floorInfo[1:])
-        pattern = re.compile(pattern)
-        match = re.fullmatch(pattern, personInfo)
+        personInfo = personInfo.strip()
+        match = _personPattern.fullmatch(personInfo)
+        if (not match):
+            personInfo = personInfo.replace(" ", "")
+            match = _personPattern.fullmatch(personInfo)
         if (not match):
             raise Exception(f"Invalid format of person info: {personInfo}")
-        arriveTime = float(match.group(1))
-        index = int(match.group(2))
-        priority = int(match.group(3))
-        fromFloor = parseFloor(match.group(4))
-        toFloor = parseFloor(match.group(5))
+        return Person(*Person.parseArgs(match.groups(), personInfo))
+
+    @staticmethod
+    def parseArgs(groups: tuple, personInfo: str):
+        """由 PERSON_PATTERN 的 5 个分组得到校验后的构造参数元组。"""
+        arriveTime = parseTicks(groups[0])
+        index = int(groups[1])
+        priority = int(groups[2])
+        fromFloor = parseFloor(groups[3])
+        toFloor = parseFloor(groups[4])
         targetElevator = -1
         if (not (1 <= index and index <= 2147483647)):
             raise Exception(f"Invalid index of person info: {personInfo}")
@@ -54,7 +63,7 @@ class Person:
             raise Exception(f"Invalid index of fromFloor info: {personInfo}")
         if (not (-3 <= toFloor and toFloor <= 7)):
             raise Exception(f"Invalid index of toFloor info: {personInfo}")
-        return Person(index, priority, fromFloor, toFloor, targetElevator, arriveTime)
+        return (index, priority, fromFloor, toFloor, targetElevator, arriveTime)
 
 if __name__ == "__main__":
     person = Person.parse("[1.0]2147483647-PRI-19-FROM-F3-TO-F5-BY-1")
@@ -1,6 +1,6 @@
 from enum import Enum
 from Person import Person
-from Operation import OutOperationType, ScheOperationType
+from Operation import OutOperationType, ScheOperationType, TICKS_PER_SECOND, DEFAULT_MOVE_INTERVAL, UPDATED_MOVE_INTERVAL, formatTicks
 
 class ElevatorState(Enum):
     CLOSE = 0
@@ -10,8 +10,8 @@ class Elevator:
     index: int
     minFloor: int
     maxFloor: int
-    moveInterval: float
-    openInterval: float
+    moveInterval: int
+    openInterval: int
     requestLimit: int
     initFloor: int
 
@@ -19,20 +19,20 @@ class Elevator:
     requests: list[Person]
     state: ElevatorState
     receivedPersons: list[Person]
-    timestamp: float
+    timestamp: int
 
     acceptingSche: bool
-    acceptScheTime: float
+    acceptScheTime: int
     processingSche: bool
     moveCountBeforeSche: int
-    openDoorTimestamp: float
-    scheMoveInterval: float
+    openDoorTimestamp: int
+    scheMoveInterval: int
     scheFloor: int
 
     acceptingUpdate: bool
-    acceptUpdateTime: float
+    acceptUpdateTime: int
     processingUpdate: bool
-    beginUpdateTime: float
+    beginUpdateTime: int
     updated: bool
     isTopElevator: bool
     transFloor: int
@@ -40,7 +40,7 @@ class Elevator:
 
     ifHaveOpenDoor: bool
 
-    def __init__(self, index: int, minFloor: int, maxFloor: int, moveInterval: float, openInterval: float, requestLimit: int, initFloor: int):
+    def __init__(self, index: int, minFloor: int, maxFloor: int, moveInterval: int, openInterval: int, requestLimit: int, initFloor: int):
         self.index = index
         self.minFloor = minFloor
         self.maxFloor = maxFloor
@@ -58,68 +58,68 @@ class Elevator:
         self.receivedPersons = []
         self.state = ElevatorState.CLOSE
         self.timestamp = -1000000000
-        self.acceptScheTime = 0.0
-        self.openDoorTimestamp = 0.0
+        self.acceptScheTime = 0
+        self.openDoorTimestamp = 0
         self.acceptingSche = False
         self.moveCountBeforeSche = 0
-        self.scheMoveInterval = 0.4
+        self.scheMoveInterval = DEFAULT_MOVE_INTERVAL
         self.scheFloor = 0
 
         self.acceptingUpdate = False
-        self.acceptUpdateTime = 0.0
+        self.acceptUpdateTime = 0
         self.processingUpdate = False
-        self.beginUpdateTime = 0.0
+        self.beginUpdateTime = 0
         self.updated = False
         self.transFloor = 0
         self.moveCountBeforeUpdate = 0
         self.isTopElevator = False
         self.ifHaveOpenDoor = False
     
-    def closeDoor(self, timestamp: float, floor: int):
+    def closeDoor(self, timestamp: int, floor: int):
         if (self.state != ElevatorState.OPEN):
-            raise Exception(f"selfTime {self.timestamp} inputTime {timestamp} Invalid operation: closeDoor in elevator {self.index}.")
+            raise Exception(f"selfTime {formatTicks(self.timestamp)} inputTime {formatTicks(timestamp)} Invalid operation: closeDoor in elevator {self.index}.")
         if (self.currentFloor != floor):
-            raise Exception(f"selfTime {self.timestamp} inputTime {timestamp} Mismatch of floor({floor}) in operation: closeDoor in elevator {self.index}.")
-        if (timestamp - self.timestamp < self.openInterval - 0.00001):
-            raise Exception(f"selfTime {self.timestamp} inputTime {timestamp} Operation too fast in operation: closeDoor in elevator {self.index}.")
+            raise Exception(f"selfTime {formatTicks(self.timestamp)} inputTime {formatTicks(timestamp)} Mismatch of floor({floor}) in operation: closeDoor in elevator {self.index}.")
+        if (timestamp - self.timestamp < self.openInterval):
+            raise Exception(f"selfTime {formatTicks(self.timestamp)} inputTime {formatTicks(timestamp)} Operation too fast in operation: closeDoor in elevator {self.index}.")
         if (self.processingUpdate):
-            raise Exception(f"selfTime {self.timestamp} inputTime {timestamp} Invalid operation: closeDoor in elevator {self.index} when it is updating.")
+            raise Exception(f"selfTime {formatTicks(self.timestamp)} inputTime {formatTicks(timestamp)} Invalid operation: closeDoor in elevator {self.index} when it is updating.")
         self.state = ElevatorState.CLOSE
         self.timestamp = timestamp
     
-    def openDoor(self, timestamp: float, floor: int):
+    def openDoor(self, timestamp: int, floor: int):
         if (self.state != ElevatorState.CLOSE):
-            raise Exception(f"selfTime {self.timestamp} inputTime {timestamp} Invalid operation: openDoor in elevator {self.index}.")
+            raise Exception(f"selfTime {formatTicks(self.timestamp)} inputTime {formatTicks(timestamp)} Invalid operation: openDoor in elevator {self.index}.")
         if (self.currentFloor != floor):
-            raise Exception(f"selfTime {self.timestamp} inputTime {timestamp} Mismatch of floor({floor}) in operation: openDoor in elevator {self.index}.")
+            raise Exception(f"selfTime {formatTicks(self.timestamp)} inputTime {formatTicks(timestamp)} Mismatch of floor({floor}) in operation: openDoor in elevator {self.index}.")
         if (self.processingSche and floor != self.scheFloor):
-            raise Exception(f"selfTime {self.timestamp} inputTime {timestamp} Invalid operation: openDoor in wrong floor when inSche in elevator {self.index}.")
+            raise Exception(f"selfTime {formatTicks(self.timestamp)} inputTime {formatTicks(timestamp)} Invalid operation: openDoor in wrong floor when inSche in elevator {self.index}.")
         if (self.processingUpdate):
-            raise Exception(f"selfTime {self.timestamp} inputTime {timestamp} Invalid operation: openDoor in elevator {self.index} when it is updating.")
+            raise Exception(f"selfTime {formatTicks(self.timestamp)} inputTime {formatTicks(timestamp)} Invalid operation: openDoor in elevator {self.index} when it is updating.")
         if (self.processingSche and floor == self.scheFloor):
             self.ifHaveOpenDoor = True
         self.openDoorTimestamp = timestamp
         self.state = ElevatorState.OPEN
         self.timestamp = timestamp
     
-    def move(self, timestamp: float, targetFloor: int):
+    def move(self, timestamp: int, targetFloor: int):
         if (not self.receivedPersons and not self.processingSche):
             if (not (self.updated and self.currentFloor == self.transFloor)):
-                raise Exception(f"selfTime {self.timestamp} inputTime {timestamp} Elevator move when received no person in elevator {self.index}.")
+                raise Exception(f"selfTime {formatTicks(self.timestamp)} inputTime {formatTicks(timestamp)} Elevator move when received no person in elevator {self.index}.")
         if (self.state != ElevatorState.CLOSE):
-            raise Exception(f"selfTime {self.timestamp} inputTime {timestamp} Invalid operation: move in elevator {self.index}.")
+            raise Exception(f"selfTime {formatTicks(self.timestamp)} inputTime {formatTicks(timestamp)} Invalid operation: move in elevator {self.index}.")
         if (not (self.minFloor <= targetFloor and targetFloor <= self.maxFloor)):
-            raise Exception(f"selfTime {self.timestamp} inputTime {timestamp} Target Floor out of bound in operation: move in elevator {self.index}.")
+            raise Exception(f"selfTime {formatTicks(self.timestamp)} inputTime {formatTicks(timestamp)} Target Floor out of bound in operation: move in elevator {self.index}.")
         if (targetFloor == self.currentFloor):
-            raise Exception(f"selfTime {self.timestamp} inputTime {timestamp} Target Floor is current floor in operation: move in elevator {self.index}.")
+            raise Exception(f"selfTime {formatTicks(self.timestamp)} inputTime {formatTicks(timestamp)} Target Floor is current floor in operation: move in elevator {self.index}.")
         if (not (targetFloor == self.currentFloor + 1 or targetFloor == self.currentFloor - 1)):
-            raise Exception(f"selfTime {self.timestamp} inputTime {timestamp} Target Floor is too far in operation: move in elevator {self.index}.")
+            raise Exception(f"selfTime {formatTicks(self.timestamp)} inputTime {formatTicks(timestamp)} Target Floor is too far in operation: move in elevator {self.index}.")
         if (self.acceptingSche and self.moveCountBeforeSche >= 2):
-            raise Exception(f"selfTime {self.timestamp} inputTime {timestamp} Move too many times before beginSche in elevator {self.index}.")
+            raise Exception(f"selfTime {formatTicks(self.timestamp)} inputTime {formatTicks(timestamp)} Move too many times before beginSche in elevator {self.index}.")
         if (self.acceptingUpdate and self.moveCountBeforeUpdate >= 2):
-            raise Exception(f"selfTime {self.timestamp} inputTime {timestamp} Move too many times before beginUpdate in elevator {self.index}.")
+            raise Exception(f"selfTime {formatTicks(self.timestamp)} inputTime {formatTicks(timestamp)} Move too many times before beginUpdate in elevator {self.index}.")
         if (self.processingUpdate):
-            raise Exception(f"selfTime {self.timestamp} inputTime {timestamp} Invalid operation: move in elevator {self.index} when it is updating.")
+            raise Exception(f"selfTime {formatTicks(self.timestamp)} inputTime {formatTicks(timestamp)} Invalid operation: move in elevator {self.index} when it is updating.")
         if (self.acceptingSche):
             self.moveCountBeforeSche += 1
         if (self.acceptingUpdate):
@@ -127,37 +127,37 @@ class Elevator:
         self.currentFloor = targetFloor
         self.timestamp = timestamp
     
-    def addPerson(self, timestamp: float, person: Person, floor: int):
+    def addPerson(self, timestamp: int, person: Person, floor: int):
         if (self.processingSche):
-            raise Exception(f"selfTime {self.timestamp} inputTime {timestamp} Invalid operation: addPerson in elevator {self.index} when it is inSche.")
+            raise Exception(f"selfTime {formatTicks(self.timestamp)} inputTime {formatTicks(timestamp)} Invalid operation: addPerson in elevator {self.index} when it is inSche.")
         if (self.state != ElevatorState.OPEN):
-            raise Exception(f"selfTime {self.timestamp} inputTime {timestamp} Invalid operation: addPerson in elevator {self.index} and person {person.index}.")
+            raise Exception(f"selfTime {formatTicks(self.timestamp)} inputTime {formatTicks(timestamp)} Invalid operation: addPerson in elevator {self.index} and person {person.index}.")
         if (person.targetElevator != self.index):
-            raise Exception(f"selfTime {self.timestamp} inputTime {timestamp} Mismatch of elevator in operation: addPerson in elevator {self.index} and person {person.index}.")
+            raise Exception(f"selfTime {formatTicks(self.timestamp)} inputTime {formatTicks(timestamp)} Mismatch of elevator in operation: addPerson in elevator {self.index} and person {person.index}.")
         if (self.currentFloor != floor):
-            raise Exception(f"selfTime {self.timestamp} inputTime {timestamp} Mismatch of floor({floor}) in operation: addPerson in elevator {self.index} and person {person.index}.")
+            raise Exception(f"selfTime {formatTicks(self.timestamp)} inputTime {formatTicks(timestamp)} Mismatch of floor({floor}) in operation: addPerson in elevator {self.index} and person {person.index}.")
         if (person.currentFloor != self.currentFloor):
-            raise Exception(f"Time {self.timestamp} Mismatch of floor in operation: addPerson in elevator {self.index} and person {person.index}.")
+            raise Exception(f"Time {formatTicks(self.timestamp)} Mismatch of floor in operation: addPerson in elevator {self.index} and person {person.index}.")
         if (person.isInElevator):
-            raise Exception(f"selfTime {self.timestamp} inputTime {timestamp} Re-In: addPerson in elevator {self.index} and person {person.index}.")
+            raise Exception(f"selfTime {formatTicks(self.timestamp)} inputTime {formatTicks(timestamp)} Re-In: addPerson in elevator {self.index} and person {person.index}.")
         if (len(self.requests) >= self.requestLimit):
-            raise Exception(f"selfTime {self.timestamp} inputTime {timestamp} Too many persons in operation: addPerson in elevator {self.index} and person {person.index}.")
+            raise Exception(f"selfTime {formatTicks(self.timestamp)} inputTime {formatTicks(timestamp)} Too many persons in operation: addPerson in elevator {self.index} and person {person.index}.")
         self.requests.append(person)
         person.isInElevator = True
     
-    def removePerson(self, timestamp: float, person: Person, floor: int, outType: OutOperationType):
+    def removePerson(self, timestamp: int, person: Person, floor: int, outType: OutOperationType):
         if (self.state != ElevatorState.OPEN):
-            raise Exception(f"selfTime {self.timestamp} inputTime {timestamp} Invalid operation: removePerson in elevator {self.index} and person {person.index}.")
+            raise Exception(f"selfTime {formatTicks(self.timestamp)} inputTime {formatTicks(timestamp)} Invalid operation: removePerson in elevator {self.index} and person {person.index}.")
         if (self.currentFloor != floor):
-            raise Exception(f"selfTime {self.timestamp} inputTime {timestamp} Mismatch of floor({floor}) in operation: removePerson in elevator {self.index} and person {person.index}.")
+            raise Exception(f"selfTime {formatTicks(self.timestamp)} inputTime {formatTicks(timestamp)} Mismatch of floor({floor}) in operation: removePerson in elevator {self.index} and person {person.index}.")
         if (person.targetElevator != self.index):
-            raise Exception(f"selfTime {self.timestamp} inputTime {timestamp} Mismatch of elevator in operation: removePerson in elevator {self.index} and person {person.index}.")
+            raise Exception(f"selfTime {formatTicks(self.timestamp)} inputTime {formatTicks(timestamp)} Mismatch of elevator in operation: removePerson in elevator {self.index} and person {person.index}.")
         if (not person.isInElevator):
-            raise Exception(f"selfTime {self.timestamp} inputTime {timestamp} Re-Out or Not-In: removePerson in elevator {self.index} and person {person.index}.")
+            raise Exception(f"selfTime {formatTicks(self.timestamp)} inputTime {formatTicks(timestamp)} Re-Out or Not-In: removePerson in elevator {self.index} and person {person.index}.")
         if (outType == OutOperationType.S and person.toFloor != floor):
-            raise Exception(f"selfTime {self.timestamp} inputTime {timestamp} Mismatch of floor({floor}) in operation: Successful removePerson in elevator {self.index} and person {person.index}.")
+            raise Exception(f"selfTime {formatTicks(self.timestamp)} inputTime {formatTicks(timestamp)} Mismatch of floor({floor}) in operation: Successful removePerson in elevator {self.index} and person {person.index}.")
         if (outType == OutOperationType.F and person.toFloor == floor):
-            raise Exception(f"selfTime {self.timestamp} inputTime {timestamp} fRemovePerson when he/she is acctually successfully arrived. In elevator {self.index} and person {person.index}.")
+            raise Exception(f"selfTime {formatTicks(self.timestamp)} inputTime {formatTicks(timestamp)} fRemovePerson when he/she is acctually successfully arrived. In elevator {self.index} and person {person.index}.")
         self.requests.remove(person)
         if (person in self.receivedPersons):
             self.receivedPersons.remove(person)
@@ -167,85 +167,85 @@ class Elevator:
         if (outType == OutOperationType.F):
             person.fromFloor = floor
 
-    def receivePerson(self, timestamp: float, person: Person):
+    def receivePerson(self, timestamp: int, person: Person):
         if (person.targetElevator != -1):
-            raise Exception(f"selfTime {self.timestamp} inputTime {timestamp} Invalid operation: receivePerson in elevator {self.index} and person {person.index}.")
+            raise Exception(f"selfTime {formatTicks(self.timestamp)} inputTime {formatTicks(timestamp)} Invalid operation: receivePerson in elevator {self.index} and person {person.index}.")
         if (person.targetElevator != -1):
-            raise Exception(f"selfTime {self.timestamp} inputTime {timestamp} Re-Receive: receivePerson in elevator {self.index} and person {person.index}.")
+            raise Exception(f"selfTime {formatTicks(self.timestamp)} inputTime {formatTicks(timestamp)} Re-Receive: receivePerson in elevator {self.index} and person {person.index}.")
         if (self.processingSche):
-            raise Exception(f"selfTime {self.timestamp} inputTime {timestamp} Invalid operation: receivePerson in elevator {self.index} and person {person.index} when it is scheduling.")
+            raise Exception(f"selfTime {formatTicks(self.timestamp)} inputTime {formatTicks(timestamp)} Invalid operation: receivePerson in elevator {self.index} and person {person.index} when it is scheduling.")
         if (self.processingUpdate):
-            raise Exception(f"selfTime {self.timestamp} inputTime {timestamp} Invalid operation: receivePerson in elevator {self.index} and person {person.index} when it is updating.")
+            raise Exception(f"selfTime {formatTicks(self.timestamp)} inputTime {formatTicks(timestamp)} Invalid operation: receivePerson in elevator {self.index} and person {person.index} when it is updating.")
         person.targetElevator = self.index
         self.receivedPersons.append(person)
 
-    def beginSche(self, timestamp: float):
+    def beginSche(self, timestamp: int):
         if (self.processingSche):
-            raise Exception(f"selfTime {self.timestamp} inputTime {timestamp} Invalid operation: beginSche in elevator {self.index} when it is inSche.")
+            raise Exception(f"selfTime {formatTicks(self.timestamp)} inputTime {formatTicks(timestamp)} Invalid operation: beginSche in elevator {self.index} when it is inSche.")
         self.acceptingSche = False
         self.processingSche = True
         self.moveInterval = self.scheMoveInterval
         self.moveCountBeforeSche = 0
-        self.openInterval = 1.0
+        self.openInterval = TICKS_PER_SECOND
         for person in self.receivedPersons:
             if person not in self.requests:
                 person.targetElevator = -1
         self.receivedPersons.clear()
 
-    def endSche(self, timestamp: float):
+    def endSche(self, timestamp: int):
         if (not self.processingSche):
-            raise Exception(f"selfTime {self.timestamp} inputTime {timestamp} Invalid operation: endSche in elevator {self.index} when it is not inSche.")
-        if (timestamp - self.acceptScheTime > 6.00001):
-            raise Exception(f"selfTime {self.timestamp} inputTime {timestamp} Sche time too long in elevator {self.index}.")
+            raise Exception(f"selfTime {formatTicks(self.timestamp)} inputTime {formatTicks(timestamp)} Invalid operation: endSche in elevator {self.index} when it is not inSche.")
+        if (timestamp - self.acceptScheTime > 6 * TICKS_PER_SECOND):
+            raise Exception(f"selfTime {formatTicks(self.timestamp)} inputTime {formatTicks(timestamp)} Sche time too long in elevator {self.index}.")
         if (self.state != ElevatorState.CLOSE):
-            raise Exception(f"selfTime {self.timestamp} inputTime {timestamp} Invalid operation: endSche in elevator {self.index} when the door is not close.")
+            raise Exception(f"selfTime {formatTicks(self.timestamp)} inputTime {formatTicks(timestamp)} Invalid operation: endSche in elevator {self.index} when the door is not close.")
         if (len(self.requests) != 0):
-            raise Exception(f"selfTime {self.timestamp} inputTime {timestamp} Invalid operation: endSche in elevator {self.index} when there are still persons.")
+            raise Exception(f"selfTime {formatTicks(self.timestamp)} inputTime {formatTicks(timestamp)} Invalid operation: endSche in elevator {self.index} when there are still persons.")
         if (not self.ifHaveOpenDoor):
-            raise Exception(f"selfTime {self.timestamp} inputTime {timestamp} You did not open the door when reach the target floor during SCHE in elevator {self.index}.")
+            raise Exception(f"selfTime {formatTicks(self.timestamp)} inputTime {formatTicks(timestamp)} You did not open the door when reach the target floor during SCHE in elevator {self.index}.")
         self.processingSche = False
-        self.moveInterval = 0.4
-        self.openInterval = 0.4
+        self.moveInterval = DEFAULT_MOVE_INTERVAL
+        self.openInterval = DEFAULT_MOVE_INTERVAL
         self.ifHaveOpenDoor = False
 
-    def acceptSche(self, timestamp: float, speed: float, scheFloor: int):
-        if (not (speed == 0.2 or speed == 0.3 or speed == 0.4 or speed == 0.5)):
-            raise Exception(f"selfTime {self.timestamp} inputTime {timestamp} Invalid speed in operation: acceptSche in elevator {self.index}.")
+    def acceptSche(self, timestamp: int, speed: int, scheFloor: int):
+        if (not (speed == 2000 or speed == 3000 or speed == 4000 or speed == 5000)):
+            raise Exception(f"selfTime {formatTicks(self.timestamp)} inputTime {formatTicks(timestamp)} Invalid speed in operation: acceptSche in elevator {self.index}.")
         if (not (-1 <= scheFloor and scheFloor <= 5)):
-            raise Exception(f"selfTime {self.timestamp} inputTime {timestamp} Invalid scheFloor in operation: acceptSche in elevator {self.index}.")
+            raise Exception(f"selfTime {formatTicks(self.timestamp)} inputTime {formatTicks(timestamp)} Invalid scheFloor in operation: acceptSche in elevator {self.index}.")
         self.scheMoveInterval = speed
         self.acceptingSche = True
         self.acceptScheTime = timestamp
         self.scheFloor = scheFloor
 
-    def acceptUpdate(self, timestamp: float, isTopElevator: bool, transFloor: int):
+    def acceptUpdate(self, timestamp: int, isTopElevator: bool, transFloor: int):
         if (not (self.minFloor <= transFloor and transFloor <= self.maxFloor)):
-            raise Exception(f"selfTime {self.timestamp} inputTime {timestamp} Invalid transFloor in operation: acceptUpdate in elevator {self.index}.")
+            raise Exception(f"selfTime {formatTicks(self.timestamp)} inputTime {formatTicks(timestamp)} Invalid transFloor in operation: acceptUpdate in elevator {self.index}.")
         if (self.acceptingSche or self.processingSche):
-            raise Exception(f"selfTime {self.timestamp} inputTime {timestamp} Invalid operation: acceptUpdate in elevator {self.index} when it is scheduling.")
+            raise Exception(f"selfTime {formatTicks(self.timestamp)} inputTime {formatTicks(timestamp)} Invalid operation: acceptUpdate in elevator {self.index} when it is scheduling.")
         if (self.acceptingUpdate or self.processingUpdate):
-            raise Exception(f"selfTime {self.timestamp} inputTime {timestamp} Invalid operation: acceptUpdate in elevator {self.index} when it is updating.")
+            raise Exception(f"selfTime {formatTicks(self.timestamp)} inputTime {formatTicks(timestamp)} Invalid operation: acceptUpdate in elevator {self.index} when it is updating.")
         if (self.updated):
-            raise Exception(f"selfTime {self.timestamp} inputTime {timestamp} Invalid operation: acceptUpdate in elevator {self.index} when it is updated.")
+            raise Exception(f"selfTime {formatTicks(self.timestamp)} inputTime {formatTicks(timestamp)} Invalid operation: acceptUpdate in elevator {self.index} when it is updated.")
         if (not (-1 <= transFloor and transFloor <= 5)):
-            raise Exception(f"selfTime {self.timestamp} inputTime {timestamp} Invalid transFloor in operation: acceptUpdate in elevator {self.index}.")
+            raise Exception(f"selfTime {formatTicks(self.timestamp)} inputTime {formatTicks(timestamp)} Invalid transFloor in operation: acceptUpdate in elevator {self.index}.")
         self.acceptingUpdate = True
         self.acceptUpdateTime = timestamp
         self.transFloor = transFloor
         self.moveCountBeforeUpdate = 0
         self.isTopElevator = isTopElevator
     
-    def beginUpdate(self, timestamp: float):
+    def beginUpdate(self, timestamp: int):
         if (not self.acceptingUpdate):
-            raise Exception(f"selfTime {self.timestamp} inputTime {timestamp} Invalid operation: beginUpdate in elevator {self.index} when it is not accepting update.")
+            raise Exception(f"selfTime {formatTicks(self.timestamp)} inputTime {formatTicks(timestamp)} Invalid operation: beginUpdate in elevator {self.index} when it is not accepting update.")
         if (self.processingUpdate):
-            raise Exception(f"selfTime {self.timestamp} inputTime {timestamp} Invalid operation: beginUpdate in elevator {self.index} when it is updating.")
+            raise Exception(f"selfTime {formatTicks(self.timestamp)} inputTime {formatTicks(timestamp)} Invalid operation: beginUpdate in elevator {self.index} when it is updating.")
         if (self.updated):
-            raise Exception(f"selfTime {self.timestamp} inputTime {timestamp} Invalid operation: beginUpdate in elevator {self.index} when it is updated.")
+            raise Exception(f"selfTime {formatTicks(self.timestamp)} inputTime {formatTicks(timestamp)} Invalid operation: beginUpdate in elevator {self.index} when it is updated.")
         if (self.state != ElevatorState.CLOSE):
-            raise Exception(f"selfTime {self.timestamp} inputTime {timestamp} Invalid operation: beginUpdate in elevator {self.index} when the door is not close.")
+            raise Exception(f"selfTime {formatTicks(self.timestamp)} inputTime {formatTicks(timestamp)} Invalid operation: beginUpdate in elevator {self.index} when the door is not close.")
         if (len(self.requests) != 0):
-            raise Exception(f"selfTime {self.timestamp} inputTime {timestamp} Invalid operation: beginUpdate in elevator {self.index} when there are still persons.")
+            raise Exception(f"selfTime {formatTicks(self.timestamp)} inputTime {formatTicks(timestamp)} Invalid operation: beginUpdate in elevator {self.index} when there are still persons.")
         self.acceptingUpdate = False
         self.moveCountBeforeUpdate = 0
         self.processingUpdate = True
@@ -255,16 +255,16 @@ class Elevator:
                 person.targetElevator = -1
         self.receivedPersons.clear()
     
-    def endUpdate(self, timestamp: float):
+    def endUpdate(self, timestamp: int):
         if (not self.processingUpdate):
-            raise Exception(f"selfTime {self.timestamp} inputTime {timestamp} Invalid operation: endUpdate in elevator {self.index} when it is not updating.")
-        if (timestamp - self.acceptUpdateTime > 6.00001):
-            raise Exception(f"selfTime {self.timestamp} inputTime {timestamp} Update time too long in elevator {self.index}.")
-        if (timestamp - self.beginUpdateTime < 0.99999):
-            raise Exception(f"selfTime {self.timestamp} inputTime {timestamp} Update time too short in elevator {self.index}.")
+            raise Exception(f"selfTime {formatTicks(self.timestamp)} inputTime {formatTicks(timestamp)} Invalid operation: endUpdate in elevator {self.index} when it is not updating.")
+        if (timestamp - self.acceptUpdateTime > 6 * TICKS_PER_SECOND):
+            raise Exception(f"selfTime {formatTicks(self.timestamp)} inputTime {formatTicks(timestamp)} Update time too long in elevator {self.index}.")
+        if (timestamp - self.beginUpdateTime < TICKS_PER_SECOND):
+            raise Exception(f"selfTime {formatTicks(self.timestamp)} inputTime {formatTicks(timestamp)} Update time too short in elevator {self.index}.")
         self.processingUpdate = False
         self.updated = True
-        self.moveInterval = 0.2
+        self.moveInterval = UPDATED_MOVE_INTERVAL
         if (self.isTopElevator):
             self.minFloor = self.transFloor
             self.currentFloor = self.transFloor + 1
@@ -0,0 +1,346 @@
+# checkd.py
+"""
+Long-lived checker service over a Unix domain socket.
+
+The daemon keeps Checker and its modules loaded and answers check requests, so
+analysis scripts and bisection loops do not pay interpreter startup and imports
+on every call. Parsed stdin.txt inputs (Checker.InputRecords) are cached by
+content hash. Only the Person constructor arguments are cached, because
+Checker mutates Person objects while it checks.
+
+Protocol: each message is a 4-byte big-endian length followed by a UTF-8 JSON
+object; a connection may carry any number of request/response pairs.
+    {"op": "check", "input_path" | "input": ..., "output_path" | "output": ...}
+      -> {"ok": true, "verdict": "Pass", "metrics": [systemRunTime, avgTaskCompleteTime, powerConsumption]}
+      -> {"ok": true, "verdict": "Fail", "error": "...", "signature": "..."}
+    {"op": "ping"} / {"op": "stats"} / {"op": "shutdown"}
+Malformed requests are answered with {"ok": false, "error": "..."}.
+
+Usage (needs AF_UNIX: Linux, macOS or WSL):
+    python checkd.py serve [--socket PATH]
+    python checkd.py check stdin.txt output.txt [--socket PATH]
+    python checkd.py bench [--checks 2000] [--input stdin.txt --output output.txt]
+"""
+import argparse
+import hashlib
+import json
+import os
+import socket
+import socketserver
+import struct
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Optional
+
+import Checker
+import runner
+from Operation import Operation
+
+DEFAULT_SOCKET = os.path.join(tempfile.gettempdir(), "elevator-checker.sock")
+PERSON_CACHE_SIZE = 1024
+LENGTH_FORMAT = ">I"
+LENGTH_SIZE = struct.calcsize(LENGTH_FORMAT)
+
+# A small valid case, used by the benchmark when no input/output pair is given.
+SAMPLE_INPUT = """[1.0]5-PRI-10-FROM-F2-TO-B1
+[1.0]SCHE-2-0.2-F3
+"""
+SAMPLE_OUTPUT = """[   1.1000]RECEIVE-5-1
+[   1.1000]SCHE-ACCEPT-2-0.2-F3
+[   1.2000]SCHE-BEGIN-2
+[   1.4000]ARRIVE-F2-2
+[   1.5000]ARRIVE-F2-1
+[   1.5000]OPEN-F2-1
+[   1.5000]IN-5-F2-1
+[   1.6000]ARRIVE-F3-2
+[   1.6000]OPEN-F3-2
+[   1.9000]CLOSE-F2-1
+[   2.3000]ARRIVE-F1-1
+[   2.6000]CLOSE-F3-2
+[   2.6000]SCHE-END-2
+[   2.7000]ARRIVE-B1-1
+[   2.7000]OPEN-B1-1
+[   2.7000]OUT-S-5-B1-1
+[   3.1000]CLOSE-B1-1
+"""
+
+
+def send_message(sock: socket.socket, message: Dict):
+    data = json.dumps(message).encode("utf-8")
+    sock.sendall(struct.pack(LENGTH_FORMAT, len(data)) + data)
+
+
+def _recv_exact(sock: socket.socket, size: int) -> Optional[bytes]:
+    chunks = []
+    while size > 0:
+        chunk = sock.recv(min(size, 1 << 20))
+        if not chunk:
+            return None
+        chunks.append(chunk)
+        size -= len(chunk)
+    return b"".join(chunks)
+
+
+def recv_message(sock: socket.socket) -> Optional[Dict]:
+    """Reads one message; None when the peer closed the connection."""
+    header = _recv_exact(sock, LENGTH_SIZE)
+    if header is None:
+        return None
+    data = _recv_exact(sock, struct.unpack(LENGTH_FORMAT, header)[0])
+    if data is None:
+        return None
+    return json.loads(data.decode("utf-8"))
+
+
+class PersonCache:
+    """LRU cache: input content hash -> Checker.InputRecords (persons, SCHE and UPDATE requests)."""
+    capacity: int
+    hits: int
+    misses: int
+
+    def __init__(self, capacity: int = PERSON_CACHE_SIZE):
+        self.capacity = capacity
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[str, Checker.InputRecords]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def records(self, text: str) -> Checker.InputRecords:
+        key = hashlib.sha256(text.encode("utf-8")).hexdigest()
+        with self._lock:
+            records = self._entries.get(key)
+            if records is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+        if records is None:
+            records = Checker.parseInputText(text)
+            with self._lock:
+                self.misses += 1
+                self._entries[key] = records
+                if len(self._entries) > self.capacity:
+                    self._entries.popitem(last=False)
+        return records
+
+
+def _read_text(request: Dict, name: str) -> str:
+    if name in request:
+        return request[name]
+    if name + "_path" in request:
+        with open(request[name + "_path"], "r", encoding="utf-8") as f:
+            return f.read()
+    raise KeyError(f"request needs '{name}' or '{name}_path'")
+
+
+def handle_check(request: Dict, cache: PersonCache) -> Dict:
+    input_text = _read_text(request, "input")
+    output_text = _read_text(request, "output")
+    try:
+        records = cache.records(input_text)
+        operations = [Operation.parse(line) for line in output_text.splitlines() if line.strip()]
+        checker = Checker.createChecker(records, operations)
+        checker.check()
+        metrics = checker.calcPerfomanceInfo()
+    except Exception as e:
+        message = f"{e.__class__.__name__}: {e}"
+        return {"ok": True, "verdict": "Fail", "error": message, "signature": runner.failure_signature(message)}
+    return {"ok": True, "verdict": "Pass", "metrics": list(metrics)}
+
+
+class CheckerServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+    cache: PersonCache
+    checks: int
+
+    def __init__(self, path: str):
+        if os.path.exists(path):
+            os.remove(path)
+        self.cache = PersonCache()
+        self.checks = 0
+        self._checks_lock = threading.Lock()
+        self.started = time.time()
+        super().__init__(path, CheckerRequestHandler)
+
+    def count_check(self):
+        """Handlers run in their own threads, so the counter is updated under a lock."""
+        with self._checks_lock:
+            self.checks += 1
+
+
+class CheckerRequestHandler(socketserver.BaseRequestHandler):
+    def handle(self):
+        server: CheckerServer = self.server
+        while True:
+            try:
+                request = recv_message(self.request)
+            except (OSError, ValueError):
+                return
+            if request is None:
+                return
+            op = request.get("op")
+            try:
+                if op == "check":
+                    response = handle_check(request, server.cache)
+                    server.count_check()
+                elif op == "ping":
+                    response = {"ok": True}
+                elif op == "stats":
+                    response = {"ok": True, "checks": server.checks, "cache_hits": server.cache.hits,
+                                "cache_misses": server.cache.misses, "uptime": time.time() - server.started}
+                elif op == "shutdown":
+                    send_message(self.request, {"ok": True})
+                    threading.Thread(target=server.shutdown, daemon=True).start()
+                    return
+                else:
+                    response = {"ok": False, "error": f"unknown op {op!r}"}
+            except Exception as e:
+                response = {"ok": False, "error": f"{e.__class__.__name__}: {e}"}
+            send_message(self.request, response)
+
+
+def serve(path: str = DEFAULT_SOCKET):
+    with CheckerServer(path) as server:
+        print(f"Checker service listening on {path}", file=sys.stderr)
+        try:
+            server.serve_forever()
+        finally:
+            if os.path.exists(path):
+                os.remove(path)
+
+
+class CheckerClient:
+    """Client for the checker service; one connection, reused for every request."""
+    path: str
+
+    def __init__(self, path: str = DEFAULT_SOCKET):
+        self.path = path
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.sock.connect(path)
+
+    def request(self, message: Dict) -> Dict:
+        send_message(self.sock, message)
+        response = recv_message(self.sock)
+        if response is None:
+            raise ConnectionError("checker service closed the connection")
+        if not response.get("ok"):
+            raise Exception(response.get("error"))
+        return response
+
+    def check(self, input_path: Optional[str] = None, output_path: Optional[str] = None,
+              input_text: Optional[str] = None, output_text: Optional[str] = None) -> Dict:
+        """Checks a run given by paths (read by the service) or inline text."""
+        message = {"op": "check"}
+        if input_text is not None:
+            message["input"] = input_text
+        else:
+            message["input_path"] = os.path.abspath(input_path)
+        if output_text is not None:
+            message["output"] = output_text
+        else:
+            message["output_path"] = os.path.abspath(output_path)
+        return self.request(message)
+
+    def stats(self) -> Dict:
+        return self.request({"op": "stats"})
+
+    def shutdown(self):
+        self.request({"op": "shutdown"})
+
+    def close(self):
+        self.sock.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def _wait_for_socket(path: str, timeout: float = 10.0):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            with CheckerClient(path) as client:
+                client.request({"op": "ping"})
+            return
+        except OSError:
+            time.sleep(0.05)
+    raise Exception(f"checker service did not start on {path}")
+
+
+def bench(checks: int, input_path: Optional[str], output_path: Optional[str], cold_runs: int = 10):
+    workdir = tempfile.mkdtemp(prefix="checkd_bench_")
+    if input_path is None or output_path is None:
+        input_path = os.path.join(workdir, "stdin.txt")
+        output_path = os.path.join(workdir, "output.txt")
+        with open(input_path, "w", encoding="utf-8") as f:
+            f.write(SAMPLE_INPUT)
+        with open(output_path, "w", encoding="utf-8") as f:
+            f.write(SAMPLE_OUTPUT)
+    path = os.path.join(workdir, "checkd.sock")
+    here = os.path.dirname(os.path.abspath(__file__))
+    server = subprocess.Popen([sys.executable, os.path.abspath(__file__), "serve", "--socket", path], cwd=here)
+    try:
+        _wait_for_socket(path)
+        # Cold: a fresh interpreter per check, as scripts calling Checker.check do today.
+        start = time.perf_counter()
+        for _ in range(cold_runs):
+            subprocess.run([sys.executable, "-c", f"import Checker; Checker.check({input_path!r}, {output_path!r})"],
+                           cwd=here, check=True)
+        cold = cold_runs / (time.perf_counter() - start)
+        # In-process: modules warm, input cached by path + mtime (Checker.parseInput), output re-parsed.
+        start = time.perf_counter()
+        for _ in range(checks):
+            Checker.check(input_path, output_path)
+        in_process = checks / (time.perf_counter() - start)
+        # Service: warm modules and cached persons.
+        with CheckerClient(path) as client:
+            verdict = client.check(input_path, output_path)
+            start = time.perf_counter()
+            for _ in range(checks):
+                client.check(input_path, output_path)
+            service = checks / (time.perf_counter() - start)
+            stats = client.stats()
+            client.shutdown()
+        print(f"Verdict: {verdict['verdict']} {verdict.get('metrics', verdict.get('error'))}")
+        print(f"  cold interpreter : {cold:10.1f} checks/s ({cold_runs} runs)")
+        print(f"  in-process       : {in_process:10.1f} checks/s")
+        print(f"  service          : {service:10.1f} checks/s (cache hits {stats['cache_hits']}, misses {stats['cache_misses']})")
+    finally:
+        if server.poll() is None:
+            server.terminate()
+        server.wait()
+        for name in os.listdir(workdir):
+            os.remove(os.path.join(workdir, name))
+        os.rmdir(workdir)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Checker service over a Unix domain socket.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    serve_parser = subparsers.add_parser("serve", help="Run the service in the foreground.")
+    serve_parser.add_argument("--socket", default=DEFAULT_SOCKET)
+    check_parser = subparsers.add_parser("check", help="Check one run through a running service.")
+    check_parser.add_argument("input")
+    check_parser.add_argument("output")
+    check_parser.add_argument("--socket", default=DEFAULT_SOCKET)
+    bench_parser = subparsers.add_parser("bench", help="Measure checks/sec with and without the service.")
+    bench_parser.add_argument("--checks", type=int, default=2000)
+    bench_parser.add_argument("--input", default=None)
+    bench_parser.add_argument("--output", default=None)
+    args = parser.parse_args()
+    if not hasattr(socket, "AF_UNIX"):
+        print("ERROR: Unix domain sockets are not available on this platform.", file=sys.stderr)
+        sys.exit(1)
+    if args.command == "serve":
+        serve(args.socket)
+    elif args.command == "check":
+        with CheckerClient(args.socket) as client:
+            result = client.check(args.input, args.output)
+        print(json.dumps(result, ensure_ascii=False))
+        sys.exit(0 if result["verdict"] == "Pass" else 1)
+    else:
+        bench(args.checks, args.input, args.output)
@@ -0,0 +1,196 @@
+# features.py
+"""
+Workload features of a stdin.txt and their correlation with jar performance.
+
+extract_features() turns one input into a flat dict of numbers; the runner stores
+it next to every jar's metrics in judge_result/campaign.jsonl, and
+campaign_report() fits per-jar rank correlations / regressions over the whole
+campaign and turns the strongest ones into readable degradation statements.
+"""
+import json
+import sys
+from typing import Dict, List
+
+import numpy as np
+
+import gen
+
+DENSE_POINT_MIN_REQUESTS = 5  # a time point with at least this many requests counts as dense
+MIN_CASES = 8  # below this many passing cases a jar is not analysed
+MIN_ABS_RHO = 0.3
+MIN_RATIO = 1.2
+TOP_FEATURES = 3
+
+METRIC_NAMES = {
+    "systemRunTime": "SystemRunTime",
+    "avgTaskCompleteTime": "AvgTaskTime",
+    "powerConsumption": "PowerConsumption",
+}
+
+# How a "feature > threshold" condition reads in the report.
+FEATURE_PHRASES = {
+    "requests": "the input has more than {thr:g} requests",
+    "passengers": "there are more than {thr:g} passengers",
+    "max_arrivals_1s": "more than {thr:g} requests arrive within 1s",
+    "max_arrivals_5s": "more than {thr:g} requests arrive within 5s",
+    "peak_rate": "the busiest second has more than {thr:g} requests",
+    "rate_cv": "the per-second arrival rate has CV above {thr:.2f}",
+    "burstiness": "inter-arrival burstiness exceeds {thr:.2f}",
+    "mean_trip_length": "the mean trip is longer than {thr:.1f} floors",
+    "up_ratio": "more than {thr:.0%} of trips go up",
+    "basement_ratio": "more than {thr:.0%} of trips touch a basement",
+    "pair_entropy": "the floor-pair entropy exceeds {thr:.2f}",
+    "priority_mean": "the mean priority exceeds {thr:.1f}",
+    "priority_skew": "the priority skewness exceeds {thr:.2f}",
+    "sche_density": "SCHE density exceeds {thr:.3f} per second",
+    "update_density": "UPDATE density exceeds {thr:.3f} per second",
+    "dense_points": "more than {thr:g} dense time points exist",
+}
+FEATURE_NAMES = list(FEATURE_PHRASES)
+
+
+def extract_features(lines: List[str]) -> Dict[str, float]:
+    """Computes workload features of one input, given its stdin.txt lines."""
+    requests = [gen.parse_request_line(line) for line in lines if line.strip()]
+    passengers = [req for req in requests if req["type"] == "passenger"]
+    all_times = np.array([req["time"] for req in requests], dtype=float)
+    times = np.sort(np.array([req["time"] for req in passengers], dtype=float))
+    span = float(all_times.max() - all_times.min()) if len(all_times) > 1 else 0.0
+    span = max(span, 1.0)
+
+    features = dict.fromkeys(FEATURE_NAMES, 0.0)
+    features["requests"] = float(len(requests))
+    features["passengers"] = float(len(passengers))
+    features["sche_density"] = sum(req["type"] == "sche" for req in requests) / span
+    features["update_density"] = sum(req["type"] == "update" for req in requests) / span
+    if len(all_times):
+        _, counts = np.unique(all_times, return_counts=True)
+        features["dense_points"] = float(np.count_nonzero(counts >= DENSE_POINT_MIN_REQUESTS))
+    if len(all_times) > 2:
+        gaps = np.diff(np.sort(all_times))
+        mu, sigma = gaps.mean(), gaps.std()
+        features["burstiness"] = float((sigma - mu) / (sigma + mu)) if sigma + mu > 0 else 0.0
+    if not len(times):
+        return features
+
+    # Arrival rate over time windows.
+    index = np.arange(len(times))
+    features["max_arrivals_1s"] = float((np.searchsorted(times, times + 1.0, side="left") - index).max())
+    features["max_arrivals_5s"] = float((np.searchsorted(times, times + 5.0, side="left") - index).max())
+    per_second = np.bincount(np.floor(times).astype(int))
+    features["peak_rate"] = float(per_second.max())
+    features["rate_cv"] = float(per_second.std() / per_second.mean()) if per_second.mean() > 0 else 0.0
+
+    # Floor-pair distribution.
+    src = np.array([gen.FLOOR_MAP[req["from"]] for req in passengers])
+    dst = np.array([gen.FLOOR_MAP[req["to"]] for req in passengers])
+    basement = gen.FLOOR_MAP["F1"]
+    features["mean_trip_length"] = float(np.abs(dst - src).mean())
+    features["up_ratio"] = float(np.mean(dst > src))
+    features["basement_ratio"] = float(np.mean((src < basement) | (dst < basement)))
+    pair_counts = np.bincount(src * gen.NUM_FLOORS + dst, minlength=gen.NUM_FLOORS ** 2)
+    p = pair_counts[pair_counts > 0] / len(passengers)
+    features["pair_entropy"] = float(-(p * np.log(p)).sum() / np.log(gen.NUM_FLOORS * (gen.NUM_FLOORS - 1)))
+
+    # Priority skew.
+    priority = np.array([req["priority"] for req in passengers], dtype=float)
+    features["priority_mean"] = float(priority.mean())
+    if priority.std() > 0:
+        features["priority_skew"] = float((((priority - priority.mean()) / priority.std()) ** 3).mean())
+    return features
+
+
+def _average_ranks(matrix: np.ndarray) -> np.ndarray:
+    """Column-wise ranks with ties replaced by their average rank."""
+    ranks = np.empty_like(matrix, dtype=float)
+    for col in range(matrix.shape[1]):
+        _, inverse, counts = np.unique(matrix[:, col], return_inverse=True, return_counts=True)
+        upper = np.cumsum(counts)
+        ranks[:, col] = (upper - (counts - 1) / 2.0)[inverse]
+    return ranks
+
+
+def _column_corr(x: np.ndarray, y: np.ndarray) -> np.ndarray:
+    """Pearson correlation of every column of x with vector y (0 where undefined)."""
+    xc = x - x.mean(axis=0)
+    yc = y - y.mean()
+    denom = np.sqrt((xc ** 2).sum(axis=0) * (yc ** 2).sum())
+    with np.errstate(invalid="ignore", divide="ignore"):
+        corr = (xc * yc[:, None]).sum(axis=0) / denom
+    return np.nan_to_num(corr)
+
+
+def analyse_jar(records: List[Dict], metric: str) -> List[Dict]:
+    """Spearman rho, regression slope and high/low ratio of one metric against every feature."""
+    x = np.array([[rec["features"][name] for name in FEATURE_NAMES] for rec in records], dtype=float)
+    y = np.array([rec[metric] for rec in records], dtype=float)
+    rho = _column_corr(_average_ranks(x), _average_ranks(y[:, None])[:, 0])
+    var = x.var(axis=0)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        slope = np.nan_to_num(((x - x.mean(axis=0)) * (y - y.mean())[:, None]).mean(axis=0) / var)
+    thresholds = np.percentile(x, 75, axis=0, method="lower")
+    high = x > thresholds
+    results = []
+    for col, name in enumerate(FEATURE_NAMES):
+        n_high = int(high[:, col].sum())
+        n_low = len(y) - n_high
+        if n_high == 0 or n_low == 0:
+            continue
+        low_mean = y[~high[:, col]].mean()
+        ratio = y[high[:, col]].mean() / low_mean if low_mean > 0 else float("inf")
+        results.append({
+            "feature": name,
+            "rho": float(rho[col]),
+            "slope": float(slope[col]),
+            "threshold": float(thresholds[col]),
+            "ratio": float(ratio),
+            "n_high": n_high,
+            "n_low": n_low,
+        })
+    results.sort(key=lambda r: abs(r["rho"]), reverse=True)
+    return results
+
+
+def campaign_report(records: List[Dict]) -> str:
+    """Builds the text report from campaign records of passing runs."""
+    by_jar: Dict[str, List[Dict]] = {}
+    for rec in records:
+        if rec.get("state") == "Pass":
+            by_jar.setdefault(rec["jar"], []).append(rec)
+    lines = ["Workload feature report"]
+    for jar in sorted(by_jar):
+        jar_records = by_jar[jar]
+        lines.append(f"\n== {jar} ({len(jar_records)} passing cases) ==")
+        if len(jar_records) < MIN_CASES:
+            lines.append(f"  Not enough passing cases (need {MIN_CASES}).")
+            continue
+        found = False
+        for metric, metric_name in METRIC_NAMES.items():
+            results = analyse_jar(jar_records, metric)
+            strongest = [r for r in results if abs(r["rho"]) >= MIN_ABS_RHO][:TOP_FEATURES]
+            for r in strongest:
+                condition = FEATURE_PHRASES[r["feature"]].format(thr=r["threshold"])
+                if r["ratio"] >= MIN_RATIO:
+                    verdict = f"degrades {r['ratio']:.1f}x"
+                elif r["ratio"] <= 1 / MIN_RATIO:
+                    verdict = f"improves {1 / r['ratio']:.1f}x"
+                else:
+                    verdict = f"changes {r['ratio']:.2f}x"
+                lines.append(f"  {metric_name}: {jar} {verdict} when {condition} "
+                             f"(rho={r['rho']:+.2f}, slope={r['slope']:+.4g}, n={r['n_high']}/{r['n_low']})")
+                found = True
+        if not found:
+            lines.append(f"  No feature correlates with |rho| >= {MIN_ABS_RHO}.")
+    return "\n".join(lines)
+
+
+def load_campaign(path: str) -> List[Dict]:
+    with open(path, "r", encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+if __name__ == "__main__":
+    if len(sys.argv) != 2:
+        print("Usage: python features.py judge_result/campaign.jsonl", file=sys.stderr)
+        sys.exit(1)
+    print(campaign_report(load_campaign(sys.argv[1])))
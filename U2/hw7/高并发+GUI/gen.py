@@ -7,6 +7,10 @@ import re
 import math  # No longer strictly needed but keep for now
 from typing import List, Dict, Optional, Tuple, Set
 import argparse
+import json
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
 # 修改后，生成的数据无时间间隔
 # --- Constants --- (Updated Dense constants)
 FLOORS = ["B4", "B3", "B2", "B1", "F1", "F2", "F3", "F4", "F5", "F6", "F7"]
@@ -37,6 +41,11 @@ MIN_SCHE_TO_UPDATE_SEPARATION = 8.0
 MIN_DENSE_TARGET_POINTS = 2
 MAX_DENSE_TARGET_POINTS = 4  # Updated range to 2-4
 MIN_DENSE_POINT_SEPARATION = 5.0  # Min seconds between chosen target points
+# --- Traffic Profile Constants ---
+PROFILE_GRID_POINTS = 2000  # Resolution of the intensity grid used for inverse-CDF sampling
+LOBBY_FLOOR = "F1"
+UPPER_FLOORS = ["F2", "F3", "F4", "F5", "F6", "F7"]
+BASEMENT_FLOORS = ["B4", "B3", "B2", "B1"]
 
 
 def generate_hw7_data(
@@ -497,8 +506,506 @@ def generate_hw7_data(
     return final_requests
 
 
+# --- Traffic Profiles ---
+# Each profile is an arrival intensity over normalized time [0, 1] (a Gaussian
+# peak on top of a base level) plus an origin/destination sampler.
+# Several profiles can be composed, e.g. "up_peak:2+lunch+down_peak".
+TRAFFIC_PROFILES = {
+    "up_peak": {"center": 0.2, "width": 0.08, "base": 0.05},  # morning, from the lobby upwards
+    "down_peak": {"center": 0.8, "width": 0.08, "base": 0.05},  # evening, back down to the lobby
+    "lunch": {"center": 0.5, "width": 0.12, "base": 0.1},  # interfloor plus lobby trips in both directions
+    "parking": {"center": 0.5, "width": 0.3, "base": 0.3},  # basement-heavy parking garage traffic
+}
+PROFILE_MAIN_FLOW_PROB = 0.85  # share of trips that follow the profile's main direction
+
+
+def _floor_indices(names: List[str]) -> np.ndarray:
+    return np.array([FLOOR_MAP[name] for name in names])
+
+
+def _sample_floors(rng: np.random.Generator, names: List[str], n: int) -> np.ndarray:
+    return rng.choice(_floor_indices(names), size=n)
+
+
+def _sample_destinations(rng: np.random.Generator, names: List[str], src: np.ndarray) -> np.ndarray:
+    """Samples destinations uniformly from names, never equal to the matching src."""
+    choices = np.sort(_floor_indices(names))
+    contains = np.isin(src, choices)
+    # Draw among len-1 slots when src is one of the choices, then skip over src.
+    picks = rng.integers(0, len(choices) - contains.astype(int))
+    position = np.searchsorted(choices, src)
+    picks = np.where(contains & (picks >= position), picks + 1, picks)
+    return choices[picks]
+
+
+def _random_trips(rng: np.random.Generator, n: int) -> Tuple[np.ndarray, np.ndarray]:
+    src = rng.integers(0, NUM_FLOORS, size=n)
+    return src, _sample_destinations(rng, FLOORS, src)
+
+
+def _profile_trips(rng: np.random.Generator, profile: str, n: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Vectorized origin/destination sampling for n trips of one profile."""
+    lobby = FLOOR_MAP[LOBBY_FLOOR]
+    if profile == "up_peak":
+        src = np.full(n, lobby)
+        dst = _sample_floors(rng, UPPER_FLOORS, n)
+    elif profile == "down_peak":
+        src = _sample_floors(rng, UPPER_FLOORS, n)
+        dst = np.full(n, lobby)
+    elif profile == "lunch":
+        src = _sample_floors(rng, UPPER_FLOORS, n)
+        dst = _sample_destinations(rng, UPPER_FLOORS, src)
+        kind = rng.random(n)
+        to_lobby = kind < 0.25
+        from_lobby = (kind >= 0.25) & (kind < 0.5)
+        dst = np.where(to_lobby, lobby, dst)
+        src, dst = np.where(from_lobby, lobby, src), np.where(from_lobby, src, dst)
+    else:  # parking
+        basement = _sample_floors(rng, BASEMENT_FLOORS, n)
+        other = _sample_floors(rng, [LOBBY_FLOOR] + UPPER_FLOORS, n)
+        leaving = rng.random(n) < 0.5
+        src = np.where(leaving, other, basement)
+        dst = np.where(leaving, basement, other)
+    # The rest of the trips are background traffic between random floors.
+    background = rng.random(n) >= PROFILE_MAIN_FLOW_PROB
+    bg_src, bg_dst = _random_trips(rng, n)
+    return np.where(background, bg_src, src), np.where(background, bg_dst, dst)
+
+
+def parse_profile_spec(spec: str) -> List[Tuple[str, float]]:
+    """Parses 'up_peak:2+lunch' into [('up_peak', 2.0), ('lunch', 1.0)]."""
+    components = []
+    for part in spec.split("+"):
+        name, _, weight = part.strip().partition(":")
+        if name not in TRAFFIC_PROFILES:
+            raise ValueError(f"Unknown traffic profile '{name}'. Choices: {', '.join(TRAFFIC_PROFILES)}")
+        value = float(weight) if weight else 1.0
+        if not (0 < value < math.inf):
+            raise ValueError(f"Traffic profile weight must be a positive number, got '{part.strip()}'.")
+        components.append((name, value))
+    return components
+
+
+def generate_profile_data(
+    total_requests: int,
+    profile: str,
+    max_time: float = DEFAULT_PUBLIC_MAX_TIMESTAMP,
+    seed: Optional[int] = None,
+) -> List[str]:
+    """
+    Generates passenger-only traffic following one or more daily traffic profiles.
+    Arrivals are an inhomogeneous Poisson process conditioned on total_requests
+    arrivals, i.e. i.i.d. draws from the normalized intensity, sampled with a
+    vectorized inverse CDF. Course request caps are not applied.
+    Without a seed, the numpy generator is seeded from `random`, so random.seed() still
+    makes the output reproducible.
+    """
+    components = parse_profile_spec(profile)
+    n = max(MIN_REQUESTS, total_requests)
+    max_time = max(MIN_TIMESTAMP, max_time)
+    rng = np.random.default_rng(seed if seed is not None else random.getrandbits(64))
+
+    # Per-component intensity on a grid over [MIN_TIMESTAMP, max_time].
+    grid = np.linspace(MIN_TIMESTAMP, max_time, PROFILE_GRID_POINTS)
+    phase = (grid - MIN_TIMESTAMP) / max(max_time - MIN_TIMESTAMP, 1e-9)
+    intensity = np.array([
+        weight * (TRAFFIC_PROFILES[name]["base"]
+                  + np.exp(-0.5 * ((phase - TRAFFIC_PROFILES[name]["center"]) / TRAFFIC_PROFILES[name]["width"]) ** 2))
+        for name, weight in components
+    ])
+    total = intensity.sum(axis=0)
+    cumulative = np.concatenate(([0.0], np.cumsum((total[1:] + total[:-1]) / 2 * np.diff(grid))))
+    times = np.interp(rng.random(n) * cumulative[-1], cumulative, grid)
+
+    # Attribute each arrival to a component with probability proportional to its share of the intensity.
+    shares = np.array([np.interp(times, grid, row) for row in intensity]) / np.interp(times, grid, total)
+    owner = (rng.random(n) > np.cumsum(shares, axis=0)).sum(axis=0)
+    owner = np.minimum(owner, len(components) - 1)
+    src = np.empty(n, dtype=int)
+    dst = np.empty(n, dtype=int)
+    for k, (name, _) in enumerate(components):
+        mask = owner == k
+        src[mask], dst[mask] = _profile_trips(rng, name, int(mask.sum()))
+
+    order = np.argsort(times, kind="stable")
+    times = np.clip(np.round(times[order], 1), MIN_TIMESTAMP, max_time)
+    src, dst = src[order], dst[order]
+    ids = rng.choice(max(MAX_PASSENGER_ID, 2 * n), size=n, replace=False) + 1
+    priorities = rng.integers(1, 101, size=n)
+    return [
+        f"[{ts:.1f}]{pid}-PRI-{pri}-FROM-{FLOORS[s]}-TO-{FLOORS[d]}"
+        for ts, pid, pri, s, d in zip(times.tolist(), ids.tolist(), priorities.tolist(), src.tolist(), dst.tolist())
+    ]
+
+
+# --- Stress Mode ---
+STRESS_ARRIVAL_RATE = 100.0  # Passenger requests per second when no max time is given
+STRESS_SCHE_RATIO = 0.001  # Default SCHE requests per passenger request
+
+
+def _format_tenths(t: int) -> str:
+    return f"{t // 10}.{t % 10}"
+
+
+def _spaced_times(rng: np.random.Generator, count: int, start: int, end: int, gap: int) -> np.ndarray:
+    """count sorted integer times in [start, end] with consecutive differences >= gap."""
+    slack = end - start - (count - 1) * gap
+    if count <= 0 or slack < 0:
+        return np.empty(0, dtype=np.int64)
+    return start + np.sort(rng.integers(0, slack + 1, size=count)) + gap * np.arange(count)
+
+
+def generate_stress_data(
+    num_passengers: int,
+    num_sche: Optional[int] = None,
+    num_update: int = NUM_ELEVATORS // 2,
+    max_time: Optional[float] = None,
+    seed: Optional[int] = None,
+) -> List[str]:
+    """
+    Generates very large inputs for scalability testing, ignoring course request caps.
+    Sampling is fully vectorized; SCHE/UPDATE requests still keep the 8s SCHE
+    separation per elevator, the 8s SCHE->UPDATE gap, no SCHE after an UPDATE,
+    and at most one UPDATE per elevator. Timestamps are handled in integer tenths
+    of a second so rounding can never break a separation rule.
+    """
+    n = max(0, num_passengers)
+    if max_time is None:
+        max_time = max(DEFAULT_PUBLIC_MAX_TIMESTAMP, n / STRESS_ARRIVAL_RATE)
+    if num_sche is None:
+        num_sche = int(n * STRESS_SCHE_RATIO)
+    num_update = max(0, min(num_update, NUM_ELEVATORS // 2))
+    rng = np.random.default_rng(seed if seed is not None else random.getrandbits(64))
+    lo = int(round(MIN_TIMESTAMP * 10))
+    hi = int(round(max_time * 10))
+    sche_gap = int(round(MIN_SCHE_SEPARATION_PER_ELEVATOR * 10))
+    update_gap = int(round(MIN_SCHE_TO_UPDATE_SEPARATION * 10))
+
+    # Passengers: unique ids, distinct floors via a non-zero offset modulo the floor count.
+    times = [rng.integers(lo, hi + 1, size=n)]
+    src = rng.integers(0, NUM_FLOORS, size=n)
+    dst = (src + rng.integers(1, NUM_FLOORS, size=n)) % NUM_FLOORS
+    ids = rng.permutation(n) + 1
+    priorities = rng.integers(1, 101, size=n)
+    lines = [
+        f"-{pid}-PRI-{pri}-FROM-{FLOORS[s]}-TO-{FLOORS[d]}"
+        for pid, pri, s, d in zip(ids.tolist(), priorities.tolist(), src.tolist(), dst.tolist())
+    ]
+
+    # UPDATE: disjoint elevator pairs, late enough to leave room for an earlier SCHE gap.
+    elevators = rng.permutation(np.arange(1, NUM_ELEVATORS + 1))
+    sche_end = {int(eid): hi for eid in elevators}
+    if num_update > 0 and hi - lo >= update_gap:
+        update_times = rng.integers(lo + update_gap, hi + 1, size=num_update)
+        targets = rng.choice(UPDATE_TARGET_FLOORS, size=num_update)
+        for k in range(num_update):
+            a, b = int(elevators[2 * k]), int(elevators[2 * k + 1])
+            sche_end[a] = sche_end[b] = int(update_times[k]) - update_gap
+            lines.append(f"-UPDATE-{a}-{b}-{targets[k]}")
+        times.append(update_times)
+
+    # SCHE: split the count over elevators, then place each elevator's SCHEs with the 8s gap.
+    per_elevator = rng.multinomial(max(0, num_sche), [1 / NUM_ELEVATORS] * NUM_ELEVATORS)
+    for eid, count in zip(range(1, NUM_ELEVATORS + 1), per_elevator.tolist()):
+        end = sche_end[eid]
+        count = min(count, max(0, (end - lo) // sche_gap + 1))
+        sche_times = _spaced_times(rng, count, lo, end, sche_gap)
+        speeds = rng.choice(SCHE_SPEEDS, size=len(sche_times))
+        targets = rng.choice(SCHE_TARGET_FLOORS, size=len(sche_times))
+        lines.extend(f"-SCHE-{eid}-{speed:.1f}-{target}" for speed, target in zip(speeds.tolist(), targets.tolist()))
+        times.append(sche_times)
+
+    all_times = np.concatenate(times)
+    order = np.argsort(all_times, kind="stable")
+    # Lines are stored with a leading '-' placeholder that the timestamp replaces.
+    return [f"[{_format_tenths(t)}]{lines[i][1:]}" for t, i in zip(all_times[order].tolist(), order.tolist())]
+
+
+def write_requests(path: str, lines: List[str]):
+    """Writes request lines to path with a single buffered write."""
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("\n".join(lines) + "\n" if lines else "")
+
+
+# --- Request Line Helpers (used by search / minimizer tools) ---
+REQUEST_LINE_PATTERN = re.compile(
+    r"\[\s*(\d+(?:\.\d+)?)\]"
+    r"(?:(\d+)-PRI-(\d+)-FROM-([BF]\d+)-TO-([BF]\d+)"
+    r"|SCHE-(\d+)-(\d+(?:\.\d+)?)-([BF]\d+)"
+    r"|UPDATE-(\d+)-(\d+)-([BF]\d+))"
+)
+
+
+def parse_request_line(line: str) -> Dict:
+    """
+    Parses one stdin.txt line back into the request dict format used by the
+    generator pool, with the placed timestamp stored under 'time'.
+    SCHE requests additionally carry 'elevator'; UPDATE requests carry 'a'/'b'.
+    """
+    match = REQUEST_LINE_PATTERN.fullmatch(line.strip())
+    if not match:
+        raise ValueError(f"Invalid request line: {line!r}")
+    g = match.groups()
+    ts = float(g[0])
+    if g[1] is not None:
+        return {
+            "type": "passenger",
+            "time": ts,
+            "id": int(g[1]),
+            "priority": int(g[2]),
+            "from": g[3],
+            "to": g[4],
+        }
+    if g[5] is not None:
+        return {
+            "type": "sche",
+            "time": ts,
+            "elevator": int(g[5]),
+            "speed": float(g[6]),
+            "target": g[7],
+        }
+    return {
+        "type": "update",
+        "time": ts,
+        "a": int(g[8]),
+        "b": int(g[9]),
+        "target": g[10],
+    }
+
+
+def format_request(req: Dict) -> str:
+    """Inverse of parse_request_line."""
+    ts = f"[{req['time']:.1f}]"
+    if req["type"] == "passenger":
+        return f"{ts}{req['id']}-PRI-{req['priority']}-FROM-{req['from']}-TO-{req['to']}"
+    if req["type"] == "sche":
+        return f"{ts}SCHE-{req['elevator']}-{req['speed']:.1f}-{req['target']}"
+    return f"{ts}UPDATE-{req['a']}-{req['b']}-{req['target']}"
+
+
+def check_request_constraints(
+    requests: List[Dict], mutual_mode: bool, max_time: Optional[float] = None
+) -> Optional[str]:
+    """
+    Validates a parsed request list against the same rules generate_hw7_data
+    enforces (public limits use the defaults, without overrides).
+    Returns a description of the first violation, or None if the list is valid.
+    """
+    if mutual_mode:
+        max_timestamp = DEFAULT_MUTUAL_MAX_TIMESTAMP
+        max_total = DEFAULT_MUTUAL_MAX_TOTAL_REQUESTS
+        max_sche_total = DEFAULT_MUTUAL_MAX_SCHE_TOTAL
+        max_sche_per_elevator = DEFAULT_MUTUAL_MAX_SCHE_PER_ELEVATOR
+        max_update_total = DEFAULT_MUTUAL_MAX_UPDATE_TOTAL
+    else:
+        max_timestamp = DEFAULT_PUBLIC_MAX_TIMESTAMP
+        max_total = DEFAULT_PUBLIC_MAX_TOTAL_REQUESTS
+        max_sche_total = DEFAULT_PUBLIC_MAX_SCHE_TOTAL
+        max_sche_per_elevator = DEFAULT_PUBLIC_MAX_SCHE_PER_ELEVATOR
+        max_update_total = DEFAULT_PUBLIC_MAX_UPDATE_TOTAL
+    if max_time is not None and max_time >= MIN_TIMESTAMP:
+        max_timestamp = max_time
+    max_update_total = min(max_update_total, NUM_ELEVATORS // 2)
+
+    if not MIN_REQUESTS <= len(requests) <= max_total:
+        return f"request count {len(requests)} out of range"
+    last_time = 0.0
+    passenger_ids: Set[int] = set()
+    last_sche_time: Dict[int, float] = {}
+    sche_count: Dict[int, int] = {}
+    updated_elevators: Set[int] = set()
+    sche_total = 0
+    update_total = 0
+    for req in requests:
+        ts = req["time"]
+        if ts < MIN_TIMESTAMP or ts > max_timestamp:
+            return f"timestamp {ts} out of range"
+        if ts < last_time:
+            return f"timestamp {ts} is not in ascending order"
+        last_time = ts
+        if req["type"] == "passenger":
+            if req["id"] in passenger_ids or not 1 <= req["id"] <= 2147483647:
+                return f"invalid or duplicated passenger id {req['id']}"
+            if not 1 <= req["priority"] <= 100:
+                return f"invalid priority {req['priority']}"
+            if req["from"] not in FLOOR_MAP or req["to"] not in FLOOR_MAP:
+                return f"invalid floor in passenger {req['id']}"
+            if req["from"] == req["to"]:
+                return f"passenger {req['id']} starts at its destination"
+            passenger_ids.add(req["id"])
+        elif req["type"] == "sche":
+            eid = req["elevator"]
+            if not 1 <= eid <= NUM_ELEVATORS:
+                return f"invalid SCHE elevator {eid}"
+            if req["speed"] not in SCHE_SPEEDS or req["target"] not in SCHE_TARGET_FLOORS:
+                return f"invalid SCHE parameters for elevator {eid}"
+            if eid in updated_elevators:
+                return f"SCHE on elevator {eid} after its UPDATE"
+            if ts < last_sche_time.get(eid, -float("inf")) + MIN_SCHE_SEPARATION_PER_ELEVATOR:
+                return f"SCHE on elevator {eid} too close to previous SCHE"
+            sche_count[eid] = sche_count.get(eid, 0) + 1
+            if sche_count[eid] > max_sche_per_elevator:
+                return f"too many SCHE on elevator {eid}"
+            last_sche_time[eid] = ts
+            sche_total += 1
+            if sche_total > max_sche_total:
+                return "too many SCHE requests"
+        else:
+            a, b = req["a"], req["b"]
+            if a == b or not (1 <= a <= NUM_ELEVATORS and 1 <= b <= NUM_ELEVATORS):
+                return f"invalid UPDATE pair {a}-{b}"
+            if req["target"] not in UPDATE_TARGET_FLOORS:
+                return f"invalid UPDATE target {req['target']}"
+            if a in updated_elevators or b in updated_elevators:
+                return f"elevator in UPDATE {a}-{b} is already updated"
+            for eid in (a, b):
+                if ts < last_sche_time.get(eid, -float("inf")) + MIN_SCHE_TO_UPDATE_SEPARATION:
+                    return f"UPDATE {a}-{b} too close to SCHE on elevator {eid}"
+            updated_elevators.update((a, b))
+            update_total += 1
+            if update_total > max_update_total:
+                return "too many UPDATE requests"
+    return None
+
+
+# --- Batch Corpus Generation ---
+MANIFEST_NAME = "manifest.json"
+BATCH_OPTION_KEYS = ["total_requests", "mode", "pattern", "profile", "stress", "max_time", "sche", "update"]
+
+
+def _generate_case(index: int, seed: int, options: Dict, out_dir: str) -> Dict:
+    """Generates corpus case `index` from its own seed and returns its manifest entry."""
+    random.seed(seed)
+    mutual_mode = options["mode"] == "mutual"
+    if options["stress"]:
+        lines = generate_stress_data(
+            num_passengers=options["total_requests"],
+            num_sche=options["sche"],
+            num_update=options["update"],
+            max_time=options["max_time"],
+            seed=seed,
+        )
+    elif options["profile"] is not None:
+        lines = generate_profile_data(
+            total_requests=options["total_requests"],
+            profile=options["profile"],
+            max_time=options["max_time"]
+            if options["max_time"] is not None
+            else (DEFAULT_MUTUAL_MAX_TIMESTAMP if mutual_mode else DEFAULT_PUBLIC_MAX_TIMESTAMP),
+            seed=seed,
+        )
+    else:
+        lines = generate_hw7_data(
+            total_requests_target=options["total_requests"],
+            mutual_mode=mutual_mode,
+            pattern=options["pattern"],
+            max_time_override=options["max_time"],
+        )
+    case_dir = os.path.join(out_dir, str(index))
+    os.makedirs(case_dir, exist_ok=True)
+    write_requests(os.path.join(case_dir, "stdin.txt"), lines)
+    sche = sum("-SCHE-" in line for line in lines)
+    update = sum("-UPDATE-" in line for line in lines)
+    return {
+        "index": index,
+        "seed": seed,
+        "path": f"{index}/stdin.txt",
+        "requests": len(lines),
+        "passengers": len(lines) - sche - update,
+        "sche": sche,
+        "update": update,
+    }
+
+
+def load_manifest(corpus_dir: str) -> Dict:
+    with open(os.path.join(corpus_dir, MANIFEST_NAME), "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _write_manifest(corpus_dir: str, manifest: Dict):
+    with open(os.path.join(corpus_dir, MANIFEST_NAME), "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2, ensure_ascii=False)
+
+
+def batch_main(argv: List[str]) -> int:
+    """`python gen.py batch ...`: generates a corpus of inputs with per-case seeds."""
+    parser = argparse.ArgumentParser(
+        prog="gen.py batch",
+        description="Generate a corpus of HW7 inputs to <out>/<index>/stdin.txt with a manifest. "
+        "Case i uses seed base_seed + i, so any case can be regenerated alone with --only.",
+    )
+    parser.add_argument("count", type=int, nargs="?", default=None, help="Number of cases to generate.")
+    parser.add_argument("--length", type=int, default=100, help="Target requests per case (passengers in --stress).")
+    parser.add_argument("--mode", choices=["public", "mutual"], default="mutual")
+    parser.add_argument("--pattern", choices=["random", "uniform", "dense", "frequent"], default="random")
+    parser.add_argument("--profile", default=None, help="Traffic profile spec, see the main help.")
+    parser.add_argument("--stress", action="store_true", help="Bulk stress inputs, see the main help.")
+    parser.add_argument("--max_time", type=float, default=None)
+    parser.add_argument("--sche", type=int, default=None, help="SCHE requests per case in --stress mode.")
+    parser.add_argument("--update", type=int, default=NUM_ELEVATORS // 2, help="UPDATE requests per case in --stress mode.")
+    parser.add_argument("--seed", type=int, default=None, help="Base seed. Random (and recorded) if omitted.")
+    parser.add_argument("--out", default="corpus", help="Corpus directory. Defaults to 'corpus'.")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument(
+        "--only", type=int, default=None,
+        help="Regenerate a single case of an existing corpus, using the settings in its manifest.",
+    )
+    args = parser.parse_args(argv)
+
+    if args.only is not None:
+        try:
+            manifest = load_manifest(args.out)
+        except (IOError, ValueError) as e:
+            print(f"ERROR: Could not read manifest in {args.out}: {e}", file=sys.stderr)
+            return 1
+        if not 0 <= args.only < manifest["count"]:
+            print(f"ERROR: Case {args.only} is not in the corpus (0..{manifest['count'] - 1}).", file=sys.stderr)
+            return 1
+        entry = _generate_case(args.only, manifest["base_seed"] + args.only, manifest["options"], args.out)
+        manifest["cases"][args.only] = entry
+        _write_manifest(args.out, manifest)
+        print(f"Regenerated case {args.only} ({entry['requests']} requests) in {args.out}", file=sys.stderr)
+        return 0
+
+    if args.count is None or args.count <= 0 or args.length <= 0:
+        print("ERROR: A positive case count and --length are required.", file=sys.stderr)
+        return 1
+    if args.profile is not None:
+        parse_profile_spec(args.profile)  # fail early on a bad spec
+    options = {
+        "total_requests": args.length,
+        "mode": args.mode,
+        "pattern": args.pattern,
+        "profile": args.profile,
+        "stress": args.stress,
+        "max_time": args.max_time,
+        "sche": args.sche,
+        "update": args.update,
+    }
+    base_seed = args.seed if args.seed is not None else random.randrange(2 ** 31)
+    os.makedirs(args.out, exist_ok=True)
+    start = time.perf_counter()
+    cases = [None] * args.count
+    with ProcessPoolExecutor(max_workers=max(1, args.workers)) as executor:
+        futures = [
+            executor.submit(_generate_case, i, base_seed + i, options, args.out) for i in range(args.count)
+        ]
+        for future in as_completed(futures):
+            entry = future.result()
+            cases[entry["index"]] = entry
+    manifest = {"count": args.count, "base_seed": base_seed, "options": options, "cases": cases}
+    _write_manifest(args.out, manifest)
+    print(
+        f"Generated {args.count} cases to {args.out} (base seed {base_seed}) in {time.perf_counter() - start:.2f}s",
+        file=sys.stderr,
+    )
+    return 0
+
+
 # --- Main Program Entry --- (Argument parsing and final output unchanged)
 if __name__ == "__main__":
+    if len(sys.argv) > 1 and sys.argv[1] == "batch":
+        sys.exit(batch_main(sys.argv[2:]))
     parser = argparse.ArgumentParser(
         description="Generate HW7 elevator test data to stdin.txt. Mode (public/mutual) and pattern must be specified."
     )
@@ -532,6 +1039,32 @@ if __name__ == "__main__":
         default=None,
         help="Override default max total UPDATE requests (only used if mode is public).",
     )
+    parser.add_argument(
+        "--profile",
+        default=None,
+        help="Generate passenger traffic from daily traffic profiles instead of a pattern, "
+        f"e.g. 'up_peak' or 'up_peak:2+lunch+down_peak'. Choices: {', '.join(TRAFFIC_PROFILES)}.",
+    )
+    parser.add_argument(
+        "--stress",
+        action="store_true",
+        help="Generate a bulk stress input: total_requests passengers (1e5-1e6 is fine), course caps not applied.",
+    )
+    parser.add_argument(
+        "--sche",
+        type=int,
+        default=None,
+        help=f"Number of SCHE requests in stress mode. Defaults to {STRESS_SCHE_RATIO:g} per passenger.",
+    )
+    parser.add_argument(
+        "--update",
+        type=int,
+        default=NUM_ELEVATORS // 2,
+        help="Number of UPDATE requests in stress mode (at most 3).",
+    )
+    parser.add_argument(
+        "--seed", type=int, default=None, help="Random seed for --stress and --profile."
+    )
     parser.epilog = """
 Writes generated data directly to 'stdin.txt' in the current directory.
 
@@ -541,6 +1074,16 @@ Generation Patterns:
   dense     : Concentrates request proposals around 2-4 scattered time points.
   frequent  : Maximizes the number of SCHE requests within constraints.
 
+Traffic Profiles (--profile, passenger requests only, course request caps not applied):
+  up_peak   : Morning up-peak from F1 to the upper floors.
+  down_peak : Evening down-peak from the upper floors to F1.
+  lunch     : Interfloor traffic plus lobby trips in both directions around noon.
+  parking   : Basement-heavy traffic between B1-B4 and the other floors.
+
+Stress Mode (--stress, course request caps not applied):
+  Uniform random passengers over max_time (default: 100 requests/s), plus SCHE/UPDATE
+  requests that keep the 8s separation rules. Written to the file in one buffered write.
+
 Examples:
   Default (Public, random pattern):
     python gen.py 50 --mode public
@@ -550,6 +1093,15 @@ Examples:
     python gen.py 100 --mode public --pattern dense
   Mutual mode, Frequent SCHE pattern:
     python gen.py 70 --mode mutual --pattern frequent --max_time 40.0
+  Morning and evening peaks with lunch traffic in between:
+    python gen.py 500 --mode public --profile up_peak+lunch+down_peak
+  One million passengers with 2000 SCHE requests:
+    python gen.py 1000000 --mode public --stress --sche 2000 --seed 1
+
+Batch corpus (see 'python gen.py batch -h'):
+  500 mutual/dense cases with base seed 42, then regenerate case 17 alone:
+    python gen.py batch 500 --length 100 --mode mutual --pattern dense --max_time 2 --seed 42
+    python gen.py batch --only 17
 """
     args = parser.parse_args()
     if args.total_requests <= 0:
@@ -558,19 +1110,42 @@ Examples:
     is_mutual_mode = args.mode == "mutual"
     output_filename = "stdin.txt"
     try:
-        generated_data = generate_hw7_data(
-            total_requests_target=args.total_requests,
-            mutual_mode=is_mutual_mode,
-            pattern=args.pattern,
-            max_time_override=args.max_time,
-            max_sche_per_elevator_override=args.max_sche_per_elevator,
-            max_update_total_override=args.max_update_total,
-        )
+        if args.stress:
+            generated_data = generate_stress_data(
+                num_passengers=args.total_requests,
+                num_sche=args.sche,
+                num_update=args.update,
+                max_time=args.max_time,
+                seed=args.seed,
+            )
+        elif args.profile is not None:
+            generated_data = generate_profile_data(
+                total_requests=args.total_requests,
+                profile=args.profile,
+                max_time=args.max_time
+                if args.max_time is not None
+                else (DEFAULT_MUTUAL_MAX_TIMESTAMP if is_mutual_mode else DEFAULT_PUBLIC_MAX_TIMESTAMP),
+                seed=args.seed,
+            )
+        else:
+            generated_data = generate_hw7_data(
+                total_requests_target=args.total_requests,
+                mutual_mode=is_mutual_mode,
+                pattern=args.pattern,
+                max_time_override=args.max_time,
+                max_sche_per_elevator_override=args.max_sche_per_elevator,
+                max_update_total_override=args.max_update_total,
+            )
         try:
-            with open(output_filename, "w", encoding="utf-8") as f:
-                [f.write(line + "\n") for line in generated_data]
+            write_requests(output_filename, generated_data)
+            if args.stress:
+                source = "stress"
+            elif args.profile:
+                source = "profile: " + args.profile
+            else:
+                source = "pattern: " + args.pattern
             print(
-                f"Successfully generated {len(generated_data)} requests to {output_filename} (mode: {args.mode}, pattern: {args.pattern})",
+                f"Successfully generated {len(generated_data)} requests to {output_filename} (mode: {args.mode}, {source})",
                 file=sys.stderr,
             )
         except IOError as e:
@@ -1,4 +1,6 @@
 import os
+import gzip
+import json
 import time
 import traceback
 import shutil
@@ -29,13 +31,31 @@ def signal_handler(_sig, _frame):
 signal.signal(signal.SIGINT, signal_handler)
 
 import gen
-import Checker
+import features
+import runner
+import cds
+import storage
+import tracefile
 
 # 全局常量
 LENGTH = 100
 SERIAL = 500  # 测试时数字较小，实际使用时可调整
 MAX_THREAD = 20
 MAX_TIME_LIMIT = 120
+# 预生成语料目录（python gen.py batch 生成），设置后直接读取 <CORPUS_DIR>/<i>/stdin.txt，
+# 用例数以 manifest 为准；为 None 时在每个用例线程中现场生成
+CORPUS_DIR = None
+# 失败按 (jar, 归一化错误签名) 聚类，每类只完整保留前 CLUSTER_EXEMPLARS 个样例，
+# 其余样例的错误信息与输出按 CLUSTER_OVERFLOW 处理："gzip" 压缩保存，"drop" 直接丢弃
+CLUSTER_EXEMPLARS = 3
+CLUSTER_OVERFLOW = "gzip"
+# 为每个 jar 构建 AppCDS 归档（首次使用时生成于 .cds/，按 jar 哈希区分）以减少 JVM 启动时间，需要 JDK 13+
+USE_CDS = False
+# 运行产物（输入、输出、轨迹）先写在 WORK_ROOT 下的临时工作目录（默认 /dev/shm 内存盘，None 则直接写在当前目录），
+# 用例结束后失败样例复制到 in/ 与 out/，通过样例按 PASS_RETENTION 处理：
+# "xz"/"gz" 打包进 judge_result/passed.tar.xz|gz，"discard" 丢弃，"keep" 与失败样例一样保留
+WORK_ROOT = storage.default_work_root()
+PASS_RETENTION = "xz"
 
 EXE_PATH = os.path.abspath("datainput_student_win64.exe")
 
@@ -217,19 +237,67 @@ def test(length, total_case, file_name_list):
     performance_summary = {}
     summary_lock = threading.Lock()
 
+    # 每个(用例, jar)的输入特征与性能数据，测试结束后做相关性分析
+    campaign_records = []
+    campaign_lock = threading.Lock()
+
+    # 失败聚类: {(jar, signature): {"count", "cases", "exemplars"}}
+    clusters = {}
+    cluster_lock = threading.Lock()
+    overflow_stats = {"files": 0, "bytes": 0}
+
+    campaign = storage.Campaign(WORK_ROOT, ".", PASS_RETENTION)
+
+    def record_failure(test_index, file_name, message, err_info=None, output_file=None):
+        """登记一次失败；前 CLUSTER_EXEMPLARS 个样例完整保存，其余压缩或丢弃。"""
+        signature = runner.failure_signature(message)
+        with cluster_lock:
+            cluster = clusters.setdefault((file_name, signature), {"count": 0, "cases": [], "exemplars": []})
+            cluster["count"] += 1
+            cluster["cases"].append(test_index)
+            exemplar = len(cluster["exemplars"]) < CLUSTER_EXEMPLARS
+            if exemplar:
+                cluster["exemplars"].append(test_index)
+        error_path = f"judge_result/test{test_index}_errorInfo_{file_name}.txt"
+        if exemplar:
+            if err_info is not None:
+                with open(error_path, mode='w') as f:
+                    f.write("Fail.\n")
+                    f.write(err_info)
+            return
+        saved = 0
+        if err_info is not None and CLUSTER_OVERFLOW == "gzip":
+            with gzip.open(error_path + ".gz", mode='wt') as f:
+                f.write("Fail.\n")
+                f.write(err_info)
+        if output_file is not None and os.path.exists(output_file):
+            saved = os.path.getsize(output_file)
+            if CLUSTER_OVERFLOW == "gzip":
+                with open(output_file, 'rb') as fin, gzip.open(output_file + ".gz", 'wb') as fout:
+                    shutil.copyfileobj(fin, fout)
+                saved -= os.path.getsize(output_file + ".gz")
+            os.remove(output_file)
+            trace_file = os.path.splitext(output_file)[0] + ".trc"
+            if os.path.exists(trace_file):
+                saved += os.path.getsize(trace_file)
+                os.remove(trace_file)
+        with cluster_lock:
+            overflow_stats["files"] += 1
+            overflow_stats["bytes"] += saved
+
     def run_jar(file_name, test_index):
         update_gui(test_index, file_name, "运行程序输出中", "", "", "")
         gui_print(f'case{test_index}:运行jar: {file_name}...')
-        output_file = f'out/{file_name}/output_{test_index}.txt'
+        output_file = campaign.output_path(file_name, test_index)
         exe_proc = subprocess.Popen(
             [EXE_PATH],
-            cwd=f'in/{test_index}',
+            cwd=campaign.input_dir(test_index),
             stdout=subprocess.PIPE,
             stderr=subprocess.PIPE,
             text=True,
         )
         jar_proc = subprocess.Popen(
-            ['java', '-jar', f'jar/{file_name}'],
+            cds.java_command(f'jar/{file_name}') if USE_CDS else ['java', '-jar', f'jar/{file_name}'],
             stdin=exe_proc.stdout,
             stdout=subprocess.PIPE,
             stderr=subprocess.PIPE,
@@ -247,6 +315,7 @@ def test(length, total_case, file_name_list):
                     gui_print(f"jar执行失败 (尝试 {attempt + 1}/{retry_attempts}): {error_type}")
                     if attempt + 1 == retry_attempts:
                         update_gui(test_index, file_name, f"运行失败: {error_type}", "N/A", "N/A", "N/A")
+                        record_failure(test_index, file_name, error_type)
                         return [file_name, "Fail", error_type, "N/A", "N/A"]
                     time.sleep(0.5)  # 稍作等待后重试
             except subprocess.TimeoutExpired:
@@ -254,11 +323,13 @@ def test(length, total_case, file_name_list):
                 update_gui(test_index, file_name, f"检查失败: {error_type}", "N/A", "N/A", "N/A")
                 gui_print(f"运行时间超过{MAX_TIME_LIMIT}s, 输出时间过长错误")
                 time_exceed_errors.append((test_index, file_name))
+                record_failure(test_index, file_name, error_type)
                 return [file_name, "Fail", error_type, "N/A", "N/A"]
             except BrokenPipeError:
                 error_type = "Broken Pipe Error"
                 update_gui(test_index, file_name, f"Pipe运行失败: {error_type}", "N/A", "N/A", "N/A")
                 gui_print(f"Broken Pipe Error occurred")
+                record_failure(test_index, file_name, error_type)
                 return [file_name, "Fail", error_type, "N/A", "N/A"]
             else:
                 break  # 成功获取输出，跳出重试循环
@@ -266,22 +337,24 @@ def test(length, total_case, file_name_list):
             # 如果所有尝试都失败了，这里处理
             error_type = "多次尝试后jar执行仍然失败"
             update_gui(test_index, file_name, f"运行失败: {error_type}", "N/A", "N/A", "N/A")
+            record_failure(test_index, file_name, error_type)
             return [file_name, "Fail", error_type, "N/A", "N/A"]
         with open(output_file, 'w', encoding='utf-8') as fout:
             fout.write(jar_output)
         gui_print("开始检查数据有效性...")
         update_gui(test_index, file_name, "检查中", "", "", "")
         try:
-            performanceInfo = Checker.check(f"in/{test_index}/stdin.txt", output_file)
+            # 检查的同时写出二进制轨迹 output_<i>.trc，之后重新检查/评分无需再解析文本
+            performanceInfo = tracefile.check_and_trace(
+                campaign.input_path(test_index), output_file, campaign.output_path(file_name, test_index, ".trc"), [file_name]
+            )
         except Exception as e:
             error_type = f"{e.__class__.__name__}: {str(e)}"
             update_gui(test_index, file_name, f"检查失败: {error_type}", "N/A", "N/A", "N/A")
             err_info = traceback.format_exc()
             gui_print(err_info)
             gui_print(f"{file_name} 检查失败。")
-            with open(f"judge_result/test{test_index}_errorInfo_{file_name}.txt", mode='w') as f:
-                f.write("Fail.\n")
-                f.write(err_info)
+            record_failure(test_index, file_name, error_type, err_info, output_file)
             return [file_name, "Fail", error_type, "N/A", "N/A"]
         else:
             sys_rt = format(performanceInfo[0], ".4f")
@@ -294,26 +367,39 @@ def test(length, total_case, file_name_list):
     def run_case(i):
         gui_print(f"开始测试用例: {i}.")
         gui_print('生成输入数据...')
-        os.makedirs(f'in/{i}', exist_ok=True)
+        os.makedirs(campaign.input_dir(i), exist_ok=True)
         time.sleep(0.1)
         for file_name in file_name_list:
-            os.makedirs(f'out/{file_name}', exist_ok=True)
+            os.makedirs(campaign.output_dir(file_name), exist_ok=True)
         time.sleep(0.1)
-        generated_data = gen.generate_hw7_data(
-            total_requests_target=length,
-            mutual_mode=True,
-            pattern="dense",
-            max_time_override=2 
-        )
+        if CORPUS_DIR is not None:
+            try:
+                with open(os.path.join(CORPUS_DIR, str(i), "stdin.txt"), "r", encoding="utf-8") as f:
+                    generated_data = [line for line in f.read().splitlines() if line.strip()]
+            except Exception as e:
+                gui_print(f"Error reading corpus input for test case {i}: {str(e)}")
+                return
+        else:
+            generated_data = gen.generate_hw7_data(
+                total_requests_target=length,
+                mutual_mode=True,
+                pattern="dense",
+                max_time_override=2 
+            )
         # 等待数据生成完成
         time.sleep(0.2)
         try:
-            with open(f"in/{i}/stdin.txt", "w", encoding="utf-8") as f:
+            with open(campaign.input_path(i), "w", encoding="utf-8") as f:
                 [f.write(line + "\n") for line in generated_data]
         except Exception as e:
             gui_print(f"Error writing input data for test case {i}: {str(e)}")
             return
         gui_print(f"测试用例 {i} 输入数据生成完毕。")
+        try:
+            case_features = features.extract_features(generated_data)
+        except Exception as e:
+            gui_print(f"测试用例 {i} 特征提取失败: {str(e)}")
+            case_features = None
 
         for jar in file_name_list:
             update_gui(i, jar, "生成数据完成", "", "", "")
@@ -357,6 +443,24 @@ def test(length, total_case, file_name_list):
                         avg_pc = total_pc / count
                     summary_queue.put((file_name, format(avg_rt, ".4f"), format(avg_tct, ".4f"), format(avg_pc, ".2f"), count))
 
+        # 失败样例移到 in/ 与 out/，通过样例归档或丢弃，并清空该用例的工作目录
+        campaign.finish_case(i, {row[0]: row[1] == "Pass" for row in row_list})
+
+        if case_features is not None:
+            case_records = []
+            for row in row_list:
+                record = {"case": i, "jar": row[0], "state": row[1], "features": case_features}
+                if row[1] == "Pass":
+                    record["systemRunTime"] = float(row[2])
+                    record["avgTaskCompleteTime"] = float(row[3])
+                    record["powerConsumption"] = float(row[4])
+                case_records.append(record)
+            with campaign_lock:
+                campaign_records.extend(case_records)
+                with open("judge_result/campaign.jsonl", "a", encoding="utf-8") as f:
+                    for record in case_records:
+                        f.write(json.dumps(record) + "\n")
+
         with open(f"judge_result/test{i}_table.txt", mode='w') as f:
             f.write(table.get_string())
         gui_print(table.get_string())
@@ -414,6 +518,30 @@ def test(length, total_case, file_name_list):
     gui_print(output_str)
     gui_print("测试全部结束。")
 
+    cluster_table = PrettyTable(['count', 'file_name', 'signature', 'exemplar_cases'])
+    cluster_table.align['signature'] = 'l'
+    for (file_name, signature), cluster in sorted(clusters.items(), key=lambda item: -item[1]["count"]):
+        cluster_table.add_row([cluster["count"], file_name, signature, ", ".join(str(c) for c in sorted(cluster["exemplars"]))])
+    cluster_report = f"失败聚类（共 {len(clusters)} 类，按出现次数排序）:\n{cluster_table.get_string()}\n"
+    if overflow_stats["files"]:
+        action = "压缩" if CLUSTER_OVERFLOW == "gzip" else "丢弃"
+        cluster_report += f"超出样例数的失败 {overflow_stats['files']} 个，其输出已{action}，节省 {overflow_stats['bytes']} 字节。\n"
+    gui_print(cluster_report)
+    with open("judge_result/cluster_report.txt", mode='w', encoding="utf-8") as f:
+        f.write(cluster_report)
+        for (file_name, signature), cluster in sorted(clusters.items(), key=lambda item: -item[1]["count"]):
+            f.write(f"\n[{file_name}] {signature}\n  cases: {', '.join(str(c) for c in sorted(cluster['cases']))}\n")
+
+    storage_report = campaign.close()
+    gui_print(storage_report)
+    with open("judge_result/storage_report.txt", mode='w', encoding="utf-8") as f:
+        f.write(storage_report)
+
+    feature_report = features.campaign_report(campaign_records)
+    gui_print(feature_report)
+    with open("judge_result/feature_report.txt", mode='w', encoding="utf-8") as f:
+        f.write(feature_report)
+
     finished = set()
     if os.path.exists("final_table.txt"):
         with open("final_table.txt", "r") as f:
@@ -455,9 +583,15 @@ def test(length, total_case, file_name_list):
     with open("final_table.txt", mode='w') as f:
         f.write(output_str)
 
+def case_count():
+    """用例总数：使用预生成语料时以 manifest 记录的数量为准。"""
+    if CORPUS_DIR is None:
+        return SERIAL
+    return gen.load_manifest(CORPUS_DIR)["count"]
+
 def start_test():
     file_name_list = [f for f in os.listdir('jar')]
-    threading.Thread(target=test, args=(LENGTH, SERIAL, file_name_list), daemon=True).start()
+    threading.Thread(target=test, args=(LENGTH, case_count(), file_name_list), daemon=True).start()
 
 if __name__ == '__main__':
     root = tk.Tk()
@@ -465,6 +599,6 @@ if __name__ == '__main__':
         gui_print("jar文件夹找不到！")
         sys.exit(1)
     jar_files = [f for f in os.listdir('jar')]
-    gui = TestGUI(root, SERIAL, jar_files)
+    gui = TestGUI(root, case_count(), jar_files)
     root.after(500, start_test)
     root.mainloop()
@@ -0,0 +1,187 @@
+# minimize.py
+"""
+Delta-debugging minimizer for failing inputs.
+
+Given a failing (input, jar, failure signature), ddmin removes chunks of
+requests as long as the jar still fails with the same normalized signature
+(runner.failure_signature). Every candidate is checked with
+gen.check_request_constraints before it is run, candidates of one ddmin
+round are run concurrently, and each candidate is retried REPEAT times so a
+flaky failure is not lost. The result is 1-minimal: removing any single
+request makes the failure disappear.
+"""
+import argparse
+import itertools
+import os
+import shutil
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional
+
+import Checker
+import gen
+import runner
+
+MAX_THREAD = 8
+REPEAT = 3  # runs per candidate; the candidate reproduces if any run hits the signature
+WORK_ROOT = "minimize_work"
+
+
+def run_signature(lines: List[str], jar_path: str, workdir: str, timeout: float) -> Optional[str]:
+    """Runs the jar once on lines and returns the failure signature, or None if it passes."""
+    runner.prepare_workdir(workdir, lines)
+    result = runner.run_jar(jar_path, workdir, timeout)
+    if result.timedOut:
+        return "Time limit exceeded"
+    if result.returncode != 0:
+        return runner.failure_signature(f"jar exited with code {result.returncode}")
+    try:
+        Checker.check(os.path.join(workdir, "stdin.txt"), result.outputPath)
+    except Exception as e:
+        return runner.failure_signature(f"{e.__class__.__name__}: {e}")
+    return None
+
+
+class Minimizer:
+    jarPath: str
+    signature: str
+    repeat: int
+    workers: int
+    timeout: float
+    validation: Optional[Dict]
+    runs: int
+
+    def __init__(self, jar_path: str, signature: str, repeat: int, workers: int, timeout: float, validation: Optional[Dict]):
+        self.jarPath = jar_path
+        self.signature = signature
+        self.repeat = repeat
+        self.workers = workers
+        self.timeout = timeout
+        self.validation = validation
+        self.runs = 0
+        self._counter = itertools.count()
+        self._lock = threading.Lock()
+        self._cache: Dict[tuple, bool] = {}
+
+    def is_valid(self, requests: List[Dict]) -> bool:
+        if not requests:
+            return False
+        if self.validation is None:
+            return True
+        return gen.check_request_constraints(requests, **self.validation) is None
+
+    def reproduces(self, requests: List[Dict]) -> bool:
+        lines = [gen.format_request(req) for req in requests]
+        key = tuple(lines)
+        with self._lock:
+            if key in self._cache:
+                return self._cache[key]
+        workdir = os.path.join(WORK_ROOT, str(next(self._counter)))
+        hit = False
+        try:
+            for _ in range(self.repeat):
+                with self._lock:
+                    self.runs += 1
+                if run_signature(lines, self.jarPath, workdir, self.timeout) == self.signature:
+                    hit = True
+                    break
+        finally:
+            shutil.rmtree(workdir, ignore_errors=True)
+        with self._lock:
+            self._cache[key] = hit
+        return hit
+
+    def first_reproducing(self, executor: ThreadPoolExecutor, candidates: List[List[Dict]]) -> Optional[List[Dict]]:
+        """Runs all valid candidates concurrently and returns the first (in order) that reproduces."""
+        candidates = [c for c in candidates if self.is_valid(c)]
+        results = list(executor.map(self.reproduces, candidates))
+        for candidate, hit in zip(candidates, results):
+            if hit:
+                return candidate
+        return None
+
+    def ddmin(self, requests: List[Dict]) -> List[Dict]:
+        n = 2
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            while len(requests) >= 2:
+                n = min(n, len(requests))
+                size = len(requests) / n
+                chunks = [requests[int(k * size):int((k + 1) * size)] for k in range(n)]
+                found = self.first_reproducing(executor, chunks)
+                if found is not None:
+                    requests, n = found, 2
+                    print(f"  reduced to {len(requests)} requests (subset)")
+                    continue
+                complements = [
+                    [req for j, chunk in enumerate(chunks) if j != k for req in chunk] for k in range(n)
+                ] if n > 2 else []
+                found = self.first_reproducing(executor, complements)
+                if found is not None:
+                    requests, n = found, max(n - 1, 2)
+                    print(f"  reduced to {len(requests)} requests (complement)")
+                    continue
+                if n >= len(requests):
+                    break  # every single-request removal was tried: 1-minimal
+                n = min(len(requests), 2 * n)
+        return requests
+
+
+def minimize(input_path: str, jar_path: str, output_path: str, signature: Optional[str],
+             repeat: int = REPEAT, workers: int = MAX_THREAD, timeout: float = runner.MAX_TIME_LIMIT) -> bool:
+    with open(input_path, "r", encoding="utf-8") as f:
+        requests = [gen.parse_request_line(line) for line in f if line.strip()]
+    lines = [gen.format_request(req) for req in requests]
+    if signature is None:
+        for _ in range(repeat):
+            signature = run_signature(lines, jar_path, os.path.join(WORK_ROOT, "original"), timeout)
+            if signature is not None:
+                break
+        if signature is None:
+            print(f"{jar_path} passes {input_path} in {repeat} runs; nothing to minimize.", file=sys.stderr)
+            return False
+    else:
+        signature = runner.failure_signature(signature)
+    print(f"Target signature: {signature}")
+
+    # Candidates must satisfy the same generator rules as the original input.
+    validation = None
+    max_time = max(req["time"] for req in requests)
+    for mutual_mode in (True, False):
+        if gen.check_request_constraints(requests, mutual_mode, max_time) is None:
+            validation = {"mutual_mode": mutual_mode, "max_time": max_time}
+            break
+    if validation is None:
+        print("WARNING: the original input breaks the generator constraints; candidates are not validated.",
+              file=sys.stderr)
+
+    minimizer = Minimizer(jar_path, signature, repeat, workers, timeout, validation)
+    result = minimizer.ddmin(requests)
+    shutil.rmtree(WORK_ROOT, ignore_errors=True)
+    with open(output_path, "w", encoding="utf-8") as f:
+        f.write("".join(gen.format_request(req) + "\n" for req in result))
+    print(f"Minimized {len(requests)} -> {len(result)} requests in {minimizer.runs} runs: {output_path}")
+    return True
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Shrink a failing test case to a minimal input that fails with the same signature."
+    )
+    parser.add_argument("case", type=int, help="Test case index (reads in/<case>/stdin.txt).")
+    parser.add_argument("jar", help="Jar file name under jar/.")
+    parser.add_argument("--input", default=None, help="Override the input path.")
+    parser.add_argument("--signature", default=None,
+                        help="Checker message to reproduce (normalized). Defaults to the failure of the original input.")
+    parser.add_argument("--repeat", type=int, default=REPEAT, help="Runs per candidate.")
+    parser.add_argument("--workers", type=int, default=MAX_THREAD, help="Number of concurrent jar runs.")
+    parser.add_argument("--timeout", type=float, default=runner.MAX_TIME_LIMIT, help="Time limit per run in seconds.")
+    args = parser.parse_args()
+    input_path = args.input or f"in/{args.case}/stdin.txt"
+    jar_path = os.path.join("jar", args.jar)
+    if not os.path.isfile(input_path) or not os.path.isfile(jar_path):
+        print(f"ERROR: {input_path} or {jar_path} not found.", file=sys.stderr)
+        sys.exit(1)
+    os.makedirs("judge_result", exist_ok=True)
+    output_path = f"judge_result/test{args.case}_minimal_{args.jar}.txt"
+    sys.exit(0 if minimize(input_path, jar_path, output_path, args.signature, args.repeat, args.workers, args.timeout) else 1)
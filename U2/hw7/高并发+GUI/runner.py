@@ -0,0 +1,117 @@
+import os
+import re
+import subprocess
+import threading
+import time
+
+import cds
+
+# 投喂程序会读取其工作目录下的 stdin.txt
+EXE_PATH = os.path.abspath("datainput_student_win64.exe")
+MAX_TIME_LIMIT = 120
+USE_CDS = False  # start jars with their AppCDS archive (see cds.py)
+
+
+_FLOOR_PATTERN = re.compile(r"\b[BF]\d+\b")
+_NUMBER_PATTERN = re.compile(r"-?\d+(?:\.\d+)?")
+
+
+def failure_signature(message: str) -> str:
+    """
+    Normalizes a failure message so that the same bug on different inputs maps to
+    one signature: floors, timestamps, ids and other numbers are masked.
+    """
+    first_line = message.strip().splitlines()[0] if message.strip() else ""
+    signature = _FLOOR_PATTERN.sub("<floor>", first_line)
+    signature = _NUMBER_PATTERN.sub("<n>", signature)
+    return " ".join(signature.split())
+
+
+class RunResult:
+    returncode: int
+    outputPath: str
+    wallTime: float
+    cpuTime: float  # -1 when the platform cannot report child CPU time
+    timedOut: bool
+    stderr: str
+
+    def __init__(self, returncode: int, outputPath: str, wallTime: float, cpuTime: float, timedOut: bool, stderr: str):
+        self.returncode = returncode
+        self.outputPath = outputPath
+        self.wallTime = wallTime
+        self.cpuTime = cpuTime
+        self.timedOut = timedOut
+        self.stderr = stderr
+
+
+def prepare_workdir(workdir: str, lines: list[str]):
+    """Creates workdir and writes the request lines as its stdin.txt."""
+    os.makedirs(workdir, exist_ok=True)
+    with open(os.path.join(workdir, "stdin.txt"), "w", encoding="utf-8") as f:
+        f.write("".join(line + "\n" for line in lines))
+
+
+def _wait(proc: subprocess.Popen, timeout: float):
+    """
+    Waits for proc and returns (returncode, cpuTime, timedOut).
+    On POSIX the child is reaped with os.wait4 so its own CPU usage can be
+    reported even while other runs happen concurrently in this process.
+    """
+    if not hasattr(os, "wait4"):
+        try:
+            proc.wait(timeout=timeout)
+        except subprocess.TimeoutExpired:
+            proc.kill()
+            proc.wait()
+            return proc.returncode, -1.0, True
+        return proc.returncode, -1.0, False
+
+    result = {}
+
+    def reap():
+        _, status, usage = os.wait4(proc.pid, 0)
+        result["status"] = status
+        result["usage"] = usage
+
+    reaper = threading.Thread(target=reap, daemon=True)
+    reaper.start()
+    reaper.join(timeout)
+    timedOut = reaper.is_alive()
+    if timedOut:
+        proc.kill()
+        reaper.join()
+    proc.returncode = os.waitstatus_to_exitcode(result["status"])
+    usage = result["usage"]
+    return proc.returncode, usage.ru_utime + usage.ru_stime, timedOut
+
+
+def run_jar(jar_path: str, workdir: str, timeout: float = MAX_TIME_LIMIT) -> RunResult:
+    """
+    Runs one jar against workdir/stdin.txt through the input feeder.
+    The jar output goes to workdir/output.txt, so concurrent runs never share files.
+    """
+    output_path = os.path.join(workdir, "output.txt")
+    start = time.perf_counter()
+    with open(output_path, "w", encoding="utf-8") as fout, \
+            open(os.path.join(workdir, "stderr.txt"), "w", encoding="utf-8") as ferr:
+        exe_proc = subprocess.Popen(
+            [EXE_PATH],
+            cwd=workdir,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+        )
+        jar_proc = subprocess.Popen(
+            cds.java_command(os.path.abspath(jar_path)) if USE_CDS else ["java", "-jar", os.path.abspath(jar_path)],
+            stdin=exe_proc.stdout,
+            stdout=fout,
+            stderr=ferr,
+        )
+        exe_proc.stdout.close()
+        returncode, cpuTime, timedOut = _wait(jar_proc, timeout)
+        if timedOut:
+            exe_proc.kill()
+        exe_proc.wait()
+    wallTime = time.perf_counter() - start
+    with open(os.path.join(workdir, "stderr.txt"), "r", encoding="utf-8", errors="replace") as f:
+        stderr = f.read()
+    return RunResult(returncode, output_path, wallTime, cpuTime, timedOut, stderr)
@@ -0,0 +1,336 @@
+# search.py
+"""
+Feedback-driven workload search against a single jar.
+
+Each genome is a generator parameter set plus the request list it produced.
+Genomes are mutated / recombined inside the mutual-mode (互测) constraints,
+run against the target jar in parallel, and the inputs with the worst
+AvgTaskTime / SystemRunTime / CPU time are kept and written out at the end.
+"""
+import argparse
+import copy
+import json
+import os
+import random
+import shutil
+import sys
+import time
+import traceback
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Dict, List, Optional
+
+import Checker
+import gen
+import runner
+
+POPULATION = 16
+TOP_K = 5
+TIME_BUDGET = 600  # seconds of wall-clock search
+MAX_THREAD = 8
+REPEAT = 1  # runs per candidate, the score is their mean
+CROSSOVER_RATE = 0.3
+MAX_REPAIR_ATTEMPTS = 20
+WORK_ROOT = "search_work"
+RESULT_DIR = "search_result"
+PATTERNS = ["random", "uniform", "dense", "frequent"]
+METRICS = ["avg", "run", "cpu"]  # AvgTaskTime, SystemRunTime, CPU time of the jar
+
+
+class Genome:
+    params: Dict
+    requests: List[Dict]
+    origin: str
+    score: float
+    metrics: Dict
+
+    def __init__(self, params: Dict, requests: List[Dict], origin: str):
+        self.params = params
+        self.requests = requests
+        self.origin = origin
+        self.score = -1.0
+        self.metrics = {}
+
+    def lines(self) -> List[str]:
+        return [gen.format_request(req) for req in self.requests]
+
+    def key(self) -> str:
+        return "\n".join(self.lines())
+
+
+def random_params() -> Dict:
+    return {
+        "total_requests": random.randint(10, gen.DEFAULT_MUTUAL_MAX_TOTAL_REQUESTS),
+        "pattern": random.choice(PATTERNS),
+        "max_time": random.choice([None, round(random.uniform(10.0, gen.DEFAULT_MUTUAL_MAX_TIMESTAMP), 1)]),
+    }
+
+
+def generate_genome(params: Dict, origin: str) -> Genome:
+    lines = gen.generate_hw7_data(
+        total_requests_target=params["total_requests"],
+        mutual_mode=True,
+        pattern=params["pattern"],
+        max_time_override=params["max_time"],
+    )
+    return Genome(params, [gen.parse_request_line(line) for line in lines], origin)
+
+
+# --- Mutation Operators ---
+# Every operator edits a copy of the request list in place; validity is checked afterwards.
+
+def _passengers(requests: List[Dict]) -> List[Dict]:
+    return [req for req in requests if req["type"] == "passenger"]
+
+
+def _random_time(max_time: float) -> float:
+    return round(random.uniform(gen.MIN_TIMESTAMP, max_time), 1)
+
+
+def _fresh_passenger_id(requests: List[Dict]) -> int:
+    used = {req["id"] for req in _passengers(requests)}
+    while True:
+        pid = random.randint(1, gen.MAX_PASSENGER_ID)
+        if pid not in used:
+            return pid
+
+
+def mutate_shift(requests: List[Dict], max_time: float):
+    req = random.choice(requests)
+    req["time"] = round(min(max_time, max(gen.MIN_TIMESTAMP, req["time"] + random.gauss(0.0, 2.0))), 1)
+
+
+def mutate_burst(requests: List[Dict], max_time: float):
+    # Pull several passengers onto the time point of one request.
+    anchor = random.choice(requests)["time"]
+    passengers = _passengers(requests)
+    for req in random.sample(passengers, min(len(passengers), random.randint(2, 10))):
+        req["time"] = anchor
+
+
+def mutate_floors(requests: List[Dict], max_time: float):
+    passengers = _passengers(requests)
+    if not passengers:
+        return
+    req = random.choice(passengers)
+    if random.random() < 0.5:
+        # Long trips across the whole shaft are the expensive ones.
+        req["from"], req["to"] = random.choice([("B4", "F7"), ("F7", "B4")])
+    else:
+        req["from"], req["to"] = random.sample(gen.FLOORS, 2)
+
+
+def mutate_priority(requests: List[Dict], max_time: float):
+    passengers = _passengers(requests)
+    if passengers:
+        random.choice(passengers)["priority"] = random.choice([1, 100, random.randint(1, 100)])
+
+
+def mutate_add(requests: List[Dict], max_time: float):
+    start, end = random.sample(gen.FLOORS, 2)
+    requests.append({
+        "type": "passenger",
+        "time": _random_time(max_time),
+        "id": _fresh_passenger_id(requests),
+        "priority": random.randint(1, 100),
+        "from": start,
+        "to": end,
+    })
+
+
+def mutate_drop(requests: List[Dict], max_time: float):
+    if len(requests) > gen.MIN_REQUESTS:
+        requests.pop(random.randrange(len(requests)))
+
+
+def mutate_sche(requests: List[Dict], max_time: float):
+    sches = [req for req in requests if req["type"] == "sche"]
+    if sches and random.random() < 0.5:
+        req = random.choice(sches)
+    else:
+        req = {"type": "sche", "time": _random_time(max_time)}
+        requests.append(req)
+    req["elevator"] = random.randint(1, gen.NUM_ELEVATORS)
+    req["speed"] = random.choice(gen.SCHE_SPEEDS)
+    req["target"] = random.choice(gen.SCHE_TARGET_FLOORS)
+
+
+MUTATIONS = [mutate_shift, mutate_burst, mutate_floors, mutate_priority, mutate_add, mutate_drop, mutate_sche]
+
+
+def _max_time(genome: Genome) -> float:
+    return genome.params["max_time"] or gen.DEFAULT_MUTUAL_MAX_TIMESTAMP
+
+
+def _finish(params: Dict, requests: List[Dict], origin: str) -> Optional[Genome]:
+    requests.sort(key=lambda req: req["time"])
+    if gen.check_request_constraints(requests, mutual_mode=True) is not None:
+        return None
+    return Genome(params, requests, origin)
+
+
+def mutate(parent: Genome) -> Optional[Genome]:
+    if random.random() < 0.1:
+        # Mutate the generator parameters and regenerate the request list.
+        params = dict(parent.params)
+        field = random.choice(["total_requests", "pattern", "max_time"])
+        if field == "total_requests":
+            params[field] = max(gen.MIN_REQUESTS, min(gen.DEFAULT_MUTUAL_MAX_TOTAL_REQUESTS,
+                                                      params[field] + random.randint(-10, 10)))
+        else:
+            params[field] = random_params()[field]
+        return generate_genome(params, f"regen:{field}")
+    for _ in range(MAX_REPAIR_ATTEMPTS):
+        requests = copy.deepcopy(parent.requests)
+        names = []
+        for _ in range(random.randint(1, 3)):
+            op = random.choice(MUTATIONS)
+            op(requests, _max_time(parent))
+            names.append(op.__name__[len("mutate_"):])
+        child = _finish(dict(parent.params), requests, "mutate:" + "+".join(names))
+        if child is not None:
+            return child
+    return None
+
+
+def crossover(a: Genome, b: Genome) -> Optional[Genome]:
+    """Takes a's requests before a random cut time and b's requests after it."""
+    for _ in range(MAX_REPAIR_ATTEMPTS):
+        cut = _random_time(max(_max_time(a), _max_time(b)))
+        requests = copy.deepcopy([req for req in a.requests if req["time"] < cut]
+                                 + [req for req in b.requests if req["time"] >= cut])
+        used = set()
+        for req in _passengers(requests):
+            if req["id"] in used:
+                req["id"] = _fresh_passenger_id(requests)
+            used.add(req["id"])
+        child = _finish(dict(random.choice([a, b]).params), requests, "crossover")
+        if child is not None:
+            return child
+    return None
+
+
+# --- Evaluation ---
+
+def evaluate(genome: Genome, jar_path: str, workdir: str, metric: str) -> Genome:
+    """Runs the jar REPEAT times on the genome; raises if any run is invalid."""
+    runner.prepare_workdir(workdir, genome.lines())
+    input_path = os.path.join(workdir, "stdin.txt")
+    samples = []
+    for _ in range(REPEAT):
+        result = runner.run_jar(jar_path, workdir)
+        if result.timedOut:
+            raise Exception(f"Time limit exceeded ({runner.MAX_TIME_LIMIT}s).")
+        if result.returncode != 0:
+            raise Exception(f"jar exited with code {result.returncode}: {result.stderr.strip()}")
+        systemRunTime, avgTaskTime, powerConsumption = Checker.check(input_path, result.outputPath)
+        samples.append({
+            "run": systemRunTime,
+            "avg": avgTaskTime,
+            "power": powerConsumption,
+            "cpu": result.cpuTime,
+            "wall": result.wallTime,
+        })
+    genome.metrics = {name: sum(s[name] for s in samples) / len(samples) for name in samples[0]}
+    genome.score = genome.metrics[metric]
+    return genome
+
+
+def tournament(population: List[Genome]) -> Genome:
+    return max(random.sample(population, min(3, len(population))), key=lambda g: g.score)
+
+
+def next_candidate(population: List[Genome]) -> Optional[Genome]:
+    if len(population) < POPULATION:
+        return generate_genome(random_params(), "random")
+    if len(population) >= 2 and random.random() < CROSSOVER_RATE:
+        return crossover(tournament(population), tournament(population))
+    return mutate(tournament(population))
+
+
+def save_genome(genome: Genome, directory: str, extra: Dict):
+    os.makedirs(directory, exist_ok=True)
+    with open(os.path.join(directory, "stdin.txt"), "w", encoding="utf-8") as f:
+        f.write("".join(line + "\n" for line in genome.lines()))
+    info = {"params": genome.params, "origin": genome.origin, "metrics": genome.metrics}
+    info.update(extra)
+    with open(os.path.join(directory, "info.json"), "w", encoding="utf-8") as f:
+        json.dump(info, f, indent=2, ensure_ascii=False)
+
+
+def search(jar_path: str, metric: str, budget: float, top_k: int, workers: int):
+    if metric == "cpu" and not hasattr(os, "wait4"):
+        print("ERROR: CPU time of the jar is not available on this platform.", file=sys.stderr)
+        sys.exit(1)
+    for folder in [WORK_ROOT, RESULT_DIR]:
+        if os.path.isdir(folder):
+            shutil.rmtree(folder)
+        os.makedirs(folder)
+
+    deadline = time.time() + budget
+    population: List[Genome] = []
+    hall_of_fame: List[Genome] = []
+    seen = set()
+    failures = 0
+    evaluated = 0
+    serial = 0
+    pending = {}
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        while pending or time.time() < deadline:
+            while len(pending) < workers and time.time() < deadline:
+                candidate = next_candidate(population)
+                if candidate is None or candidate.key() in seen:
+                    continue
+                seen.add(candidate.key())
+                workdir = os.path.join(WORK_ROOT, str(serial))
+                serial += 1
+                future = executor.submit(evaluate, candidate, jar_path, workdir, metric)
+                pending[future] = (candidate, workdir)
+            done, _ = wait(pending, timeout=1.0, return_when=FIRST_COMPLETED)
+            for future in done:
+                candidate, workdir = pending.pop(future)
+                evaluated += 1
+                try:
+                    future.result()
+                except Exception as e:
+                    # An input the jar cannot handle is even more interesting than a slow one.
+                    save_genome(candidate, os.path.join(RESULT_DIR, f"fail_{failures}"),
+                                {"error": f"{e.__class__.__name__}: {e}", "traceback": traceback.format_exc()})
+                    print(f"[{evaluated}] {candidate.origin}: FAIL {e}")
+                    failures += 1
+                else:
+                    population.append(candidate)
+                    population.sort(key=lambda g: g.score, reverse=True)
+                    del population[POPULATION:]
+                    hall_of_fame.append(candidate)
+                    hall_of_fame.sort(key=lambda g: g.score, reverse=True)
+                    del hall_of_fame[top_k:]
+                    print(f"[{evaluated}] {candidate.origin}: {metric}={candidate.score:.4f} "
+                          f"(best {hall_of_fame[0].score:.4f})")
+                shutil.rmtree(workdir, ignore_errors=True)
+
+    for rank, genome in enumerate(hall_of_fame):
+        save_genome(genome, os.path.join(RESULT_DIR, f"worst_{rank}"), {"rank": rank, "metric": metric})
+    print(f"Evaluated {evaluated} inputs, {failures} failing, in {budget:.0f}s budget.")
+    for rank, genome in enumerate(hall_of_fame):
+        print(f"  worst_{rank}: {metric}={genome.score:.4f} ({len(genome.requests)} requests, {genome.origin})")
+    print(f"Results written to {RESULT_DIR}/")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Search mutual-mode inputs that maximize a performance metric of one jar."
+    )
+    parser.add_argument("jar", help="Path of the target jar.")
+    parser.add_argument("--metric", choices=METRICS, default="avg",
+                        help="avg: AvgTaskTime, run: SystemRunTime, cpu: CPU time of the jar.")
+    parser.add_argument("--budget", type=float, default=TIME_BUDGET, help="Wall-clock budget in seconds.")
+    parser.add_argument("--top", type=int, default=TOP_K, help="Number of worst inputs to keep.")
+    parser.add_argument("--workers", type=int, default=MAX_THREAD, help="Number of concurrent jar runs.")
+    parser.add_argument("--seed", type=int, default=None, help="Seed for reproducible searches.")
+    args = parser.parse_args()
+    if not os.path.isfile(args.jar):
+        print(f"ERROR: jar {args.jar} not found.", file=sys.stderr)
+        sys.exit(1)
+    if args.seed is not None:
+        random.seed(args.seed)
+    search(args.jar, args.metric, args.budget, args.top, args.workers)
@@ -0,0 +1,160 @@
+# storage.py
+"""
+Tiered artifact storage for a test campaign.
+
+Inputs, outputs and traces are written under a scratch work directory
+(tmpfs such as /dev/shm by default), so the many small writes and re-reads of
+a campaign never touch the persistent (possibly network-mounted) directory.
+When a case finishes, finish_case() moves its artifacts out of the scratch
+directory:
+
+- runs that failed are copied to the persistent directory with the usual
+  in/<i>/stdin.txt and out/<jar>/output_<i>.* layout (minimize.py and
+  tracefile.py read them from there);
+- runs that passed are packed into one tar archive per campaign
+  (PASS_RETENTION "xz" or "gz"), discarded ("discard"), or copied like
+  failures ("keep").
+
+Byte counters compare what the old layout would have written to persistent
+storage (every artifact) with what was actually written there.
+"""
+import os
+import shutil
+import tarfile
+import tempfile
+import threading
+from typing import Dict, List, Optional
+
+PASS_RETENTIONS = ("xz", "gz", "discard", "keep")
+
+
+def default_work_root() -> Optional[str]:
+    """/dev/shm when it exists (Linux), otherwise None: work directly in the persistent directory."""
+    return "/dev/shm" if os.path.isdir("/dev/shm") else None
+
+
+class Campaign:
+    persistRoot: str
+    workDir: str
+    passRetention: str
+    archivePath: Optional[str]
+    artifactBytes: int  # everything the runs produced
+    persistedBytes: int  # failing artifacts (and kept passing ones) copied to persistent storage
+    archivedBytes: int  # uncompressed size of the passing artifacts put into the archive
+    discardedBytes: int
+
+    def __init__(self, work_root: Optional[str], persist_root: str = ".", pass_retention: str = "xz",
+                 archive_path: Optional[str] = None):
+        if pass_retention not in PASS_RETENTIONS:
+            raise Exception(f"Unknown pass retention {pass_retention!r}, expected one of {PASS_RETENTIONS}")
+        self.persistRoot = persist_root
+        self.passRetention = pass_retention
+        self.artifactBytes = 0
+        self.persistedBytes = 0
+        self.archivedBytes = 0
+        self.discardedBytes = 0
+        self._lock = threading.Lock()  # the byte counters
+        self._archive_lock = threading.Lock()  # the tar archive, written by one case at a time
+        self._archive: Optional[tarfile.TarFile] = None
+        self.archivePath = None
+        if work_root is None:
+            # No scratch tier: artifacts are written in place and kept, as before.
+            self.workDir = persist_root
+            self.passRetention = "keep"
+            return
+        self.workDir = tempfile.mkdtemp(prefix="hw7-work-", dir=work_root)
+        if self.passRetention in ("xz", "gz"):
+            self.archivePath = archive_path or os.path.join(persist_root, "judge_result", f"passed.tar.{self.passRetention}")
+            os.makedirs(os.path.dirname(self.archivePath), exist_ok=True)
+            self._archive = tarfile.open(self.archivePath, f"w:{self.passRetention}")
+
+    @property
+    def tiered(self) -> bool:
+        return self.workDir != self.persistRoot
+
+    def input_dir(self, test_index: int) -> str:
+        return os.path.join(self.workDir, "in", str(test_index))
+
+    def input_path(self, test_index: int) -> str:
+        return os.path.join(self.input_dir(test_index), "stdin.txt")
+
+    def output_dir(self, jar_name: str) -> str:
+        return os.path.join(self.workDir, "out", jar_name)
+
+    def output_path(self, jar_name: str, test_index: int, ext: str = ".txt") -> str:
+        return os.path.join(self.output_dir(jar_name), f"output_{test_index}{ext}")
+
+    def _case_files(self, test_index: int, jar_name: Optional[str]) -> List[str]:
+        """Work-relative paths of the artifacts of one case (jar_name None: its input)."""
+        if jar_name is None:
+            directory, prefix = os.path.join("in", str(test_index)), ""
+        else:
+            directory, prefix = os.path.join("out", jar_name), f"output_{test_index}."
+        full = os.path.join(self.workDir, directory)
+        if not os.path.isdir(full):
+            return []
+        return [os.path.join(directory, name) for name in sorted(os.listdir(full)) if name.startswith(prefix)]
+
+    def _persist(self, relative: str) -> int:
+        target = os.path.join(self.persistRoot, relative)
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        shutil.copyfile(os.path.join(self.workDir, relative), target)
+        return os.path.getsize(target)
+
+    def finish_case(self, test_index: int, jar_states: Dict[str, bool]):
+        """
+        Moves the artifacts of a finished case out of the work directory.
+        jar_states maps each jar to whether its run passed; the input is kept
+        with the failures when any jar failed.
+        """
+        if not self.tiered:
+            for jar_name in [None, *jar_states]:
+                for relative in self._case_files(test_index, jar_name):
+                    size = os.path.getsize(os.path.join(self.workDir, relative))
+                    with self._lock:
+                        self.artifactBytes += size
+                        self.persistedBytes += size
+            return
+        case_passed = all(jar_states.values())
+        for jar_name, passed in [(None, case_passed), *jar_states.items()]:
+            for relative in self._case_files(test_index, jar_name):
+                path = os.path.join(self.workDir, relative)
+                size = os.path.getsize(path)
+                persisted = archived = discarded = 0
+                # Copies run in parallel; only the shared archive and the counters are serialized
+                if not passed or self.passRetention == "keep":
+                    persisted = self._persist(relative)
+                elif self._archive is not None:
+                    with self._archive_lock:
+                        self._archive.add(path, arcname=relative)
+                    archived = size
+                else:
+                    discarded = size
+                with self._lock:
+                    self.artifactBytes += size
+                    self.persistedBytes += persisted
+                    self.archivedBytes += archived
+                    self.discardedBytes += discarded
+                os.remove(path)
+        shutil.rmtree(self.input_dir(test_index), ignore_errors=True)
+
+    def close(self) -> str:
+        """Closes the archive, removes the work directory and returns the bytes-written report."""
+        archive_size = 0
+        if self._archive is not None:
+            with self._archive_lock:
+                self._archive.close()
+                self._archive = None
+            archive_size = os.path.getsize(self.archivePath)
+        if self.tiered:
+            shutil.rmtree(self.workDir, ignore_errors=True)
+        written = self.persistedBytes + archive_size
+        lines = [f"产物共 {self.artifactBytes} 字节（原先全部写入持久存储），实际写入持久存储 {written} 字节"]
+        if self.tiered:
+            lines.append(f"  工作目录: {self.workDir}（运行结束后已删除）")
+            lines.append(f"  复制到持久目录（失败样例）: {self.persistedBytes} 字节")
+            if self.archivePath is not None:
+                lines.append(f"  通过样例归档: {self.archivedBytes} 字节 -> {archive_size} 字节 ({self.archivePath})")
+            if self.discardedBytes:
+                lines.append(f"  通过样例丢弃: {self.discardedBytes} 字节")
+        return "\n".join(lines) + "\n"
@@ -0,0 +1,323 @@
+# tracefile.py
+"""
+Compact binary trace format for elevator output logs.
+
+A trace holds the parsed output log of one run, so re-checking and re-scoring
+do not need to parse the text with regexes again. The layout is:
+
+    header        HEADER_FORMAT: magic, version, record size, record count,
+                  string table size
+    string table  NUL-separated UTF-8 strings: the event kind names (so the
+                  file describes itself), followed by free-form metadata
+    records       count fixed-width RECORD_FORMAT records, one per event
+
+Timestamps are stored as the parser's integer ticks (Operation.TICKS_PER_SECOND).
+read_trace() maps the file with mmap and returns the records as a NumPy
+structured array view.
+
+Usage:
+    python tracefile.py to-binary output.txt output.trc
+    python tracefile.py to-text output.trc output.txt
+    python tracefile.py bench [--logs 10000] [--dir DIR]
+"""
+import argparse
+import mmap
+import os
+import random
+import shutil
+import struct
+import time
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+import Checker
+from Operation import TICKS_PER_SECOND, Operation, OperationType, OutOperationType, ScheOperationType, UpdateOperationType
+from Person import Person
+
+MAGIC = b"ETRC"
+VERSION = 1
+HEADER_FORMAT = "<4sHHII"  # magic, version, record size, record count, string table size
+HEADER_SIZE = struct.calcsize(HEADER_FORMAT)
+RECORD_FORMAT = "<qiBbbbbxH"  # ticks, person, kind, elevator, floor, top, bottom, pad, speed (ms/floor)
+RECORD_SIZE = struct.calcsize(RECORD_FORMAT)
+RECORD_DTYPE = np.dtype([
+    ("ticks", "<i8"),
+    ("person", "<i4"),
+    ("kind", "u1"),
+    ("elevator", "i1"),
+    ("floor", "i1"),
+    ("top", "i1"),
+    ("bottom", "i1"),
+    ("pad", "u1"),
+    ("speed", "<u2"),
+])
+assert RECORD_DTYPE.itemsize == RECORD_SIZE
+
+# Event kinds; the index is the `kind` value stored in a record.
+KINDS = [
+    "ARRIVE", "OPEN", "CLOSE", "IN", "OUT-S", "OUT-F", "RECEIVE",
+    "SCHE-ACCEPT", "SCHE-BEGIN", "SCHE-END", "UPDATE-ACCEPT", "UPDATE-BEGIN", "UPDATE-END",
+]
+KIND = {name: index for index, name in enumerate(KINDS)}
+ARRIVE, OPEN, CLOSE, OUT_S, OUT_F = KIND["ARRIVE"], KIND["OPEN"], KIND["CLOSE"], KIND["OUT-S"], KIND["OUT-F"]
+
+
+def _kind_of(operation: Operation) -> int:
+    opType = operation.opType
+    if opType == OperationType.OUT:
+        return OUT_S if operation.outType == OutOperationType.S else OUT_F
+    if opType == OperationType.SCHE:
+        return KIND["SCHE-" + operation.scheType.name]
+    if opType == OperationType.UPDATE:
+        return KIND["UPDATE-" + operation.updateType.name]
+    return KIND[opType.name]
+
+
+def operations_to_records(operations: List[Operation]) -> np.ndarray:
+    records = np.zeros(len(operations), dtype=RECORD_DTYPE)
+    records["ticks"] = [op.timestamp for op in operations]
+    records["person"] = [op.personIndex for op in operations]
+    records["kind"] = [_kind_of(op) for op in operations]
+    records["elevator"] = [op.elevatorIndex for op in operations]
+    # UPDATE events keep their transfer floor in the floor field.
+    records["floor"] = [op.updateTransFloor if op.opType == OperationType.UPDATE else op.floor for op in operations]
+    records["top"] = [op.updateTopElevatorIndex for op in operations]
+    records["bottom"] = [op.updateBottomElevatorIndex for op in operations]
+    records["speed"] = [op.scheSpeed // 10 for op in operations]
+    return records
+
+
+def records_to_operations(records: np.ndarray) -> List[Operation]:
+    """Rebuilds Operation objects for the Checker, without any text parsing."""
+    operations = []
+    for ticks, person, kind, elevator, floor, top, bottom, _, speed in records.tolist():
+        name = KINDS[kind]
+        head, _, tail = name.partition("-")
+        opType = OperationType[head]
+        operations.append(Operation(
+            opType=opType,
+            elevatorIndex=elevator,
+            floor=-1 if opType == OperationType.UPDATE else floor,
+            personIndex=person,
+            outType=OutOperationType[tail] if opType == OperationType.OUT else OutOperationType.NONE,
+            scheType=ScheOperationType[tail] if opType == OperationType.SCHE else ScheOperationType.NONE,
+            scheMoveInterval=speed * 10,
+            updateType=UpdateOperationType[tail] if opType == OperationType.UPDATE else UpdateOperationType.NONE,
+            updateTopElevatorIndex=top,
+            updateBottomElevatorIndex=bottom,
+            updateTransFloor=floor if opType == OperationType.UPDATE else -1,
+            timestamp=ticks,
+        ))
+    return operations
+
+
+def write_trace(path: str, operations: List[Operation], meta: Optional[List[str]] = None):
+    records = operations_to_records(operations)
+    strings = "\0".join(KINDS + (meta or [])).encode("utf-8")
+    with open(path, "wb") as f:
+        f.write(struct.pack(HEADER_FORMAT, MAGIC, VERSION, RECORD_SIZE, len(records), len(strings)))
+        f.write(strings)
+        f.write(records.tobytes())
+
+
+def read_trace(path: str) -> Tuple[np.ndarray, List[str]]:
+    """Maps a trace file and returns (records, metadata strings)."""
+    with open(path, "rb") as f:
+        data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    magic, version, record_size, count, string_size = struct.unpack_from(HEADER_FORMAT, data, 0)
+    if magic != MAGIC or version != VERSION or record_size != RECORD_SIZE:
+        raise Exception(f"Invalid trace file: {path}")
+    strings = bytes(data[HEADER_SIZE:HEADER_SIZE + string_size]).decode("utf-8").split("\0")
+    if strings[:len(KINDS)] != KINDS:
+        raise Exception(f"Unknown event kinds in trace file: {path}")
+    records = np.frombuffer(data, dtype=RECORD_DTYPE, count=count, offset=HEADER_SIZE + string_size)
+    return records, strings[len(KINDS):]
+
+
+def _format_floor(floor: int) -> str:
+    return f"B{1 - floor}" if floor <= 0 else f"F{floor}"
+
+
+def format_record(record) -> str:
+    ticks, person, kind, elevator, floor, top, bottom, _, speed = record
+    stamp = f"[{ticks // TICKS_PER_SECOND:>4}.{ticks % TICKS_PER_SECOND:04d}]"
+    name = KINDS[kind]
+    if name in ("ARRIVE", "OPEN", "CLOSE"):
+        return f"{stamp}{name}-{_format_floor(floor)}-{elevator}"
+    if name == "IN":
+        return f"{stamp}IN-{person}-{_format_floor(floor)}-{elevator}"
+    if name in ("OUT-S", "OUT-F"):
+        return f"{stamp}{name}-{person}-{_format_floor(floor)}-{elevator}"
+    if name == "RECEIVE":
+        return f"{stamp}RECEIVE-{person}-{elevator}"
+    if name == "SCHE-ACCEPT":
+        return f"{stamp}SCHE-ACCEPT-{elevator}-{speed / 1000:.1f}-{_format_floor(floor)}"
+    if name in ("SCHE-BEGIN", "SCHE-END"):
+        return f"{stamp}{name}-{elevator}"
+    if name == "UPDATE-ACCEPT":
+        return f"{stamp}UPDATE-ACCEPT-{top}-{bottom}-{_format_floor(floor)}"
+    return f"{stamp}{name}-{top}-{bottom}"
+
+
+def text_to_trace(text_path: str, trace_path: str, meta: Optional[List[str]] = None):
+    write_trace(trace_path, Checker.getOperations(text_path), meta)
+
+
+def trace_to_text(trace_path: str, text_path: str):
+    records, _ = read_trace(trace_path)
+    with open(text_path, "w", encoding="utf-8") as f:
+        f.write("".join(format_record(record) + "\n" for record in records.tolist()))
+
+
+def check_and_trace(input_path: str, output_path: str, trace_path: str, meta: Optional[List[str]] = None):
+    """Checker.check that also writes the parsed output log as a trace (before checking, so failing runs keep one)."""
+    operations = Checker.getOperations(output_path)
+    write_trace(trace_path, operations, meta)
+    checker = Checker.createChecker(Checker.parseInput(input_path), operations)
+    checker.check()
+    return checker.calcPerfomanceInfo()
+
+
+def check_trace(input_path: str, trace_path: str):
+    """Re-checks a saved run from its trace; same result as Checker.check on the text log."""
+    records, _ = read_trace(trace_path)
+    checker = Checker.createChecker(Checker.parseInput(input_path), records_to_operations(records))
+    checker.check()
+    return checker.calcPerfomanceInfo()
+
+
+def score(records: np.ndarray, persons: List[Person]) -> Tuple[float, float, float]:
+    """Vectorized calcPerfomanceInfo: (systemRunTime, avgTaskCompleteTime, powerConsumption)."""
+    kinds = records["kind"]
+    systemRunTime = records["ticks"][-1] / TICKS_PER_SECOND if len(records) else 0.0
+    counts = np.bincount(kinds, minlength=len(KINDS))
+    powerConsumption = (4 * int(counts[ARRIVE]) + int(counts[OPEN]) + int(counts[CLOSE])) / 10
+    if not persons:
+        return systemRunTime, 0, powerConsumption
+    outs = records[(kinds == OUT_S) | (kinds == OUT_F)]
+    # Last OUT of every person: first occurrence in the reversed order.
+    out_ids, first = np.unique(outs["person"][::-1], return_index=True)
+    leave_ticks = outs["ticks"][::-1][first]
+    ids = np.array([p.index for p in persons], dtype=np.int64)
+    priority = np.array([p.priority for p in persons], dtype=np.int64)
+    arrive = np.array([p.arriveTime for p in persons], dtype=np.int64)
+    pos = np.searchsorted(out_ids, ids)
+    if (pos >= len(out_ids)).any() or (out_ids[np.minimum(pos, len(out_ids) - 1)] != ids).any():
+        raise KeyError("person without OUT in trace")
+    avgTaskCompleteTime = float((priority * (leave_ticks[pos] - arrive)).sum() / priority.sum() / TICKS_PER_SECOND)
+    return systemRunTime, avgTaskCompleteTime, powerConsumption
+
+
+# --- Benchmark ---
+
+def _synthetic_log(lines: List[str], rng: random.Random) -> List[str]:
+    """A scoring-only output log: every passenger is picked up and dropped off once."""
+    persons = [Person.parse(line) for line in lines if "SCHE" not in line and "UPDATE" not in line]
+    events = []
+    for person in persons:
+        t = person.arriveTime / TICKS_PER_SECOND + rng.uniform(0, 5)
+        elevator = rng.randint(1, 6)
+        events.append((t, f"RECEIVE-{person.index}-{elevator}"))
+        events.append((t + 0.4, f"ARRIVE-{_format_floor(person.fromFloor)}-{elevator}"))
+        events.append((t + 0.4, f"OPEN-{_format_floor(person.fromFloor)}-{elevator}"))
+        events.append((t + 0.4, f"IN-{person.index}-{_format_floor(person.fromFloor)}-{elevator}"))
+        events.append((t + 0.8, f"CLOSE-{_format_floor(person.fromFloor)}-{elevator}"))
+        for k in range(abs(person.toFloor - person.fromFloor)):
+            events.append((t + 1.2 + 0.4 * k, f"ARRIVE-{_format_floor(person.fromFloor)}-{elevator}"))
+        t_out = t + 1.2 + 0.4 * abs(person.toFloor - person.fromFloor)
+        events.append((t_out, f"OPEN-{_format_floor(person.toFloor)}-{elevator}"))
+        events.append((t_out, f"OUT-S-{person.index}-{_format_floor(person.toFloor)}-{elevator}"))
+        events.append((t_out + 0.4, f"CLOSE-{_format_floor(person.toFloor)}-{elevator}"))
+    events.sort(key=lambda e: e[0])
+    return [f"[{t:.4f}]{body}" for t, body in events]
+
+
+def _collect_logs(directory: Optional[str], count: int, workdir: str) -> List[Tuple[str, str]]:
+    """(input, output) pairs: saved runs from directory (in/ + out/ layout) or synthetic ones."""
+    pairs = []
+    if directory is not None:
+        out_root = os.path.join(directory, "out")
+        for jar in sorted(os.listdir(out_root)) if os.path.isdir(out_root) else []:
+            for name in sorted(os.listdir(os.path.join(out_root, jar))):
+                if name.startswith("output_") and name.endswith(".txt"):
+                    case = name[len("output_"):-len(".txt")]
+                    input_path = os.path.join(directory, "in", case, "stdin.txt")
+                    if os.path.isfile(input_path):
+                        pairs.append((input_path, os.path.join(out_root, jar, name)))
+    if not pairs:
+        import gen
+        rng = random.Random(0)
+        random.seed(0)
+        for i in range(min(count, 100)):
+            lines = gen.generate_hw7_data(100, mutual_mode=False, pattern="random")
+            input_path = os.path.join(workdir, f"in_{i}.txt")
+            output_path = os.path.join(workdir, f"out_{i}.txt")
+            with open(input_path, "w", encoding="utf-8") as f:
+                f.write("".join(line + "\n" for line in lines))
+            with open(output_path, "w", encoding="utf-8") as f:
+                f.write("".join(line + "\n" for line in _synthetic_log(lines, rng)))
+            pairs.append((input_path, output_path))
+    return [pairs[i % len(pairs)] for i in range(count)]
+
+
+def bench(count: int, directory: Optional[str]):
+    workdir = "trace_bench"
+    os.makedirs(workdir, exist_ok=True)
+    try:
+        pairs = _collect_logs(directory, count, workdir)
+        persons_cache: Dict[str, List[Person]] = {}
+        for input_path, _ in pairs:
+            if input_path not in persons_cache:
+                persons_cache[input_path] = Checker.getPersons(input_path)
+        traces = {}
+        for input_path, output_path in pairs:
+            if output_path not in traces:
+                traces[output_path] = os.path.join(workdir, f"{len(traces)}.trc")
+                text_to_trace(output_path, traces[output_path])
+        text_bytes = sum(os.path.getsize(p) for p in traces)
+        trace_bytes = sum(os.path.getsize(p) for p in traces.values())
+
+        start = time.perf_counter()
+        text_scores = []
+        for input_path, output_path in pairs:
+            checker = Checker.Checker([], persons_cache[input_path], Checker.getOperations(output_path))
+            text_scores.append(checker.calcPerfomanceInfo())
+        text_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        trace_scores = [score(read_trace(traces[output_path])[0], persons_cache[input_path])
+                        for input_path, output_path in pairs]
+        trace_time = time.perf_counter() - start
+
+        if not np.allclose(np.array(text_scores, dtype=float), np.array(trace_scores, dtype=float), atol=1e-3):
+            raise Exception("Text and trace scores differ.")
+        print(f"Re-scored {count} logs ({len(traces)} distinct, {'saved' if directory else 'synthetic'}):")
+        print(f"  text : {text_time:8.3f}s  {count / text_time:10.1f} logs/s  ({text_bytes} bytes)")
+        print(f"  trace: {trace_time:8.3f}s  {count / trace_time:10.1f} logs/s  ({trace_bytes} bytes)")
+        print(f"  speedup {text_time / trace_time:.1f}x")
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Convert and benchmark binary elevator traces.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    to_binary = subparsers.add_parser("to-binary", help="Convert a text output log to a trace.")
+    to_binary.add_argument("text")
+    to_binary.add_argument("trace")
+    to_text = subparsers.add_parser("to-text", help="Convert a trace back to a text output log.")
+    to_text.add_argument("trace")
+    to_text.add_argument("text")
+    bench_parser = subparsers.add_parser("bench", help="Compare text and trace re-scoring throughput.")
+    bench_parser.add_argument("--logs", type=int, default=10000, help="Number of logs to re-score.")
+    bench_parser.add_argument("--dir", default=None,
+                              help="Runner directory with in/ and out/ to take saved logs from. "
+                                   "Synthetic logs are used if omitted.")
+    args = parser.parse_args()
+    if args.command == "to-binary":
+        text_to_trace(args.text, args.trace)
+    elif args.command == "to-text":
+        trace_to_text(args.trace, args.text)
+    else:
+        bench(args.logs, args.dir)
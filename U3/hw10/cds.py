@@ -0,0 +1,115 @@
+# cds.py
+"""
+Per-jar AppCDS archives to cut JVM startup time.
+
+The first time a jar is used, ensure_archive() runs it once on empty input with
+-XX:ArchiveClassesAtExit, which dumps the application classes it loaded to
+CDS_DIR/<jar name>-<jar hash>.jsa. Later runs start with -XX:SharedArchiveFile
+plus JVM_FLAGS. Archives are keyed by the jar's content hash, so a rebuilt jar
+gets a fresh archive. If the JDK cannot dump archives (JDK < 13), runs fall back
+to plain `java -jar`.
+
+    python cds.py jar/a.jar [jar/b.jar ...]   # build archives and report the startup saving
+"""
+import hashlib
+import os
+import subprocess
+import sys
+import threading
+import time
+from typing import Dict, List, Optional
+
+CDS_DIR = ".cds"
+JVM_FLAGS = ["-Xshare:auto", "-XX:-UsePerfData"]
+DUMP_TIMEOUT = 60
+BENCH_RUNS = 10
+
+_lock = threading.Lock()
+_archives: Dict[str, Optional[str]] = {}
+
+
+def jar_hash(jar_path: str) -> str:
+    digest = hashlib.sha256()
+    with open(jar_path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()[:16]
+
+
+def archive_path(jar_path: str) -> str:
+    name = os.path.splitext(os.path.basename(jar_path))[0]
+    return os.path.abspath(os.path.join(CDS_DIR, f"{name}-{jar_hash(jar_path)}.jsa"))
+
+
+def _dump(jar_path: str, archive: str) -> bool:
+    os.makedirs(os.path.dirname(archive), exist_ok=True)
+    tmp = f"{archive}.{os.getpid()}.tmp"
+    try:
+        proc = subprocess.run(
+            ["java", f"-XX:ArchiveClassesAtExit={tmp}", "-jar", jar_path],
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            timeout=DUMP_TIMEOUT,
+        )
+    except (OSError, subprocess.TimeoutExpired):
+        return False
+    if proc.returncode != 0 or not os.path.isfile(tmp):
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        return False
+    os.replace(tmp, archive)  # atomic, so concurrent runners never see a partial archive
+    return True
+
+
+def ensure_archive(jar_path: str) -> Optional[str]:
+    """Returns the archive for jar_path, building it on first use; None if it cannot be built."""
+    jar_path = os.path.abspath(jar_path)
+    with _lock:
+        if jar_path in _archives:
+            return _archives[jar_path]
+        archive = archive_path(jar_path)
+        if not os.path.isfile(archive) and not _dump(jar_path, archive):
+            archive = None
+        _archives[jar_path] = archive
+        return archive
+
+
+def java_command(jar_path: str) -> List[str]:
+    """`java -jar jar_path` as an argument list, using the jar's CDS archive when available."""
+    archive = ensure_archive(jar_path)
+    if archive is None:
+        return ["java", "-jar", jar_path]
+    return ["java", f"-XX:SharedArchiveFile={archive}", *JVM_FLAGS, "-jar", jar_path]
+
+
+def java_command_line(jar_path: str) -> str:
+    """java_command() as a shell string for os.system (paths double-quoted)."""
+    return " ".join(f'"{arg}"' for arg in java_command(jar_path))
+
+
+def _startup_time(command: List[str], runs: int) -> float:
+    start = time.perf_counter()
+    for _ in range(runs):
+        subprocess.run(command, stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    return (time.perf_counter() - start) / runs
+
+
+def bench(jar_paths: List[str], runs: int = BENCH_RUNS):
+    """Measures the start-to-exit time of each jar on empty input, without and with its archive."""
+    for jar_path in jar_paths:
+        archive = ensure_archive(jar_path)
+        if archive is None:
+            print(f"{jar_path}: could not build a CDS archive (needs JDK 13+).")
+            continue
+        plain = _startup_time(["java", "-jar", jar_path], runs)
+        shared = _startup_time(java_command(jar_path), runs)
+        print(f"{jar_path}: plain {plain * 1000:.0f} ms, CDS {shared * 1000:.0f} ms, "
+              f"saving {(plain - shared) * 1000:.0f} ms ({(1 - shared / plain) * 100:.0f}%) per run")
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        print("Usage: python cds.py jar/a.jar [jar/b.jar ...]", file=sys.stderr)
+        sys.exit(1)
+    bench(sys.argv[1:])
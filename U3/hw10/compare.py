@@ -0,0 +1,88 @@
+# compare.py
+"""
+Streaming comparison of a jar's output with the std.jar answer.
+
+compare_files() reads both files line by line and stops at the first line that
+differs, so memory does not grow with the size of the output. Lines are
+compared without trailing whitespace and trailing blank lines are ignored.
+
+Every instruction prints exactly one line, so output line n belongs to the
+n-th instruction of the input; instructions() walks the input the same way,
+skipping blank lines and the person/relation lines that follow `ln`.
+"""
+import itertools
+from typing import Iterable, Iterator, Optional, Tuple
+
+LOAD_NETWORK = ("ln", "load_network")
+
+
+class Divergence:
+    line: int  # 1-based output line
+    expected: Optional[str]  # None: the answer has no such line
+    got: Optional[str]  # None: the output has no such line
+    input_line: Optional[int]  # 1-based line of the instruction in the input file
+    instruction: Optional[str]
+
+    def __init__(self, line: int, expected: Optional[str], got: Optional[str]):
+        self.line = line
+        self.expected = expected
+        self.got = got
+        self.input_line = None
+        self.instruction = None
+
+    def describe(self, indent: str = "") -> str:
+        where = f"output line {self.line}"
+        if self.instruction is not None:
+            where += f", instruction at input line {self.input_line}: {self.instruction}"
+        expected = "<end of answer>" if self.expected is None else self.expected
+        got = "<end of output>" if self.got is None else self.got
+        return f"{indent}First difference at {where}\n{indent}  expected: {expected}\n{indent}  got:      {got}"
+
+
+def first_divergence(output: Iterable[str], answer: Iterable[str]) -> Optional[Divergence]:
+    """The first differing line of two line iterables, or None if they match."""
+    for number, (got, expected) in enumerate(itertools.zip_longest(output, answer), 1):
+        got = None if got is None else got.rstrip()
+        expected = None if expected is None else expected.rstrip()
+        if got == expected or (got is None and expected == "") or (expected is None and got == ""):
+            continue
+        return Divergence(number, expected, got)
+    return None
+
+
+def instructions(lines: Iterable[str]) -> Iterator[Tuple[int, str]]:
+    """(input line number, instruction) for each instruction of an input; `ln` is given by its first line."""
+    numbered = enumerate(lines, 1)
+    for number, line in numbered:
+        line = line.strip()
+        if not line:
+            continue
+        yield number, line
+        parts = line.split()
+        if parts[0] in LOAD_NETWORK and len(parts) > 1 and parts[1].isdigit():
+            person_count = int(parts[1])
+            # ids, names and ages, then one relation line per person after the first
+            for _ in range(3 + person_count - 1 if person_count > 0 else 0):
+                next(numbered, None)
+
+
+def instruction_at(input_path: str, index: int) -> Optional[Tuple[int, str]]:
+    """(input line number, instruction) of the index-th (1-based) instruction of an input file."""
+    with open(input_path, 'r', encoding='utf-8', errors='ignore') as f:
+        return next(itertools.islice(instructions(f), index - 1, None), None)
+
+
+def compare_files(output_path: str, answer_path: str, input_path: Optional[str] = None) -> Optional[Divergence]:
+    """
+    The first line where output_path differs from answer_path, or None if they
+    match. With input_path, the divergence also names the instruction that
+    printed that line.
+    """
+    with open(output_path, 'r', encoding='utf-8', errors='ignore') as output, \
+            open(answer_path, 'r', encoding='utf-8', errors='ignore') as answer:
+        divergence = first_divergence(output, answer)
+    if divergence is not None and input_path is not None:
+        located = instruction_at(input_path, divergence.line)
+        if located is not None:
+            divergence.input_line, divergence.instruction = located
+    return divergence
@@ -0,0 +1,103 @@
+# corpus.py
+"""
+Reusable corpus of inputs and std.jar answers.
+
+With a corpus, testcase n reads its input from <root>/input/test<n>.txt. The
+input is generated once, from the recorded seed seed(n), and reused by later
+campaigns with the same instruction count. The std.jar answer is stored as
+<root>/answer/<key>.txt, where key is the sha256 of the input and of std.jar.
+A campaign only runs std.jar for inputs that have no stored answer, so after
+the first campaign only the jars under test run, and replacing std.jar
+regenerates the answers but keeps the inputs.
+
+<root>/manifest.json records the seed, instruction count and input hash of
+every testcase.
+"""
+import hashlib
+import json
+import os
+import threading
+from typing import Dict, List
+
+DEFAULT_SEED = 20250401
+
+
+def _file_hash(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class Corpus:
+    root: str
+    std_hash: str
+    manifest: Dict
+
+    def __init__(self, root: str, std_jar: str = 'std.jar', seed: int = DEFAULT_SEED):
+        self.root = root
+        self.std_hash = _file_hash(std_jar)
+        self._lock = threading.Lock()
+        os.makedirs(os.path.join(root, 'input'), exist_ok=True)
+        os.makedirs(os.path.join(root, 'answer'), exist_ok=True)
+        self.manifest = {"seed": seed, "cases": {}}
+        if os.path.isfile(self._manifest_path()):
+            with open(self._manifest_path(), 'r', encoding='utf-8') as f:
+                self.manifest = json.load(f)
+
+    def _manifest_path(self) -> str:
+        return os.path.join(self.root, 'manifest.json')
+
+    def _save_manifest(self):
+        tmp = self._manifest_path() + '.tmp'
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump(self.manifest, f, indent=1)
+        os.replace(tmp, self._manifest_path())
+
+    def seed(self, test_num: int) -> int:
+        """Seed to generate the input of testcase test_num with."""
+        return self.manifest["seed"] + test_num
+
+    def input_path(self, test_num: int) -> str:
+        return os.path.join(self.root, 'input', f"test{test_num}.txt")
+
+    def has_input(self, test_num: int, instruction_count: int) -> bool:
+        """Whether testcase test_num has a stored input generated with instruction_count instructions."""
+        case = self.manifest["cases"].get(str(test_num))
+        return (case is not None and case["instructions"] == instruction_count
+                and os.path.isfile(self.input_path(test_num)))
+
+    def store_input(self, test_num: int, instruction_count: int, instrs: List[str]):
+        with open(self.input_path(test_num), 'w') as f:
+            for instr in instrs:
+                f.write(instr + '\n')
+        with self._lock:
+            self.manifest["cases"][str(test_num)] = {
+                "seed": self.seed(test_num),
+                "instructions": instruction_count,
+                "sha256": _file_hash(self.input_path(test_num)),
+            }
+            self._save_manifest()
+
+    def answer_path(self, test_num: int) -> str:
+        input_hash = self.manifest["cases"][str(test_num)]["sha256"]
+        key = hashlib.sha256(f"{input_hash}:{self.std_hash}".encode()).hexdigest()
+        return os.path.join(self.root, 'answer', f"{key}.txt")
+
+    def pending_answer_path(self, test_num: int) -> str:
+        """Where std.jar writes the answer; store_answer() moves it to answer_path once std.jar succeeded."""
+        return self.answer_path(test_num) + '.part'
+
+    def has_answer(self, test_num: int) -> bool:
+        return os.path.isfile(self.answer_path(test_num))
+
+    def store_answer(self, test_num: int):
+        os.replace(self.pending_answer_path(test_num), self.answer_path(test_num))
+
+    def discard_answer(self, test_num: int):
+        """Drops the output of a failed std.jar run."""
+        try:
+            os.remove(self.pending_answer_path(test_num))
+        except OSError:
+            pass
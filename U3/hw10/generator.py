@@ -1,3 +1,4 @@
+import itertools
 import random
 import string
 import sys
@@ -28,6 +29,11 @@ class Generator:
     person_owned_tags: dict[int, set[int]]
     # Track account-article ownership {account_id: set(article_id)}
     account_owned_articles: dict[int, set[int]]
+    # Sizes of the model state add_operation checks, kept up to date by the generation methods
+    relation_count: int # Relations in the network
+    owned_tag_count: int # Tags in person_owned_tags
+    tagged_person_count: int # Persons in the personList of every tag
+    owned_article_count: int # Articles in account_owned_articles
 
 
     # --- Constants ---
@@ -108,6 +114,15 @@ class Generator:
         self.existing_article_ids = set()
         self.person_owned_tags = {}
         self.account_owned_articles = {}
+        self.relation_count = 0
+        self.owned_tag_count = 0
+        self.tagged_person_count = 0
+        self.owned_article_count = 0
+        # add_operation's filtered op list, rebuilt when the feasibility key or the weights change
+        self._feasibility = None
+        self._feasibility_weights = None
+        self._possible_ops = []
+        self._possible_cum_weights = []
 
     def get_result(self) -> list[str]:
         """Returns the list of generated operation strings."""
@@ -248,7 +263,8 @@ class Generator:
              op = OperationAddRelation(rand_id1, rand_id2, value)
         elif random.random() < new_relation_percentage and not self.network.has_relation(pid1, pid2):
             # Try adding a valid new relation to the model
-            self.network.add_relation(pid1, pid2, value) # Update model (ignore success/fail here)
+            if self.network.add_relation(pid1, pid2, value): # Update model
+                 self.relation_count += 1
             op = OperationAddRelation(pid1, pid2, value)
         else:
             # Generate command targeting existing relation (test duplicate add) or random pair
@@ -281,7 +297,8 @@ class Generator:
             # Target an existing relation
             pid1, pid2 = random.choice(existing_relations)
             # Update model (Network's modify_relation handles removal if value <= 0)
-            self.network.modify_relation(pid1, pid2, mod_value)
+            if self.network.modify_relation(pid1, pid2, mod_value) and not self.network.has_relation(pid1, pid2):
+                 self.relation_count -= 1 # The modification removed the relation
             op = OperationModifyRelation(pid1, pid2, mod_value)
         else:
             # Target non-existent or random relation
@@ -325,6 +342,7 @@ class Generator:
              if self.network.add_tag(person_id, new_tag):
                  self.existing_tag_ids.add(tag_id) # Add to global pool
                  self.person_owned_tags[person_id].add(tag_id) # Track ownership
+                 self.owned_tag_count += 1
              op = OperationAddTag(person_id, tag_id)
         else:
              # Add an existing tag ID (tests duplicate add for this person, or using another tag's ID)
@@ -335,11 +353,13 @@ class Generator:
                  if self.network.add_tag(person_id, new_tag):
                      self.existing_tag_ids.add(tag_id)
                      self.person_owned_tags[person_id].add(tag_id)
+                     self.owned_tag_count += 1
              else:
                  # Try adding; model handles if person already owns this tag ID
                  tag_obj_for_add = Tag(tag_id) # Use a temporary object
                  if self.network.add_tag(person_id, tag_obj_for_add):
                       self.person_owned_tags[person_id].add(tag_id) # Track ownership if added
+                      self.owned_tag_count += 1
 
              op = OperationAddTag(person_id, tag_id)
 
@@ -355,9 +375,13 @@ class Generator:
             # Target deleting a tag the person actually owns
             person_id, tag_id = owned_tag_pair
             tag_obj_to_del = Tag(tag_id) # Need object for network.del_tag
+            owner = self.network.find_person(person_id)
+            owned_tag = owner.find_tag(tag_id) if owner else None
             if self.network.del_tag(person_id, tag_obj_to_del):
-                 if person_id in self.person_owned_tags:
+                 if owned_tag: self.tagged_person_count -= owned_tag.get_size()
+                 if tag_id in self.person_owned_tags.get(person_id, set()):
                       self.person_owned_tags[person_id].discard(tag_id)
+                      self.owned_tag_count -= 1
                  # Don't remove from global existing_tag_ids easily
             op = OperationDelTag(person_id, tag_id)
         else:
@@ -403,7 +427,8 @@ class Generator:
 
         if candidates and random.random() < valid_percentage:
              pid1, pid2, tag_id = random.choice(candidates)
-             self.network.add_person_to_tag(pid1, pid2, tag_id) # Update model
+             if self.network.add_person_to_tag(pid1, pid2, tag_id): # Update model
+                  self.tagged_person_count += 1
              op = OperationAddToTag(pid1, pid2, tag_id)
         else:
             # Generate invalid or random
@@ -459,7 +484,8 @@ class Generator:
 
         if candidates and random.random() < valid_percentage:
              pid1, pid2, tag_id = random.choice(candidates)
-             self.network.del_person_from_tag(pid1, pid2, tag_id) # Update model
+             if self.network.del_person_from_tag(pid1, pid2, tag_id): # Update model
+                  self.tagged_person_count -= 1
              op = OperationDelFromTag(pid1, pid2, tag_id)
         else:
             # Generate invalid or random
@@ -596,6 +622,10 @@ class Generator:
             self.existing_article_ids = set()
             self.person_owned_tags = {pid: set() for pid in ids}
             self.account_owned_articles = {}
+            self.relation_count = sum(len(p.acquaintances) for p in self.network.person_map.values()) // 2
+            self.owned_tag_count = 0
+            self.tagged_person_count = 0
+            self.owned_article_count = 0
             print("Info: Internal network model updated after LoadNetwork.")
         else:
             print("Error: Failed to update internal network model after LoadNetwork.", file=sys.stderr)
@@ -644,6 +674,7 @@ class Generator:
                  self.existing_account_ids.discard(account_id)
                  if account_id in self.account_owned_articles:
                       # Remove associated articles from global pool too? Maybe not necessary.
+                      self.owned_article_count -= len(self.account_owned_articles[account_id])
                       del self.account_owned_articles[account_id]
             # Create operation using the account ID (constructor takes only ID)
             op = OperationDeleteOfficialAccount(person_id, account_id)
@@ -669,6 +700,7 @@ class Generator:
              if self.network.contribute_article(account_id, article_id):
                   self.existing_article_ids.add(article_id)
                   self.account_owned_articles.setdefault(account_id, set()).add(article_id)
+                  self.owned_article_count += 1
              op = OperationContributeArticle(person_id, account_id, article_id)
         else: # Invalid: non-existent account, existing article ID, non-existent person
             if random.random() < 0.4:
@@ -697,8 +729,9 @@ class Generator:
 
              if self.network.delete_article(account_id, article_id):
                   # Update tracking (don't remove from global easily)
-                  if account_id in self.account_owned_articles:
+                  if article_id in self.account_owned_articles.get(account_id, set()):
                        self.account_owned_articles[account_id].discard(article_id)
+                       self.owned_article_count -= 1
              op = OperationDeleteArticle(person_id, account_id, article_id)
         else: # Invalid: non-existent article/account, wrong owner?
             account_id = self._get_random_existing_account_id()
@@ -799,17 +832,11 @@ class Generator:
 
     # --- Main Dispatcher ---
 
-    def add_operation(self):
-        """Chooses and generates the next operation based on weights and feasibility."""
+    def _filter_operations(self, num_persons: int, num_accounts: int, has_relations: bool, has_person_tags: bool,
+                           has_people_in_tags: bool, has_articles_in_accounts: bool) -> tuple[list, list]:
+        """Returns the operation types (and their weights) whose prerequisites the current state meets."""
         possible_ops = []
         current_weights = []
-        num_persons = len(self.existing_person_ids)
-        num_accounts = len(self.existing_account_ids)
-        # Check complex conditions
-        has_relations = any(p.acquaintances for p in self.network.person_map.values())
-        has_person_tags = any(tags for tags in self.person_owned_tags.values())
-        has_people_in_tags = any(t.personList for p in self.network.person_map.values() for t in p.tag_list)
-        has_articles_in_accounts = any(arts for arts in self.account_owned_articles.values())
 
         # Filter operations based on prerequisites
         for op_type, weight in self.weights.items():
@@ -850,6 +877,23 @@ class Generator:
                 possible_ops.append(op_type)
                 current_weights.append(weight)
 
+        return possible_ops, current_weights
+
+    def add_operation(self):
+        """Chooses and generates the next operation based on weights and feasibility."""
+        num_persons = len(self.existing_person_ids)
+        num_accounts = len(self.existing_account_ids)
+        # The filtered op list only changes when one of these crosses zero (or num_persons reaches 2)
+        feasibility = (min(num_persons, 2), num_accounts > 0, self.relation_count > 0, self.owned_tag_count > 0,
+                       self.tagged_person_count > 0, self.owned_article_count > 0)
+        if feasibility != self._feasibility or self.weights != self._feasibility_weights:
+            possible_ops, current_weights = self._filter_operations(num_persons, num_accounts, *feasibility[2:])
+            self._feasibility = feasibility
+            self._feasibility_weights = dict(self.weights)
+            self._possible_ops = possible_ops
+            self._possible_cum_weights = list(itertools.accumulate(current_weights))
+        possible_ops = self._possible_ops
+
         if not possible_ops:
              # Fallback: If nothing else possible, usually means no people yet. Add one.
              # print("Warning: No possible operations based on current state, forcing AddPerson.")
@@ -858,7 +902,7 @@ class Generator:
 
         # Choose operation type from possible ones
         try:
-            operation_type = random.choices(possible_ops, weights=current_weights)[0]
+            operation_type = random.choices(possible_ops, cum_weights=self._possible_cum_weights)[0]
         except IndexError: # Should not happen if possible_ops is not empty
              print("Error: random.choices failed unexpectedly. Forcing AddPerson.", file=sys.stderr)
              self.add_operation_add_person()
@@ -1,6 +1,7 @@
 import os
-import time
+import random
 import sys # Added for flushing output
+from typing import Optional
 
 # Assuming generator.py is in the same directory or Python path
 try:
@@ -9,8 +10,31 @@ except ImportError:
     print("Error: generator.py not found or contains import errors.")
     sys.exit(1)
 
+import cds
+import compare
+import corpus
+import executor
+import oracle
+
 TESTCASE = 100
 INSTRUCTION = 3000 # Default instructions per testcase
+USE_CDS = False # Start jars with per-jar AppCDS archives to cut JVM startup (JDK 13+)
+WORKERS = executor.WORKERS # java processes running at once (std.jar and test jars of several testcases)
+MS_PER_INSTRUCTION = 1.0 # Time limit per instruction of a testcase, in milliseconds
+TIME_LIMIT_BASE = 3.0 # Time limit added to every run for JVM startup, in seconds
+CORPUS_DIR = None # e.g. "corpus": reuse seeded inputs and std.jar answers across runs (see corpus.py)
+USE_ORACLE = False # Generate the answers with oracle.py (pure-Python reference) instead of std.jar
+
+
+def java_command(jar_path: str) -> str:
+    """Command prefix that starts jar_path, with its AppCDS archive when USE_CDS is set (see cds.py)."""
+    return cds.java_command_line(jar_path) if USE_CDS else f"java -jar \"{jar_path}\""
+
+
+def oracle_command() -> str:
+    """Command that runs oracle.py like std.jar: instructions on stdin, answer on stdout."""
+    return f"\"{sys.executable}\" \"{os.path.abspath(oracle.__file__)}\""
+
 
 class Tester:
     testcase_count: int
@@ -19,17 +43,25 @@ class Tester:
     ACCEPTED : int = 0
     WRONG_ANSWER : int = 1
     RUNTIME_ERROR : int = 2
+    TIME_LIMIT_EXCEEDED : int = 3
 
     # Map codes to human-readable strings
     STATUS_MAP = {
         ACCEPTED: "Accepted",
         WRONG_ANSWER: "Wrong Answer",
-        RUNTIME_ERROR: "Runtime Error"
+        RUNTIME_ERROR: "Runtime Error",
+        TIME_LIMIT_EXCEEDED: "Time Limit Exceeded"
     }
 
-    def __init__(self, testcase_count: int, instruction_count: int):
+    def __init__(self, testcase_count: int, instruction_count: int, workers: int = WORKERS,
+                 corpus_dir: Optional[str] = CORPUS_DIR, use_oracle: bool = USE_ORACLE):
         self.testcase_count = testcase_count
         self.instruction_count = instruction_count
+        self.workers = workers
+        self.corpus_dir = corpus_dir
+        self.use_oracle = use_oracle
+        self.corpus = None # Opened in run(), once std.jar is known to exist
+        self.time_limit = executor.time_limit(instruction_count, MS_PER_INSTRUCTION, TIME_LIMIT_BASE)
         # Create directories if they don't exist
         for dir_name in ['input', 'output', 'answer', 'jar']:
              if not os.path.isdir(dir_name):
@@ -57,7 +89,7 @@ class Tester:
         if not os.path.isdir('jar'):
             print("Error: jar directory not found.", file=sys.stderr)
             all_ok = False
-        if not os.path.isfile('std.jar'):
+        if not self.use_oracle and not os.path.isfile('std.jar'):
             print("Error: std.jar not found. (std.jar should be in the main directory)", file=sys.stderr)
             all_ok = False
         return all_ok
@@ -90,88 +122,64 @@ class Tester:
             return
 
         # Initialize overall results tracking
-        overall_results = {jar: {"AC": 0, "WA": 0, "RE": 0, "TotalTime": 0.0} for jar in jar_list}
+        overall_results = {jar: {"AC": 0, "WA": 0, "RE": 0, "TLE": 0, "TotalTime": 0.0} for jar in jar_list}
         total_std_re = 0 # Track how many times std.jar failed
 
-        print(f"Starting tests for {len(jar_list)} JAR file(s)...")
+        if self.corpus_dir is not None:
+            # With the oracle, answers are keyed by oracle.py instead of std.jar
+            self.corpus = corpus.Corpus(self.corpus_dir, oracle.__file__ if self.use_oracle else 'std.jar')
+            print(f"Using the corpus in {self.corpus_dir}: stored inputs and std.jar answers are reused.")
 
-        for i in range(self.testcase_count):
-            test_num = i + 1
-            print(f"\n--- Testcase {test_num}/{self.testcase_count} ---")
-            sys.stdout.flush() # Ensure prompt output before potentially long operations
-
-            # Generate input
-            generator.reset()
-            try:
-                 generator.add_operations(self.instruction_count)
-                 instrs = generator.get_result()
-            except Exception as e:
-                 print(f"  Error during test case generation: {e}", file=sys.stderr)
-                 print("  Skipping this test case.")
-                 continue # Skip to next test case
-
-            input_file_name = f"test{test_num}.txt"
-            answer_file_name = f"test_ans{test_num}.txt"
-            input_file_path = os.path.join('input', input_file_name)
-            answer_file_path = os.path.join('answer', answer_file_name)
-
-            try:
-                with open(input_file_path, 'w') as f:
-                    for instr in instrs:
-                        f.write(instr + '\n')
-                # print(f"  Input file generated: {input_file_path}") # Optional verbose output
-            except IOError as e:
-                print(f"  Error writing input file {input_file_path}: {e}", file=sys.stderr)
-                continue # Skip to next test case
+        print(f"Starting tests for {len(jar_list)} JAR file(s) with {self.workers} worker(s), "
+              f"time limit {self.time_limit:.1f}s per run...")
+        if self.use_oracle:
+            print("Standard answers are generated by oracle.py instead of std.jar.")
 
-            # Run std.jar to generate answer
-            print(f"  Running std.jar to generate answer...")
-            sys.stdout.flush()
-            std_command = f"java -jar std.jar < \"{input_file_path}\" > \"{answer_file_path}\""
-            std_start_time = time.time()
-            return_code = os.system(std_command)
-            std_end_time = time.time()
-            print(f"  std.jar finished in {std_end_time - std_start_time:.3f}s (Exit Code: {return_code})")
-
-            if return_code != 0:
-                print(f"  Error: std.jar runtime error (exit code {return_code}) on testcase {test_num}.", file=sys.stderr)
-                total_std_re += 1
-                # Optionally remove potentially incomplete answer file
-                if os.path.exists(answer_file_path):
-                    try: os.remove(answer_file_path)
-                    except OSError: pass
-                continue # Skip to next test case if standard fails
-
-            # Read the generated answer
-            try:
-                with open(answer_file_path, 'r') as f:
-                    answer = f.read()
-            except IOError as e:
-                print(f"  Error reading answer file {answer_file_path}: {e}", file=sys.stderr)
+        # std.jar and every test jar of a testcase run as separate jobs, several testcases at once;
+        # the results come back in testcase order and are judged here one testcase at a time.
+        for test_num, job_results in executor.run_cases(self.prepare_cases(generator, jar_list), self.workers):
+            print(f"\n--- Testcase {test_num}/{self.testcase_count} ---")
+            input_file_path, answer_file_path = self.case_paths(test_num)
+
+            std_result = job_results.get(executor.STD)
+            if std_result is None:
+                print(f"  std.jar answer reused from the corpus.")
+            else:
+                return_code = std_result.return_code
+                print(f"  std.jar finished in {std_result.seconds:.3f}s (Exit Code: {return_code})")
+
+                if std_result.timed_out or return_code != 0:
+                    reason = "time limit exceeded" if std_result.timed_out else f"runtime error (exit code {return_code})"
+                    print(f"  Error: std.jar {reason} on testcase {test_num}.", file=sys.stderr)
+                    total_std_re += 1
+                    # Remove the incomplete answer file
+                    if os.path.exists(self.std_output_path(test_num)):
+                        try: os.remove(self.std_output_path(test_num))
+                        except OSError: pass
+                    continue # Skip to next test case if standard fails
+                if self.corpus is not None:
+                    self.corpus.store_answer(test_num)
+
+            if not os.path.isfile(answer_file_path):
+                print(f"  Error: answer file {answer_file_path} not found.", file=sys.stderr)
                 continue # Skip to next test case
 
-            # Run each test jar
+            # Judge each test jar
             judge_result_current_test = {}
             for jar in jar_list:
-                output_file_name = f"test{test_num}_{jar}.txt"
-                output_file_path = os.path.join('output', output_file_name)
-                jar_file_path = os.path.join('jar', jar)
-                print(f"  Running {jar}...")
-                sys.stdout.flush()
-
-                run_command = f"java -jar \"{jar_file_path}\" < \"{input_file_path}\" > \"{output_file_path}\""
-                start_time = time.time()
-                return_code = os.system(run_command)
-                end_time = time.time()
-                exec_time = end_time - start_time
+                output_file_path = os.path.join('output', f"test{test_num}_{jar}.txt")
+                print(f"  {jar}:")
+                return_code = job_results[jar].return_code
+                exec_time = job_results[jar].seconds
                 overall_results[jar]["TotalTime"] += exec_time
                 print(f"    Finished in {exec_time:.3f}s (Exit Code: {return_code})")
 
-                # Slight pause might be unnecessary unless observing file system race conditions
-                # time.sleep(0.05) # Reduced pause
-
                 result_code = -1 # Default to unknown
-                if return_code != 0:
+                if job_results[jar].timed_out:
+                    print(f"    Result: Time Limit Exceeded (limit {self.time_limit:.1f}s)")
+                    result_code = self.TIME_LIMIT_EXCEEDED
+                    overall_results[jar]["TLE"] += 1
+                elif return_code != 0:
                     print(f"    Result: Runtime Error (Exit Code {return_code})")
                     result_code = self.RUNTIME_ERROR
                     overall_results[jar]["RE"] += 1
@@ -180,23 +188,17 @@ class Tester:
                          try: os.remove(output_file_path)
                          except OSError: pass
                 else:
-                    # Compare output with answer
+                    # Compare output with answer line by line (trailing whitespace ignored)
                     try:
-                        with open(output_file_path, 'r') as f:
-                            output = f.read()
-                        # Normalize line endings and strip trailing whitespace for comparison
-                        norm_output = output.replace('\r\n', '\n').rstrip()
-                        norm_answer = answer.replace('\r\n', '\n').rstrip()
+                        divergence = compare.compare_files(output_file_path, answer_file_path, input_file_path)
 
-                        if norm_output == norm_answer:
+                        if divergence is None:
                             print(f"    Result: Accepted")
                             result_code = self.ACCEPTED
                             overall_results[jar]["AC"] += 1
                         else:
                             print(f"    Result: Wrong Answer")
-                            # Optional: print diff or first differing line
-                            # print(f"      Output:\n{norm_output[:200]}{'...' if len(norm_output)>200 else ''}") # Show snippet
-                            # print(f"      Answer:\n{norm_answer[:200]}{'...' if len(norm_answer)>200 else ''}")
+                            print(divergence.describe("      "))
                             result_code = self.WRONG_ANSWER
                             overall_results[jar]["WA"] += 1
                     except IOError as e:
@@ -225,15 +227,68 @@ class Tester:
         print(" " * 12 + "Overall Summary")
         print("=" * 40)
         if total_std_re > 0:
-             print(f"Warning: std.jar encountered runtime errors in {total_std_re} testcase(s).")
-        header = f"{'JAR File':<25} | {'AC':>4} | {'WA':>4} | {'RE':>4} | {'Avg Time (s)':>12}"
+             print(f"Warning: std.jar failed (runtime error or time limit) in {total_std_re} testcase(s).")
+        header = f"{'JAR File':<25} | {'AC':>4} | {'WA':>4} | {'RE':>4} | {'TLE':>4} | {'Avg Time (s)':>12}"
         print(header)
         print("-" * len(header))
         for jar, results in overall_results.items():
              avg_time = results['TotalTime'] / self.testcase_count if self.testcase_count > 0 else 0
-             print(f"{jar:<25} | {results['AC']:>4} | {results['WA']:>4} | {results['RE']:>4} | {avg_time:>12.3f}")
+             print(f"{jar:<25} | {results['AC']:>4} | {results['WA']:>4} | {results['RE']:>4} | {results['TLE']:>4} | {avg_time:>12.3f}")
         print("=" * 40)
 
+    def case_paths(self, test_num: int):
+        """(input file, answer file) of a testcase, in the corpus when there is one."""
+        if self.corpus is not None:
+            return self.corpus.input_path(test_num), self.corpus.answer_path(test_num)
+        return os.path.join('input', f"test{test_num}.txt"), os.path.join('answer', f"test_ans{test_num}.txt")
+
+    def std_output_path(self, test_num: int) -> str:
+        """Where std.jar writes its answer (in the corpus it is moved to case_paths() once std.jar succeeded)."""
+        if self.corpus is not None:
+            return self.corpus.pending_answer_path(test_num)
+        return self.case_paths(test_num)[1]
+
+    def prepare_cases(self, generator, jar_list):
+        """Generates the input of each testcase and yields (test_num, jobs) for executor.run_cases."""
+        for i in range(self.testcase_count):
+            test_num = i + 1
+
+            if self.corpus is None or not self.corpus.has_input(test_num, self.instruction_count):
+                if self.corpus is not None:
+                    random.seed(self.corpus.seed(test_num)) # Recorded in the corpus manifest
+                # Generate input
+                generator.reset()
+                try:
+                     generator.add_operations(self.instruction_count)
+                     instrs = generator.get_result()
+                except Exception as e:
+                     print(f"  Error during generation of testcase {test_num}: {e}", file=sys.stderr)
+                     print("  Skipping this test case.")
+                     continue # Skip to next test case
+
+                try:
+                    if self.corpus is not None:
+                        self.corpus.store_input(test_num, self.instruction_count, instrs)
+                    else:
+                        with open(self.case_paths(test_num)[0], 'w') as f:
+                            for instr in instrs:
+                                f.write(instr + '\n')
+                except IOError as e:
+                    print(f"  Error writing input file of testcase {test_num}: {e}", file=sys.stderr)
+                    continue # Skip to next test case
+
+            input_file_path, answer_file_path = self.case_paths(test_num)
+            jobs = []
+            if self.corpus is None or not self.corpus.has_answer(test_num):
+                std_command = oracle_command() if self.use_oracle else java_command('std.jar')
+                jobs.append(executor.Job(test_num, executor.STD, std_command, input_file_path,
+                                         self.std_output_path(test_num), self.time_limit))
+            for jar in jar_list:
+                output_file_path = os.path.join('output', f"test{test_num}_{jar}.txt")
+                jobs.append(executor.Job(test_num, jar, java_command(os.path.join('jar', jar)), input_file_path, output_file_path,
+                                         self.time_limit))
+            yield test_num, jobs
+
 
 if __name__ == '__main__':
     num_testcases = TESTCASE
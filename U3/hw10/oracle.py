@@ -0,0 +1,609 @@
+# oracle.py
+"""
+In-process reference implementation of the hw10 network, used instead of
+std.jar when main.USE_ORACLE is set.
+
+run() reads an input and yields the line std.jar prints for each instruction:
+"Ok" for the instructions that change the network, the value of a query, or
+the message of the exception the JML specifies, with the same global and
+per-id counters. Queries do not scan the network:
+- qci: union-find over the relations, rebuilt on the next qci after mr removed one
+- qts: triangle count, updated when a relation is added or removed
+- qtav, qtvs: age sums and value sum of every tag, updated by ar/mr/att/dft
+- qba, qcs: the best acquaintance of every person (from a max-heap of
+  (value, id), stale entries dropped lazily) and the number of couples,
+  updated when a person's relations change
+- qbc: a max-heap of (contribution, id) per account, like qba
+- qra: received articles in arrival order; deleted ones are skipped lazily
+- qsp: bidirectional BFS, after union-find has ruled out unconnected pairs
+
+`python oracle.py < input > answer` runs it like `java -jar std.jar`.
+"""
+import heapq
+import sys
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+LOAD_NETWORK = ("ln", "load_network")
+TAG_CAPACITY = 1000  # att only adds a person to a tag with fewer members
+RECEIVED_ARTICLES_SHOWN = 5  # qra prints the newest articles only
+
+
+class NetworkError(Exception):
+    """A JML exceptional behavior; str() is the line std.jar prints."""
+
+
+class ExceptionCounter:
+    """The static counters of one exception class: total count and count per id."""
+    name: str
+    count: int
+    by_id: Dict[int, int]
+
+    def __init__(self, name: str):
+        self.name = name
+        self.count = 0
+        self.by_id = {}
+
+    def _bump(self, id: int) -> int:
+        self.by_id[id] = self.by_id.get(id, 0) + 1
+        return self.by_id[id]
+
+    def one(self, id: int) -> NetworkError:
+        self.count += 1
+        times = self._bump(id)
+        return NetworkError(f"{self.name}-{self.count}, {id}-{times}")
+
+    def two(self, id1: int, id2: int) -> NetworkError:
+        """Two-id exceptions print the smaller id first and count an id only once when both are equal."""
+        if id1 > id2:
+            id1, id2 = id2, id1
+        self.count += 1
+        self._bump(id1)
+        if id1 != id2:
+            self._bump(id2)
+        return NetworkError(f"{self.name}-{self.count}, {id1}-{self.by_id[id1]}, {id2}-{self.by_id[id2]}")
+
+    def pair(self, id1: int, id2: int) -> NetworkError:
+        """Permission exceptions only count in total and print both ids as given."""
+        self.count += 1
+        return NetworkError(f"{self.name}-{self.count}, {id1}-{id2}")
+
+
+class Tag:
+    id: int
+    members: Set[int]
+    age_sum: int
+    age_square_sum: int
+    value_sum: int  # Σ value over ordered pairs of linked members, so every relation counts twice
+
+    def __init__(self, id: int):
+        self.id = id
+        self.members = set()
+        self.age_sum = 0
+        self.age_square_sum = 0
+        self.value_sum = 0
+
+    def age_var(self) -> int:
+        """Integer Σ(age - mean)² / n with the integer mean, as Tag.getAgeVar computes it."""
+        n = len(self.members)
+        if n == 0:
+            return 0
+        mean = self.age_sum // n
+        return (self.age_square_sum - 2 * mean * self.age_sum + n * mean * mean) // n
+
+
+class Person:
+    id: int
+    name: str
+    age: int
+    values: Dict[int, int]  # acquaintance id -> value
+    tags: Dict[int, Tag]
+    member_of: Dict[int, Set[int]]  # owner id -> ids of the owner's tags this person is in
+    tags_in: Set[Tag]  # the same tags as member_of, for tag value sums
+    best: List[Tuple[int, int]]  # heap of (-value, acquaintance id), possibly stale
+    received: List[int]  # received article ids, oldest first, possibly deleted
+
+    def __init__(self, id: int, name: str, age: int):
+        self.id = id
+        self.name = name
+        self.age = age
+        self.values = {}
+        self.tags = {}
+        self.member_of = {}
+        self.tags_in = set()
+        self.best = []
+        self.received = []
+
+    def set_value(self, other: int, value: int):
+        self.values[other] = value
+        heapq.heappush(self.best, (-value, other))
+
+    def best_acquaintance(self) -> Optional[int]:
+        best = self.best
+        while best:
+            value, other = best[0]
+            if self.values.get(other) == -value:
+                return other
+            heapq.heappop(best)
+        return None
+
+
+class OfficialAccount:
+    id: int
+    owner: int
+    name: str
+    contributions: Dict[int, int]  # follower id -> number of articles contributed
+    articles: Set[int]
+    best: List[Tuple[int, int]]  # heap of (-contribution, follower id), possibly stale
+
+    def __init__(self, id: int, owner: int, name: str):
+        self.id = id
+        self.owner = owner
+        self.name = name
+        self.contributions = {}
+        self.articles = set()
+        self.best = []
+        self.set_contribution(owner, 0)
+
+    def set_contribution(self, follower: int, contribution: int):
+        self.contributions[follower] = contribution
+        heapq.heappush(self.best, (-contribution, follower))
+
+    def best_contributor(self) -> int:
+        best = self.best
+        while True:
+            contribution, follower = best[0]
+            if self.contributions.get(follower) == -contribution:
+                return follower
+            heapq.heappop(best)
+
+
+class Network:
+    persons: Dict[int, Person]
+    accounts: Dict[int, OfficialAccount]
+    triple_sum: int
+    couple_sum: int
+
+    def __init__(self):
+        self.persons = {}
+        self.accounts = {}
+        self.articles: Set[int] = set()  # every article id ever contributed
+        self.live_articles: Set[int] = set()  # contributed and not deleted
+        self.article_contributors: Dict[int, int] = {}
+        self.triple_sum = 0
+        self.couple_sum = 0
+        self._best_of: Dict[int, int] = {}  # person id -> best acquaintance id, for persons with acquaintances
+        self._parent: Dict[int, int] = {}
+        self._parent_stale = False
+        self.epi = ExceptionCounter("epi")
+        self.pinf = ExceptionCounter("pinf")
+        self.er = ExceptionCounter("er")
+        self.rnf = ExceptionCounter("rnf")
+        self.eti = ExceptionCounter("eti")
+        self.tinf = ExceptionCounter("tinf")
+        self.anf = ExceptionCounter("anf")
+        self.pnf = ExceptionCounter("pnf")
+        self.eoai = ExceptionCounter("eoai")
+        self.oainf = ExceptionCounter("oainf")
+        self.eai = ExceptionCounter("eai")
+        self.ainf = ExceptionCounter("ainf")
+        self.cpd = ExceptionCounter("cpd")
+        self.dapd = ExceptionCounter("dapd")
+        self.doapd = ExceptionCounter("doapd")
+
+    # --- union-find for qci and qsp ---
+
+    def _find(self, id: int) -> int:
+        parent = self._parent
+        while parent[id] != id:
+            parent[id] = parent[parent[id]]
+            id = parent[id]
+        return id
+
+    def _union(self, id1: int, id2: int):
+        root1, root2 = self._find(id1), self._find(id2)
+        if root1 != root2:
+            self._parent[root1] = root2
+
+    def _rebuild_parents(self):
+        self._parent = {id: id for id in self.persons}
+        for person in self.persons.values():
+            for other in person.values:
+                if other > person.id:
+                    self._union(person.id, other)
+        self._parent_stale = False
+
+    def _connected(self, id1: int, id2: int) -> bool:
+        if self._parent_stale:
+            self._rebuild_parents()
+        return self._find(id1) == self._find(id2)
+
+    # --- lookups raising the JML exceptions ---
+
+    def _person(self, id: int) -> Person:
+        person = self.persons.get(id)
+        if person is None:
+            raise self.pinf.one(id)
+        return person
+
+    def _account(self, id: int) -> OfficialAccount:
+        account = self.accounts.get(id)
+        if account is None:
+            raise self.oainf.one(id)
+        return account
+
+    def _linked(self, person1: Person, person2: Person) -> bool:
+        return person1 is person2 or person2.id in person1.values
+
+    # --- best acquaintances and couples ---
+
+    def _detach(self, person: Person):
+        """Forgets the best acquaintance of a person whose relations are about to change."""
+        best = self._best_of.pop(person.id, None)
+        if best is not None and self._best_of.get(best) == person.id:
+            self.couple_sum -= 1
+
+    def _attach(self, person: Person):
+        best = person.best_acquaintance()
+        if best is not None:
+            self._best_of[person.id] = best
+            if self._best_of.get(best) == person.id:
+                self.couple_sum += 1
+
+    # --- tags ---
+
+    def _shared_tags_changed(self, person1: Person, person2: Person, delta: int):
+        """The relation between two persons changed by delta: update the tags both are in."""
+        small, large = sorted((person1.tags_in, person2.tags_in), key=len)
+        for tag in small:
+            if tag in large:
+                tag.value_sum += 2 * delta
+
+    def _value_in_tag(self, person: Person, tag: Tag) -> int:
+        small, large = sorted((person.values.keys(), tag.members), key=len)
+        return sum(person.values[other] for other in small if other in large)
+
+    def _tag_add(self, owner_id: int, tag: Tag, person: Person):
+        tag.value_sum += 2 * self._value_in_tag(person, tag)
+        tag.members.add(person.id)
+        tag.age_sum += person.age
+        tag.age_square_sum += person.age * person.age
+        person.member_of.setdefault(owner_id, set()).add(tag.id)
+        person.tags_in.add(tag)
+
+    def _tag_remove(self, tag: Tag, person: Person):
+        """Removes a person from a tag; the caller updates person.member_of."""
+        tag.members.discard(person.id)
+        tag.value_sum -= 2 * self._value_in_tag(person, tag)
+        tag.age_sum -= person.age
+        tag.age_square_sum -= person.age * person.age
+        person.tags_in.discard(tag)
+
+    # --- relations ---
+
+    def _link(self, person1: Person, person2: Person, value: int):
+        self._detach(person1)
+        self._detach(person2)
+        small, large = sorted((person1.values, person2.values), key=len)
+        self.triple_sum += sum(1 for other in small if other in large)
+        person1.set_value(person2.id, value)
+        person2.set_value(person1.id, value)
+        self._shared_tags_changed(person1, person2, value)
+        self._attach(person1)
+        self._attach(person2)
+        if not self._parent_stale:
+            self._union(person1.id, person2.id)
+
+    def _unlink(self, person1: Person, person2: Person):
+        self._detach(person1)
+        self._detach(person2)
+        value = person1.values.pop(person2.id)
+        del person2.values[person1.id]
+        small, large = sorted((person1.values, person2.values), key=len)
+        self.triple_sum -= sum(1 for other in small if other in large)
+        self._shared_tags_changed(person1, person2, -value)
+        self._attach(person1)
+        self._attach(person2)
+        self._parent_stale = True
+        for owner, member in ((person1, person2), (person2, person1)):
+            for tag_id in member.member_of.pop(owner.id, ()):
+                self._tag_remove(owner.tags[tag_id], member)
+
+    def add_person(self, id: int, name: str, age: int):
+        if id in self.persons:
+            raise self.epi.one(id)
+        self.persons[id] = Person(id, name, age)
+        self._parent[id] = id
+
+    def add_relation(self, id1: int, id2: int, value: int):
+        person1, person2 = self._person(id1), self._person(id2)
+        if self._linked(person1, person2):
+            raise self.er.two(id1, id2)
+        self._link(person1, person2, value)
+
+    def modify_relation(self, id1: int, id2: int, value: int):
+        person1, person2 = self._person(id1), self._person(id2)
+        if id1 == id2:
+            raise self.epi.one(id1)
+        if id2 not in person1.values:
+            raise self.rnf.two(id1, id2)
+        new_value = person1.values[id2] + value
+        if new_value > 0:
+            self._detach(person1)
+            self._detach(person2)
+            person1.set_value(id2, new_value)
+            person2.set_value(id1, new_value)
+            self._shared_tags_changed(person1, person2, value)
+            self._attach(person1)
+            self._attach(person2)
+        else:
+            self._unlink(person1, person2)
+
+    def query_value(self, id1: int, id2: int) -> int:
+        person1, person2 = self._person(id1), self._person(id2)
+        if not self._linked(person1, person2):
+            raise self.rnf.two(id1, id2)
+        return person1.values.get(id2, 0)
+
+    def is_circle(self, id1: int, id2: int) -> bool:
+        self._person(id1)
+        self._person(id2)
+        return self._connected(id1, id2)
+
+    def query_triple_sum(self) -> int:
+        return self.triple_sum
+
+    def query_best_acquaintance(self, id: int) -> int:
+        self._person(id)
+        best = self._best_of.get(id)
+        if best is None:
+            raise self.anf.one(id)
+        return best
+
+    def query_couple_sum(self) -> int:
+        return self.couple_sum
+
+    def query_shortest_path(self, id1: int, id2: int) -> int:
+        """Number of relations on a shortest path between two persons."""
+        self._person(id1)
+        self._person(id2)
+        if not self._connected(id1, id2):
+            raise self.pnf.two(id1, id2)
+        if id1 == id2:
+            return 0
+        persons = self.persons
+        distances = ({id1: 0}, {id2: 0})
+        frontiers = ([id1], [id2])
+        while True:
+            side = 0 if len(frontiers[0]) <= len(frontiers[1]) else 1
+            seen, other = distances[side], distances[1 - side]
+            shortest = None
+            next_frontier = []
+            for id in frontiers[side]:
+                distance = seen[id] + 1
+                for neighbor in persons[id].values:
+                    if neighbor in other:
+                        length = distance + other[neighbor]
+                        if shortest is None or length < shortest:
+                            shortest = length
+                    elif neighbor not in seen:
+                        seen[neighbor] = distance
+                        next_frontier.append(neighbor)
+            if shortest is not None:
+                return shortest
+            frontiers = (next_frontier, frontiers[1]) if side == 0 else (frontiers[0], next_frontier)
+
+    def add_tag(self, person_id: int, tag_id: int):
+        person = self._person(person_id)
+        if tag_id in person.tags:
+            raise self.eti.one(tag_id)
+        person.tags[tag_id] = Tag(tag_id)
+
+    def del_tag(self, person_id: int, tag_id: int):
+        person = self._person(person_id)
+        tag = person.tags.pop(tag_id, None)
+        if tag is None:
+            raise self.tinf.one(tag_id)
+        for member_id in tag.members:
+            member = self.persons[member_id]
+            member.tags_in.discard(tag)
+            owned = member.member_of[person_id]
+            owned.discard(tag_id)
+            if not owned:
+                del member.member_of[person_id]
+
+    def add_person_to_tag(self, id1: int, id2: int, tag_id: int):
+        person1, person2 = self._person(id1), self._person(id2)
+        if id1 == id2:
+            raise self.epi.one(id1)
+        if id1 not in person2.values:
+            raise self.rnf.two(id1, id2)
+        tag = person2.tags.get(tag_id)
+        if tag is None:
+            raise self.tinf.one(tag_id)
+        if id1 in tag.members:
+            raise self.epi.one(id1)
+        if len(tag.members) < TAG_CAPACITY:
+            self._tag_add(id2, tag, person1)
+
+    def del_person_from_tag(self, id1: int, id2: int, tag_id: int):
+        person1, person2 = self._person(id1), self._person(id2)
+        tag = person2.tags.get(tag_id)
+        if tag is None:
+            raise self.tinf.one(tag_id)
+        if id1 not in tag.members:
+            raise self.pinf.one(id1)
+        self._tag_remove(tag, person1)
+        owned = person1.member_of[id2]
+        owned.discard(tag_id)
+        if not owned:
+            del person1.member_of[id2]
+
+    def query_tag_age_var(self, person_id: int, tag_id: int) -> int:
+        tag = self._person(person_id).tags.get(tag_id)
+        if tag is None:
+            raise self.tinf.one(tag_id)
+        return tag.age_var()
+
+    def query_tag_value_sum(self, person_id: int, tag_id: int) -> int:
+        tag = self._person(person_id).tags.get(tag_id)
+        if tag is None:
+            raise self.tinf.one(tag_id)
+        return tag.value_sum
+
+    # --- official accounts ---
+
+    def create_official_account(self, person_id: int, account_id: int, name: str):
+        self._person(person_id)
+        if account_id in self.accounts:
+            raise self.eoai.one(account_id)
+        self.accounts[account_id] = OfficialAccount(account_id, person_id, name)
+
+    def delete_official_account(self, person_id: int, account_id: int):
+        self._person(person_id)
+        account = self._account(account_id)
+        if account.owner != person_id:
+            raise self.doapd.pair(person_id, account_id)
+        del self.accounts[account_id]
+
+    def contribute_article(self, person_id: int, account_id: int, article_id: int):
+        self._person(person_id)
+        account = self._account(account_id)
+        if article_id in self.articles:
+            raise self.eai.one(article_id)
+        if person_id not in account.contributions:
+            raise self.cpd.pair(person_id, article_id)
+        self.articles.add(article_id)
+        self.live_articles.add(article_id)
+        self.article_contributors[article_id] = person_id
+        account.articles.add(article_id)
+        account.set_contribution(person_id, account.contributions[person_id] + 1)
+        for follower in account.contributions:
+            self.persons[follower].received.append(article_id)
+
+    def delete_article(self, person_id: int, account_id: int, article_id: int):
+        self._person(person_id)
+        account = self._account(account_id)
+        if article_id not in account.articles:
+            raise self.ainf.one(article_id)
+        if account.owner != person_id:
+            raise self.dapd.pair(person_id, article_id)
+        account.articles.discard(article_id)
+        self.live_articles.discard(article_id)
+        contributor = self.article_contributors[article_id]
+        account.set_contribution(contributor, account.contributions[contributor] - 1)
+
+    def follow_official_account(self, person_id: int, account_id: int):
+        self._person(person_id)
+        account = self._account(account_id)
+        if person_id in account.contributions:
+            raise self.epi.one(person_id)
+        account.set_contribution(person_id, 0)
+
+    def query_best_contributor(self, account_id: int) -> int:
+        return self._account(account_id).best_contributor()
+
+    def query_received_articles(self, person_id: int) -> List[int]:
+        """The newest received articles that were not deleted, newest first."""
+        received = self._person(person_id).received
+        live = self.live_articles
+        while received and received[-1] not in live:
+            received.pop()
+        newest = []
+        for article_id in reversed(received):
+            if article_id in live:
+                newest.append(article_id)
+                if len(newest) == RECEIVED_ARTICLES_SHOWN:
+                    break
+        return newest
+
+    def load_network(self, ids: List[int], names: List[str], ages: List[int], rows: List[List[int]]):
+        """`ln`: adds the persons, then row i gives the values between person i+1 and persons 0..i (0: no relation)."""
+        for id, name, age in zip(ids, names, ages):
+            self.add_person(id, name, age)
+        for i, row in enumerate(rows):
+            for j, value in enumerate(row):
+                if value != 0:
+                    self.add_relation(ids[i + 1], ids[j], value)
+
+
+# command -> (Network method name, argument parsers)
+COMMANDS = {
+    "ap": ("add_person", (int, str, int)),
+    "ar": ("add_relation", (int, int, int)),
+    "mr": ("modify_relation", (int, int, int)),
+    "at": ("add_tag", (int, int)),
+    "dt": ("del_tag", (int, int)),
+    "att": ("add_person_to_tag", (int, int, int)),
+    "dft": ("del_person_from_tag", (int, int, int)),
+    "qv": ("query_value", (int, int)),
+    "qci": ("is_circle", (int, int)),
+    "qts": ("query_triple_sum", ()),
+    "qtav": ("query_tag_age_var", (int, int)),
+    "qba": ("query_best_acquaintance", (int,)),
+    "coa": ("create_official_account", (int, int, str)),
+    "doa": ("delete_official_account", (int, int)),
+    "ca": ("contribute_article", (int, int, int)),
+    "da": ("delete_article", (int, int, int)),
+    "foa": ("follow_official_account", (int, int)),
+    "qsp": ("query_shortest_path", (int, int)),
+    "qbc": ("query_best_contributor", (int,)),
+    "qra": ("query_received_articles", (int,)),
+    "qtvs": ("query_tag_value_sum", (int, int)),
+    "qcs": ("query_couple_sum", ()),
+}
+
+
+def _format(result) -> str:
+    if result is None:
+        return "Ok"
+    if isinstance(result, bool):
+        return "true" if result else "false"
+    if isinstance(result, list):
+        return " ".join(map(str, result)) if result else "None"
+    return str(result)
+
+
+def _read_load_network(person_count: int, lines: Iterator[str]):
+    """The ids, names, ages and relation rows that follow `ln person_count`."""
+    if person_count <= 0:
+        return [], [], [], []
+    ids = [int(x) for x in next(lines, "").split()]
+    names = next(lines, "").split()
+    ages = [int(x) for x in next(lines, "").split()]
+    rows = [[int(x) for x in next(lines, "").split()] for _ in range(person_count - 1)]
+    return ids, names, ages, rows
+
+
+def run(lines: Iterable[str], network: Optional[Network] = None) -> Iterator[str]:
+    """The output line of each instruction in `lines`."""
+    network = Network() if network is None else network
+    lines = iter(lines)
+    for line in lines:
+        parts = line.split()
+        if not parts:
+            continue
+        command = parts[0]
+        try:
+            if command in LOAD_NETWORK:
+                network.load_network(*_read_load_network(int(parts[1]), lines))
+                result = None
+            else:
+                method, parsers = COMMANDS[command]
+                args = [parse(arg) for parse, arg in zip(parsers, parts[1:])]
+                result = getattr(network, method)(*args)
+        except NetworkError as e:
+            yield str(e)
+        else:
+            yield _format(result)
+
+
+def answer_file(input_path: str, output_path: str):
+    with open(input_path, 'r', encoding='utf-8') as f, open(output_path, 'w', encoding='utf-8') as out:
+        for line in run(f):
+            out.write(line + '\n')
+
+
+if __name__ == '__main__':
+    out = sys.stdout
+    for output_line in run(sys.stdin):
+        out.write(output_line + '\n')
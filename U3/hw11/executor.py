@@ -0,0 +1,128 @@
+# executor.py
+"""
+Runs std.jar and the jars under test of many testcases at once, with time limits.
+
+Every (testcase, jar) run is one Job with its own output file (std.jar writes
+answer/test_ans<n>.txt, a jar writes output/test<n>_<jar>.txt), so jobs never
+share a file and may run in any order. run_cases() keeps WORKERS `java`
+processes busy, each one waited on by a pool thread, and yields the testcases
+in order once all of their jobs have finished; judging stays in main.py.
+
+A job with a time_limit is killed, with its whole process group (the shell and
+the JVM; on Windows the process tree, with taskkill /T), once it has run that
+many wall-clock seconds, and on POSIX its CPU time is capped with RLIMIT_CPU as
+well (set by `ulimit` in the job's shell, as preexec_fn is not safe in the pool
+threads); either way the result is timed_out.
+"""
+import collections
+import math
+import os
+import signal
+import subprocess
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Deque, Dict, Iterable, Iterator, List, Optional, Tuple
+
+STD = "std.jar"  # Job.jar of the std.jar run of a testcase
+WORKERS = os.cpu_count() or 1  # 1 runs the jobs one after another, as before
+CPU_TIME_FACTOR = 2.0  # RLIMIT_CPU = CPU_TIME_FACTOR * time_limit, as JIT and GC threads add CPU time
+# Exit statuses of a process killed by SIGXCPU, directly or as reported by the shell
+_CPU_LIMIT_CODES = (-signal.SIGXCPU, 128 + signal.SIGXCPU) if hasattr(signal, "SIGXCPU") else ()
+# Windows: each job's cmd.exe and JVM form a group of their own (start_new_session is POSIX only)
+_NEW_PROCESS_GROUP = getattr(subprocess, "CREATE_NEW_PROCESS_GROUP", 0)
+
+
+def time_limit(instruction_count: int, ms_per_instruction: float, base_seconds: float) -> float:
+    """Wall-clock limit of one run: base_seconds (JVM startup) plus ms_per_instruction per instruction."""
+    return base_seconds + instruction_count * ms_per_instruction / 1000
+
+
+class Job:
+    test_num: int
+    jar: str
+    command: str  # shell command prefix that starts the jar, see main.java_command
+    input_path: str
+    output_path: str
+    time_limit: Optional[float]  # wall-clock seconds, None for no limit
+
+    def __init__(self, test_num: int, jar: str, command: str, input_path: str, output_path: str,
+                 time_limit: Optional[float] = None):
+        self.test_num = test_num
+        self.jar = jar
+        self.command = command
+        self.input_path = input_path
+        self.output_path = output_path
+        self.time_limit = time_limit
+
+
+class JobResult:
+    return_code: int
+    seconds: float  # wall time of the java process, including waiting for a CPU under load
+    timed_out: bool  # killed for exceeding the wall-clock or the CPU time limit
+
+    def __init__(self, return_code: int, seconds: float, timed_out: bool = False):
+        self.return_code = return_code
+        self.seconds = seconds
+        self.timed_out = timed_out
+
+
+def _cpu_limit(seconds: float) -> str:
+    """Shell prefix capping the CPU time of the shell (and the JVM it starts), without core dumps."""
+    soft = max(1, math.ceil(seconds))
+    # Soft limit first: the hard one may not drop below the current (unlimited) soft limit
+    return f"ulimit -c 0; ulimit -S -t {soft}; ulimit -H -t {soft + 1}; "
+
+
+def _kill(proc: subprocess.Popen):
+    if os.name == 'posix':
+        try:
+            os.killpg(proc.pid, signal.SIGKILL)  # the shell and the JVM it started
+        except ProcessLookupError:
+            pass
+    else:
+        # proc.kill() would only end cmd.exe; /T also ends the JVM it started
+        subprocess.run(["taskkill", "/F", "/T", "/PID", str(proc.pid)],
+                       stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        proc.kill()
+
+
+def run_job(job: Job) -> JobResult:
+    command = job.command
+    if job.time_limit is not None and os.name == 'posix':  # Windows: wall-clock limit only
+        command = _cpu_limit(job.time_limit * CPU_TIME_FACTOR) + command
+    with open(job.input_path, 'rb') as stdin, open(job.output_path, 'wb') as stdout:
+        start_time = time.perf_counter()
+        proc = subprocess.Popen(command, shell=True, stdin=stdin, stdout=stdout, start_new_session=True,
+                                creationflags=_NEW_PROCESS_GROUP)
+        try:
+            return_code = proc.wait(timeout=job.time_limit)
+            timed_out = return_code in _CPU_LIMIT_CODES
+        except subprocess.TimeoutExpired:
+            _kill(proc)
+            return_code = proc.wait()
+            timed_out = True
+        end_time = time.perf_counter()
+    return JobResult(return_code, end_time - start_time, timed_out)
+
+
+def run_cases(cases: Iterable[Tuple[int, List[Job]]], workers: int = WORKERS) -> Iterator[Tuple[int, Dict[str, JobResult]]]:
+    """
+    Runs the jobs of each (test_num, jobs) in `cases` and yields (test_num,
+    {jar: JobResult}) in the order of `cases`. `cases` is consumed lazily, only a
+    few testcases ahead of the one being yielded, so generating the next inputs
+    overlaps with running the current ones.
+    """
+    workers = max(1, workers)
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        pending: Deque[Tuple[int, Dict[str, Future]]] = collections.deque()
+        for test_num, jobs in cases:
+            pending.append((test_num, {job.jar: pool.submit(run_job, job) for job in jobs}))
+            while len(pending) > workers:
+                yield _collect(pending.popleft())
+        while pending:
+            yield _collect(pending.popleft())
+
+
+def _collect(case: Tuple[int, Dict[str, Future]]) -> Tuple[int, Dict[str, JobResult]]:
+    test_num, futures = case
+    return test_num, {jar: future.result() for jar, future in futures.items()}
@@ -1,3 +1,4 @@
+import bisect
 import random
 import string
 
@@ -18,6 +19,10 @@ class Generator:
     _next_emoji_id: int 
     
     weights : dict[type[Operation], float]
+    # Compiled from weights by _compile_operation_sampler: cumulative weights and (type, bound add_operation_* method)
+    _sampler_weights : dict[type[Operation], float] | None
+    _sampler_cum_weights : list[float]
+    _sampler_methods : list[tuple]
 
     # --- Constants for Data Generation ---
     MAX_STRING_LEN = 10
@@ -144,6 +149,7 @@ class Generator:
             else:
                 print(f"Warning: Invalid load_network_relation_probability ({load_network_relation_probability}). Using default {self.LOAD_NETWORK_RELATION_PROBABILITY}.")
 
+        self._sampler_weights = None # compiled on first use
         self.reset_internal_state_and_ops() 
 
     def reset_internal_state_and_ops(self):
@@ -196,6 +202,13 @@ class Generator:
             return person.id
         return self.random_id(min_id=self.MIN_ID, max_id=self.MAX_ID) if default_if_empty else -1 
 
+    def _get_unexist_person_id(self) -> int:
+        """A random id no person has, or the next sequential one once random ids keep hitting persons."""
+        pid = self.random_id(); count = 0
+        while self.network.find_person(pid) and count < 100:
+            pid = self.random_id(); count += 1
+        return self._next_person_id if self.network.find_person(pid) else pid
+
     def _get_random_pair_of_person_ids(self, must_exist=False, must_be_different=False) -> tuple[int, int]:
         if must_exist and len(self.network.person_list) < (2 if must_be_different else 1):
             return self.random_id(), self.random_id()
@@ -508,13 +521,7 @@ class Generator:
                     p1_id, p2_id = p1_cand.id, p2_cand.id
             elif len(self.network.person_list) == 1: 
                 p1_id = self.network.person_list[0].id
-                p2_id = self.random_id() 
-                count = 0
-                while (p2_id == p1_id or self.network.find_person(p2_id)) and count < 100 : 
-                     p2_id = self.random_id() 
-                     count +=1
-                if p2_id == p1_id or self.network.find_person(p2_id): 
-                     p2_id = self.MAX_ID + 100 
+                p2_id = self._get_unexist_person_id()
             else: 
                 choice = RANDOM_ANYTHING
         
@@ -606,10 +613,7 @@ class Generator:
             if tag_id in existing_tag_ids: tag_id = max(existing_tag_ids) +1 if existing_tag_ids else original_tag_id
         
         if choice == PERSON_UNEXIST:
-            person_id = self.random_id(); count = 0
-            while self.network.find_person(person_id) and count < 100: 
-                person_id = self.random_id(); count += 1
-            if self.network.find_person(person_id): person_id = self.MAX_ID + 100
+            person_id = self._get_unexist_person_id()
         
         if choice == RANDOM_ANYTHING: person_id = self.random_id()
             
@@ -644,7 +648,7 @@ class Generator:
             if persons_with_tags:
                 p1 = random.choice(persons_with_tags)
                 tag_obj = random.choice(p1.tag_list) 
-                possible_p2s = [p_other for p_other in self.network.person_list if p_other.id != p1.id and p_other not in tag_obj.personList]
+                possible_p2s = [p_other for p_other in self.network.person_list if p_other.id != p1.id and not tag_obj.has_person(p_other)]
                 if not possible_p2s: 
                     possible_p2s = [p_other for p_other in self.network.person_list if p_other.id != p1.id] 
                     if not possible_p2s and self.network.person_list : possible_p2s = [p1] 
@@ -667,13 +671,11 @@ class Generator:
 
         if choice == P1_OR_P2_UNEXIST:
             if random.random() < 0.5 or not self.network.person_list: 
-                p1_id = self.random_id()
-                while self.network.find_person(p1_id): p1_id = self.random_id() 
+                p1_id = self._get_unexist_person_id()
                 p2_id = self._get_random_existing_person_id() if self.network.person_list else self.random_id()
             else: 
                 p1_id = self._get_random_existing_person_id()
-                p2_id = self.random_id()
-                while self.network.find_person(p2_id): p2_id = self.random_id() 
+                p2_id = self._get_unexist_person_id()
         
         if choice == RANDOM_ANYTHING: p1_id, p2_id = self.random_id(), self.random_id()
             
@@ -737,23 +739,19 @@ class Generator:
             if p1_with_tags:
                 p1 = random.choice(p1_with_tags); tag_obj = random.choice(p1.tag_list)
                 p1_id, tag_id_val = p1.id, tag_obj.id
-                possible_p2s = [p_other for p_other in self.network.person_list if p_other not in tag_obj.personList]
+                possible_p2s = [p_other for p_other in self.network.person_list if not tag_obj.has_person(p_other)]
                 if possible_p2s: p2_id = random.choice(possible_p2s).id
                 else: 
-                    p2_id = self.random_id(); count = 0
-                    while self.network.find_person(p2_id) and count < 100: p2_id = self.random_id(); count+=1
-                    if self.network.find_person(p2_id): p2_id = self.MAX_ID + 101
+                    p2_id = self._get_unexist_person_id()
             else: choice = RANDOM_ANYTHING
         
         if choice == P1_OR_P2_UNEXIST: 
             if random.random() < 0.5 or not self.network.person_list : 
-                p1_id = self.random_id()
-                while self.network.find_person(p1_id): p1_id = self.random_id()
+                p1_id = self._get_unexist_person_id()
                 p2_id = self._get_random_existing_person_id() if self.network.person_list else self.random_id()
             elif self.network.person_list: 
                 p1_id = self._get_random_existing_person_id()
-                p2_id = self.random_id()
-                while self.network.find_person(p2_id): p2_id = self.random_id()
+                p2_id = self._get_unexist_person_id()
             else: p1_id, p2_id = self.random_id(), self.random_id()
 
         if choice == RANDOM_ANYTHING: p1_id, p2_id = self.random_id(), self.random_id()
@@ -834,8 +832,7 @@ class Generator:
             if existing_acc: account_id_val = existing_acc.id
             else: account_id_val = self._get_new_account_id()
         elif choice == PERSON_UNEXIST:
-            owner_id = self.random_id()
-            while self.network.find_person(owner_id): owner_id = self.random_id()
+            owner_id = self._get_unexist_person_id()
             account_id_val = self._get_new_account_id()
         operation = OperationCreateOfficialAccount(owner_id, account_id_val, account_name); self.operations.append(operation)
 
@@ -895,8 +892,7 @@ class Generator:
             account_id_val = self.random_id()
             while any(acc.id == account_id_val for acc in self.official_accounts): account_id_val = self.random_id()
         if choice == PERSON_UNEXIST:
-            person_id_val = self.random_id()
-            while self.network.find_person(person_id_val): person_id_val = self.random_id()
+            person_id_val = self._get_unexist_person_id()
             if self.official_accounts: account_id_val = self._get_random_existing_official_account_id()
             else: account_id_val = self.random_id() 
         if choice == RANDOM_ANYTHING: 
@@ -966,8 +962,7 @@ class Generator:
             if choice == VALID: acc_obj.add_follower(person_obj, 0) 
         if choice == PERSON_OR_ACC_UNEXIST:
             if random.random() < 0.5 or not self.network.person_list: 
-                person_id_val = self.random_id()
-                while self.network.find_person(person_id_val): person_id_val = self.random_id()
+                person_id_val = self._get_unexist_person_id()
                 account_id_val = self._get_random_existing_official_account_id() if self.official_accounts else self.random_id()
             else: 
                 person_id_val = self._get_random_existing_person_id()
@@ -1138,33 +1133,46 @@ class Generator:
         for _ in range(num_operations):
             self.add_one_random_operation_excluding_ln() 
 
-    def add_one_random_operation_excluding_ln(self):
-        """Selects and adds one random operation, ensuring load_network is not chosen."""
-        possible_ops = []
-        op_weights = []
+    @staticmethod
+    def _operation_method_name(operation_type: type[Operation]) -> str:
+        """OperationAddPerson -> add_operation_add_person"""
+        method_name_part = operation_type.__name__.replace("Operation", "")
+        method_name_snake = ''.join(['_' + i.lower() if i.isupper() else i for i in method_name_part]).lstrip('_')
+        return f"add_operation_{method_name_snake}"
+
+    def _compile_operation_sampler(self):
+        """Compiles self.weights (without load_network and zero weights) into cumulative weights and bound methods."""
+        self._sampler_cum_weights = []
+        self._sampler_methods = []
+        total = 0
         for op_type, weight in self.weights.items():
             if op_type == OperationLoadNetwork: 
                 continue 
             if weight > 0:
-                possible_ops.append(op_type)
-                op_weights.append(weight)
+                total += weight
+                self._sampler_cum_weights.append(total)
+                self._sampler_methods.append((op_type, getattr(self, self._operation_method_name(op_type), None)))
+        self._sampler_weights = dict(self.weights)
+
+    def add_one_random_operation_excluding_ln(self):
+        """Selects and adds one random operation, ensuring load_network is not chosen."""
+        if self.weights != self._sampler_weights: # recompiled only when the weights were changed
+            self._compile_operation_sampler()
+        cum_weights = self._sampler_cum_weights
         
-        if not possible_ops: 
+        if not cum_weights: 
             if self.DEFAULT_ADD_PERSON_WEIGHT > 0: 
                  self.add_operation_add_person() 
             return
 
-        operation_type = random.choices(possible_ops, weights=op_weights)[0]
-        
-        method_name_part = operation_type.__name__.replace("Operation", "")
-        method_name_snake = ''.join(['_' + i.lower() if i.isupper() else i for i in method_name_part]).lstrip('_')
-        method_to_call_name = f"add_operation_{method_name_snake}"
+        # The same single draw random.choices(ops, weights=...)[0] makes, so a seed still gives the same instructions
+        index = bisect.bisect(cum_weights, random.random() * (cum_weights[-1] + 0.0), 0, len(cum_weights) - 1)
+        operation_type, method_to_call = self._sampler_methods[index]
 
-        if hasattr(self, method_to_call_name):
-            method_to_call = getattr(self, method_to_call_name)
+        if method_to_call is not None:
             method_to_call() 
         else:
-            print(f"Warning: No generator method '{method_to_call_name}' for {operation_type.__name__}")
+            print(f"Warning: No generator method '{self._operation_method_name(operation_type)}' for {operation_type.__name__}")
 
 
     @staticmethod
@@ -1,8 +1,14 @@
 import os
-import time
 import random
+import sys
+from typing import Optional
 
 from generator import Generator
+import cds
+import compare
+import corpus
+import executor
+import oracle
 
 TESTCASE = 100
 INSTRUCTION = 10000 
@@ -10,6 +16,22 @@ DEFAULT_LN_RELATION_PROB = 0.9
 DEFAULT_LN_MIN_PERSONS = 100
 DEFAULT_LN_MAX_PERSONS = 300
 DEFAULT_PROBABILITY_LN_IS_FIRST: float = 0.8 
+USE_CDS = False # Start jars with per-jar AppCDS archives to cut JVM startup (JDK 13+)
+WORKERS = executor.WORKERS # java processes running at once (std.jar and jars of several testcases)
+MS_PER_INSTRUCTION = 1.0 # Time limit per instruction of a testcase, in milliseconds
+TIME_LIMIT_BASE = 3.0 # Time limit added to every run for JVM startup, in seconds
+CORPUS_DIR = None # e.g. "corpus": reuse seeded inputs and std.jar answers across runs (see corpus.py)
+USE_ORACLE = False # Generate the answers with oracle.py (pure-Python reference) instead of std.jar
+
+
+def java_command(jar_path: str) -> str:
+    """Command prefix that starts jar_path, with its AppCDS archive when USE_CDS is set (see cds.py)."""
+    return cds.java_command_line(jar_path) if USE_CDS else f"java -jar \"{jar_path}\""
+
+
+def oracle_command() -> str:
+    """Command that runs oracle.py like std.jar: instructions on stdin, answer on stdout."""
+    return f"\"{sys.executable}\" \"{os.path.abspath(oracle.__file__)}\""
 
 
 class Tester:
@@ -19,11 +41,19 @@ class Tester:
     ln_max_persons: int
     ln_relation_prob: float
     probability_ln_is_first: float
+    workers: int
+    time_limit: float # wall-clock seconds per run
+    corpus_dir: Optional[str]
+    corpus: Optional[corpus.Corpus] # opened in run(), once std.jar is known to exist
+    use_oracle: bool # answers come from oracle.py instead of std.jar
+    # Lines about a testcase's generation, printed with its results: prepare_cases runs a few testcases ahead
+    case_notes: dict[int, list[str]]
 
     ACCEPTED: int = 0
     WRONG_ANSWER: int = 1
     RUNTIME_ERROR: int = 2
     STD_JAR_ERROR: int = 3 
+    TIME_LIMIT_EXCEEDED: int = 4
 
     overall_results: dict[str, dict[int, int]] 
     # To store runtime details for each jar: jar_name -> list of runtimes for each testcase
@@ -34,7 +64,10 @@ class Tester:
                  ln_min_p: int = DEFAULT_LN_MIN_PERSONS,
                  ln_max_p: int = DEFAULT_LN_MAX_PERSONS,
                  ln_rel_prob: float = DEFAULT_LN_RELATION_PROB,
-                 prob_ln_first: float = DEFAULT_PROBABILITY_LN_IS_FIRST):
+                 prob_ln_first: float = DEFAULT_PROBABILITY_LN_IS_FIRST,
+                 workers: int = WORKERS,
+                 corpus_dir: Optional[str] = CORPUS_DIR,
+                 use_oracle: bool = USE_ORACLE):
         self.testcase_count = testcase_count
         self.instruction_count = instruction_count 
         self.ln_min_persons = ln_min_p
@@ -49,6 +82,12 @@ class Tester:
             
         self.overall_results = {}
         self.jar_runtimes = {} # Initialize runtime storage
+        self.case_notes = {}
+        self.workers = workers
+        self.corpus_dir = corpus_dir
+        self.corpus = None
+        self.use_oracle = use_oracle
+        self.time_limit = executor.time_limit(instruction_count, MS_PER_INSTRUCTION, TIME_LIMIT_BASE)
         for dir_name in ['input', 'output', 'answer', 'jar']:
             if not os.path.isdir(dir_name):
                 os.mkdir(dir_name)
@@ -58,7 +97,7 @@ class Tester:
         if not os.path.isdir('output'): print("Error: output directory not found."); return False
         if not os.path.isdir('answer'): print("Error: answer directory not found."); return False
         if not os.path.isdir('jar'): print("Error: jar directory not found."); return False
-        if not os.path.isfile('std.jar'): print("Error: std.jar not found."); return False
+        if not self.use_oracle and not os.path.isfile('std.jar'): print("Error: std.jar not found."); return False
         return True
 
     def get_jar_list(self):
@@ -79,77 +118,59 @@ class Tester:
         for jar_filename in jar_list:
             self.overall_results[jar_filename] = {
                 self.ACCEPTED: 0, self.WRONG_ANSWER: 0,
-                self.RUNTIME_ERROR: 0, self.STD_JAR_ERROR: 0
+                self.RUNTIME_ERROR: 0, self.STD_JAR_ERROR: 0,
+                self.TIME_LIMIT_EXCEEDED: 0
             }
             self.jar_runtimes[jar_filename] = [] # Initialize list for this jar's runtimes
 
         
         failing_testcases_details: dict[str, dict[str, list[int]]] = {
-            jar_name: {"WA": [], "RE": [], "STD_FAIL": []} for jar_name in jar_list
+            jar_name: {"WA": [], "RE": [], "TLE": [], "STD_FAIL": []} for jar_name in jar_list
         }
 
 
-        for i in range(self.testcase_count):
-            current_testcase_num = i + 1
-            print(f"Testcase {current_testcase_num}:")
-            
-            generator.reset_internal_state_and_ops() 
+        if self.corpus_dir is not None:
+            # With the oracle, answers are keyed by oracle.py instead of std.jar
+            self.corpus = corpus.Corpus(self.corpus_dir, oracle.__file__ if self.use_oracle else 'std.jar')
+            print(f"Using the corpus in {self.corpus_dir}: stored inputs and std.jar answers are reused.")
 
-            remaining_instructions = self.instruction_count
-            has_ln_in_testcase = False 
+        print(f"Running with {self.workers} worker(s), time limit {self.time_limit:.1f}s per run.")
+        if self.use_oracle:
+            print("Standard answers are generated by oracle.py instead of std.jar.")
 
-            if random.random() < self.probability_ln_is_first and self.instruction_count > 0 : 
-                print(f"  (Testcase {current_testcase_num} starts with Load Network)")
-                generator.add_operation_load_network() 
-                remaining_instructions -= 1
-                has_ln_in_testcase = True 
-            
-            if remaining_instructions < 0: remaining_instructions = 0
-            
-            if remaining_instructions > 0 :
-                 generator.add_operations_randomly(remaining_instructions) 
-            
-            instrs = generator.get_result() 
-            if not instrs and self.instruction_count > 0:
-                if not (self.instruction_count == 1 and has_ln_in_testcase):
-                    print(f"  Warning: No instructions generated for TC {current_testcase_num} (expected {self.instruction_count}, ln={has_ln_in_testcase}, rem={remaining_instructions}).")
-
-            input_file_name = f"test{current_testcase_num}.txt"
-            answer_file_name = f"test_ans{current_testcase_num}.txt"
-            input_file_path = os.path.join('input', input_file_name)
-            answer_file_path = os.path.join('answer', answer_file_name)
-
-            with open(input_file_path, 'w') as f:
-                for instr_line in instrs: 
-                    f.write(instr_line + '\n')
-
-            # Run std.jar (runtime not typically measured for std)
-            std_jar_cmd = f"java -jar std.jar < {input_file_path} > {answer_file_path}"
-            return_code_std = os.system(std_jar_cmd)
-
-            if return_code_std != 0:
-                print(f"  Error: std.jar runtime error (Code: {return_code_std}) in testcase {current_testcase_num}.")
+        # std.jar and every jar of a testcase run as separate jobs, several testcases at once;
+        # the results come back in testcase order and are judged here one testcase at a time.
+        for current_testcase_num, job_results in executor.run_cases(self.prepare_cases(generator, jar_list), self.workers):
+            print(f"Testcase {current_testcase_num}:")
+            for note in self.case_notes.pop(current_testcase_num, []):
+                print(note)
+            input_file_path, answer_file_path = self.case_paths(current_testcase_num)
+            std_result = job_results.get(executor.STD) # None: answer reused from the corpus
+            return_code_std = 0 if std_result is None else std_result.return_code
+
+            if std_result is not None and (std_result.timed_out or return_code_std != 0):
+                reason = "time limit exceeded" if std_result.timed_out else f"runtime error (Code: {return_code_std})"
+                print(f"  Error: std.jar {reason} in testcase {current_testcase_num}.")
                 for jar_filename in jar_list:
                     self.overall_results[jar_filename][self.STD_JAR_ERROR] += 1
                     failing_testcases_details[jar_filename]["STD_FAIL"].append(current_testcase_num)
                     self.jar_runtimes[jar_filename].append(-1.0) # Indicate std_jar failure, no valid runtime
+                if self.corpus is not None:
+                    self.corpus.discard_answer(current_testcase_num)
                 print("-" * 30)
                 continue 
+            if std_result is not None and self.corpus is not None:
+                self.corpus.store_answer(current_testcase_num)
 
             # Store results for current testcase to print them together
             # (jar_filename -> (status_code, runtime_seconds))
             testcase_jar_summary: dict[str, tuple[int, float]] = {}
+            divergences: dict[str, compare.Divergence] = {} # first differing line of each WA jar
 
             for jar_filename in jar_list:
-                output_filename_base = f"test{current_testcase_num}_{jar_filename}.txt"
-                output_file_path = os.path.join('output', output_filename_base)
-                jar_path = os.path.join('jar', jar_filename)
-                user_jar_cmd = f"java -jar {jar_path} < {input_file_path} > {output_file_path}"
-                
-                start_time = time.perf_counter() # More precise timer
-                return_code_user = os.system(user_jar_cmd)
-                end_time = time.perf_counter()
-                execution_time_seconds = end_time - start_time
+                output_file_path = os.path.join('output', f"test{current_testcase_num}_{jar_filename}.txt")
+                return_code_user = job_results[jar_filename].return_code
+                execution_time_seconds = job_results[jar_filename].seconds
                 
                 self.jar_runtimes[jar_filename].append(execution_time_seconds) # Store runtime
 
@@ -158,27 +179,26 @@ class Tester:
                 
                 current_status_for_jar = -1
 
-                if return_code_user != 0:
+                if job_results[jar_filename].timed_out:
+                    current_status_for_jar = self.TIME_LIMIT_EXCEEDED
+                    self.overall_results[jar_filename][self.TIME_LIMIT_EXCEEDED] += 1
+                    failing_testcases_details[jar_filename]["TLE"].append(current_testcase_num)
+                elif return_code_user != 0:
                     current_status_for_jar = self.RUNTIME_ERROR
                     self.overall_results[jar_filename][self.RUNTIME_ERROR] += 1
                     failing_testcases_details[jar_filename]["RE"].append(current_testcase_num)
                 else:
                     try:
-                        with open(output_file_path, 'r', encoding='utf-8', errors='ignore') as f_out:
-                            output_content = f_out.read()
-                        with open(answer_file_path, 'r', encoding='utf-8', errors='ignore') as f_ans:
-                            answer_content = f_ans.read()
-
-                        normalized_output = '\n'.join(line.rstrip() for line in output_content.splitlines()).strip()
-                        normalized_answer = '\n'.join(line.rstrip() for line in answer_content.splitlines()).strip()
+                        divergence = compare.compare_files(output_file_path, answer_file_path, input_file_path)
 
-                        if normalized_output == normalized_answer:
+                        if divergence is None:
                             current_status_for_jar = self.ACCEPTED
                             self.overall_results[jar_filename][self.ACCEPTED] += 1
                         else:
                             current_status_for_jar = self.WRONG_ANSWER
                             self.overall_results[jar_filename][self.WRONG_ANSWER] += 1
                             failing_testcases_details[jar_filename]["WA"].append(current_testcase_num)
+                            divergences[jar_filename] = divergence
                     except Exception as e: 
                         print(f"    Error during diff for {jar_filename} (TC {current_testcase_num}): {e}")
                         current_status_for_jar = self.RUNTIME_ERROR 
@@ -193,12 +213,75 @@ class Tester:
                 if result_status == self.ACCEPTED: status_message = "Accepted"
                 elif result_status == self.WRONG_ANSWER: status_message = "Wrong Answer"
                 elif result_status == self.RUNTIME_ERROR: status_message = "Runtime Error"
+                elif result_status == self.TIME_LIMIT_EXCEEDED: status_message = "Time Limit Exceeded"
                 else: status_message = f"Unknown Status ({result_status})" 
                 print(f"  {jar_file}: {status_message} (Runtime: {exec_time:.3f}s)")
+                if jar_file in divergences:
+                    print(divergences[jar_file].describe("    "))
             print("-" * 30)
         
         self.print_final_summary(failing_testcases_details)
 
+    def case_paths(self, testcase_num: int) -> tuple[str, str]:
+        """(input file, answer file) of a testcase, in the corpus when there is one."""
+        if self.corpus is not None:
+            return self.corpus.input_path(testcase_num), self.corpus.answer_path(testcase_num)
+        return os.path.join('input', f"test{testcase_num}.txt"), os.path.join('answer', f"test_ans{testcase_num}.txt")
+
+    def std_output_path(self, testcase_num: int) -> str:
+        """Where std.jar writes its answer (in the corpus it is moved to case_paths() once std.jar succeeded)."""
+        if self.corpus is not None:
+            return self.corpus.pending_answer_path(testcase_num)
+        return self.case_paths(testcase_num)[1]
+
+    def prepare_cases(self, generator: Generator, jar_list: list[str]):
+        """Generates the input of each testcase and yields (testcase number, jobs) for executor.run_cases."""
+        for i in range(self.testcase_count):
+            current_testcase_num = i + 1
+            
+            if self.corpus is None or not self.corpus.has_input(current_testcase_num, self.instruction_count):
+                if self.corpus is not None:
+                    random.seed(self.corpus.seed(current_testcase_num)) # Recorded in the corpus manifest
+                generator.reset_internal_state_and_ops() 
+
+                remaining_instructions = self.instruction_count
+                has_ln_in_testcase = False 
+
+                if random.random() < self.probability_ln_is_first and self.instruction_count > 0 : 
+                    self.case_notes.setdefault(current_testcase_num, []).append("  (starts with Load Network)")
+                    generator.add_operation_load_network() 
+                    remaining_instructions -= 1
+                    has_ln_in_testcase = True 
+            
+                if remaining_instructions < 0: remaining_instructions = 0
+            
+                if remaining_instructions > 0 :
+                     generator.add_operations_randomly(remaining_instructions) 
+            
+                instrs = generator.get_result() 
+                if not instrs and self.instruction_count > 0:
+                    if not (self.instruction_count == 1 and has_ln_in_testcase):
+                        self.case_notes.setdefault(current_testcase_num, []).append(f"  Warning: No instructions generated for TC {current_testcase_num} (expected {self.instruction_count}, ln={has_ln_in_testcase}, rem={remaining_instructions}).")
+
+                if self.corpus is not None:
+                    self.corpus.store_input(current_testcase_num, self.instruction_count, instrs)
+                else:
+                    with open(self.case_paths(current_testcase_num)[0], 'w') as f:
+                        for instr_line in instrs: 
+                            f.write(instr_line + '\n')
+
+            input_file_path = self.case_paths(current_testcase_num)[0]
+            jobs = []
+            if self.corpus is None or not self.corpus.has_answer(current_testcase_num):
+                std_command = oracle_command() if self.use_oracle else java_command('std.jar')
+                jobs.append(executor.Job(current_testcase_num, executor.STD, std_command, input_file_path,
+                                         self.std_output_path(current_testcase_num), self.time_limit))
+            for jar_filename in jar_list:
+                output_file_path = os.path.join('output', f"test{current_testcase_num}_{jar_filename}.txt")
+                jobs.append(executor.Job(current_testcase_num, jar_filename, java_command(os.path.join('jar', jar_filename)),
+                                         input_file_path, output_file_path, self.time_limit))
+            yield current_testcase_num, jobs
+
     def print_final_summary(self, failing_details: dict[str, dict[str, list[int]]]):
         print("\n" + "=" * 15 + " FINAL TEST SUMMARY " + "=" * 15)
         if not self.overall_results:
@@ -210,6 +293,7 @@ class Tester:
             ac_count = results.get(self.ACCEPTED, 0)
             wa_count = results.get(self.WRONG_ANSWER, 0)
             re_count = results.get(self.RUNTIME_ERROR, 0)
+            tle_count = results.get(self.TIME_LIMIT_EXCEEDED, 0)
             std_fail_count = results.get(self.STD_JAR_ERROR, 0)
             
             total_possible_judgements = self.testcase_count - std_fail_count
@@ -224,6 +308,10 @@ class Tester:
             if re_count > 0 and failing_details[jar_filename]['RE']:
                 print(f"    Failing Testcases (RE): {', '.join(map(str, sorted(list(set(failing_details[jar_filename]['RE'])))))}")
 
+            print(f"  Time Limit Exceeded (TLE): {tle_count}")
+            if tle_count > 0 and failing_details[jar_filename]['TLE']:
+                print(f"    Failing Testcases (TLE): {', '.join(map(str, sorted(list(set(failing_details[jar_filename]['TLE'])))))}")
+
             if std_fail_count > 0:
                 print(f"  Skipped (std.jar err):{std_fail_count}")
                 if failing_details[jar_filename]['STD_FAIL']:
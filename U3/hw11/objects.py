@@ -5,6 +5,9 @@ class Person:
     tag_list : list # Should be list[Tag]
     acquaintance_list : list # Should be list[Person]
     value_list : list[int] 
+    # Indexes over the lists above, which keep their order for the generator's random choices
+    _tags_by_id : dict # tag id -> Tag
+    _acquaintance_index : dict # Person -> index in acquaintance_list / value_list
 
     def __init__(self, id, name, age):
         self.id = id
@@ -13,6 +16,8 @@ class Person:
         self.tag_list = []
         self.acquaintance_list = []
         self.value_list = [] 
+        self._tags_by_id = {}
+        self._acquaintance_index = {}
 
     def __str__(self):
         tagIdList = [tag.id for tag in self.tag_list]
@@ -27,57 +32,52 @@ class Person:
         return hash(self.id)
 
     def add_tag(self, tag: 'Tag'): 
-        if not (tag in self.tag_list):
+        if not (tag.id in self._tags_by_id):
             self.tag_list.append(tag)
+            self._tags_by_id[tag.id] = tag
 
     def remove_tag(self, tag: 'Tag'): 
-        if (tag in self.tag_list):
+        if (tag.id in self._tags_by_id):
             self.tag_list.remove(tag) 
+            del self._tags_by_id[tag.id]
 
     def find_tag(self, id_to_find: int) -> 'Tag | None': 
-        for tag in self.tag_list:
-            if (tag.id == id_to_find):
-                return tag
-        return None
+        return self._tags_by_id.get(id_to_find)
 
     def add_acquaintance(self, person: 'Person', value: int): 
-        if not (person in self.acquaintance_list):
+        if not (person in self._acquaintance_index):
+            self._acquaintance_index[person] = len(self.acquaintance_list)
             self.acquaintance_list.append(person)
             self.value_list.append(value)
 
     def remove_acquaintance(self, person: 'Person'): 
-        if (person in self.acquaintance_list):
-            index = self.acquaintance_list.index(person)
+        index = self._acquaintance_index.pop(person, None)
+        if (index is not None):
             self.acquaintance_list.pop(index)
             self.value_list.pop(index)
+            for i in range(index, len(self.acquaintance_list)):
+                self._acquaintance_index[self.acquaintance_list[i]] = i
 
     def get_acquaintance_value(self, person: 'Person') -> int | None: 
-        if (person in self.acquaintance_list):
-            try:
-                index = self.acquaintance_list.index(person)
-                return self.value_list[index]
-            except ValueError: 
-                return None
-        else:
-            return None
+        index = self._acquaintance_index.get(person)
+        return None if index is None else self.value_list[index]
 
     def modify_acquaintance_value(self, person: 'Person', modify_value: int): 
-        if (person in self.acquaintance_list):
-            try:
-                index = self.acquaintance_list.index(person)
-                self.value_list[index] = modify_value
-            except ValueError: 
-                pass
+        index = self._acquaintance_index.get(person)
+        if (index is not None):
+            self.value_list[index] = modify_value
     
     def has_relation(self, person: 'Person') -> bool: 
-        return person in self.acquaintance_list
+        return person in self._acquaintance_index
 
 class Tag:
     id : int
     personList : list[Person]
+    _members : set # the persons of personList
     def __init__(self, id):
         self.id = id
         self.personList = []
+        self._members = set()
 
     def __str__(self):
         personIdList = [person.id for person in self.personList]
@@ -89,38 +89,42 @@ class Tag:
     def __hash__(self): 
         return hash(self.id)
     
+    def has_person(self, person: Person) -> bool:
+        return person in self._members
+
     def add_person(self, person: Person):
-        if not (person in self.personList):
+        if not (person in self._members):
             self.personList.append(person)
+            self._members.add(person)
 
     def remove_person(self, person: Person):
-        if (person in self.personList):
+        if (person in self._members):
             self.personList.remove(person)
+            self._members.discard(person)
 
 
 class Network:
     person_list : list[Person]
+    _person_index : dict # person id -> index in person_list
     def __init__(self):
         self.person_list = []
+        self._person_index = {}
 
     def __str__(self):
         return f"Network(person_list={[str(p) for p in self.person_list]})" 
 
     def add_person(self, person : Person):
-        if not (person in self.person_list): 
+        index = self._person_index.get(person.id)
+        if (index is None): 
+            self._person_index[person.id] = len(self.person_list)
             self.person_list.append(person)
         else: 
-            for i, p_existing in enumerate(self.person_list):
-                if p_existing.id == person.id:
-                    self.person_list[i] = person 
-                    break
+            self.person_list[index] = person 
 
 
     def find_person(self, id : int) -> Person | None:
-        for person in self.person_list:
-            if (person.id == id):
-                return person
-        return None
+        index = self._person_index.get(id)
+        return None if index is None else self.person_list[index]
 
     def add_relation(self, personId1 : int, personId2 : int, value : int):
         person1 = self.find_person(personId1)
@@ -175,6 +179,8 @@ class OfficialAccount:
     followerList : list[Person]
     followerContribution : list[int]
     articleList : list[int] 
+    _follower_index : dict # Person -> index in followerList / followerContribution
+    _articles : set # the ids of articleList
     def __init__(self, ownerId, id, name):
         self.ownerId = ownerId
         self.id = id
@@ -182,6 +188,8 @@ class OfficialAccount:
         self.followerList = []
         self.followerContribution = []
         self.articleList = []
+        self._follower_index = {}
+        self._articles = set()
 
     def __str__(self):
         followerIdList = [follower.id for follower in self.followerList]
@@ -203,41 +211,35 @@ class OfficialAccount:
         return self.ownerId
     
     def add_follower(self, person: Person, contribution: int): 
-        if not (person in self.followerList):
+        if not (person in self._follower_index):
+            self._follower_index[person] = len(self.followerList)
             self.followerList.append(person)
             self.followerContribution.append(contribution) 
     
     def contains_follower(self, person: Person):
-        return person in self.followerList
+        return person in self._follower_index
     
     def add_article(self, articleId: int):
-        if not (articleId in self.articleList):
+        if not (articleId in self._articles):
             self.articleList.append(articleId)
+            self._articles.add(articleId)
 
     def contains_article(self, articleId: int):
-        return articleId in self.articleList
+        return articleId in self._articles
     
     def remove_article(self, articleId: int):
-        if (articleId in self.articleList):
+        if (articleId in self._articles):
             self.articleList.remove(articleId)
+            self._articles.discard(articleId)
     
     def get_follower_contribution(self, person: Person) -> int | None:
-        if (person in self.followerList):
-            try:
-                index = self.followerList.index(person)
-                return self.followerContribution[index]
-            except ValueError:
-                return None
-        else:
-            return None
+        index = self._follower_index.get(person)
+        return None if index is None else self.followerContribution[index]
     
     def modify_follower_contribution(self, person: Person, modify_value: int):
-        if (person in self.followerList):
-            try:
-                index = self.followerList.index(person)
-                self.followerContribution[index] = modify_value
-            except ValueError:
-                pass
+        index = self._follower_index.get(person)
+        if (index is not None):
+            self.followerContribution[index] = modify_value
 
 
 class Message:
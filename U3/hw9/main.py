@@ -1,11 +1,35 @@
 import os
-import time
+import random
 import sys # For flushing output
+from typing import Optional
+
+import cds
+import compare
+import corpus
+import executor
+import oracle
 
 from generator import Generator
 
 TESTNUM = 10         # 测试组数
 INSTR = 1000        # 每组测试的指令数
+USE_CDS = False     # 为每个 jar 构建 AppCDS 归档以减少 JVM 启动时间（需要 JDK 13+）
+WORKERS = executor.WORKERS  # 同时运行的 java 进程数（多组测试的 std.jar 与待测 jar 并行）
+MS_PER_INSTRUCTION = 1.0    # 每条指令的时间限制（毫秒）
+TIME_LIMIT_BASE = 3.0       # 每次运行额外给出的时间（秒），用于 JVM 启动
+CORPUS_DIR = None           # 例如 "corpus"：跨多次运行复用带种子的输入和 std.jar 答案（见 corpus.py）
+USE_ORACLE = False          # 用 oracle.py（Python 参考实现）代替 std.jar 生成标准答案，此时不需要 std.jar
+
+
+def java_command(jar_path: str) -> str:
+    """Command prefix that starts jar_path, with its AppCDS archive when USE_CDS is set (see cds.py)."""
+    return cds.java_command_line(jar_path) if USE_CDS else f"java -jar \"{jar_path}\""
+
+
+def oracle_command() -> str:
+    """Command that runs oracle.py like std.jar: instructions on stdin, answer on stdout."""
+    return f"\"{sys.executable}\" \"{os.path.abspath(oracle.__file__)}\""
+
 
 class Tester:
     testcase_count: int
@@ -15,18 +39,26 @@ class Tester:
     ACCEPTED_STR = "Accepted"
     WRONG_ANSWER_STR = "Wrong Answer"
     RUNTIME_ERROR_STR = "Runtime Error"
+    TIME_LIMIT_EXCEEDED_STR = "Time Limit Exceeded"
     UNKNOWN_ERROR_STR = "Unknown Error" # For unexpected OS return codes
 
     # Map return codes to strings
     RESULT_MAP = {
         0: ACCEPTED_STR,
         1: WRONG_ANSWER_STR,
-        2: RUNTIME_ERROR_STR
+        2: RUNTIME_ERROR_STR,
+        3: TIME_LIMIT_EXCEEDED_STR
     }
 
-    def __init__(self, testcase_count: int, instruction_count: int):
+    def __init__(self, testcase_count: int, instruction_count: int, workers: int = WORKERS,
+                 corpus_dir: Optional[str] = CORPUS_DIR, use_oracle: bool = USE_ORACLE):
         self.testcase_count = testcase_count
         self.instruction_count = instruction_count
+        self.workers = workers
+        self.corpus_dir = corpus_dir
+        self.use_oracle = use_oracle
+        self.corpus = None # Opened in run(), once std.jar is known to exist
+        self.time_limit = executor.time_limit(instruction_count, MS_PER_INSTRUCTION, TIME_LIMIT_BASE)
         # Create directories if they don't exist
         os.makedirs('input', exist_ok=True)
         os.makedirs('output', exist_ok=True)
@@ -36,7 +68,7 @@ class Tester:
 
     def check_dependencies(self) -> bool:
         # Directories are created in __init__, so just check for std.jar
-        if not os.path.isfile('std.jar'):
+        if not self.use_oracle and not os.path.isfile('std.jar'):
             print("Error: std.jar not found. (std.jar should be in the main directory)")
             return False
         # Check if jar directory is empty
@@ -57,54 +89,48 @@ class Tester:
 
         generator = Generator()
         jar_list = self.get_jar_list()
-        results_summary = {jar: {self.ACCEPTED_STR: 0, self.WRONG_ANSWER_STR: 0, self.RUNTIME_ERROR_STR: 0, self.UNKNOWN_ERROR_STR: 0} for jar in jar_list}
+        results_summary = {jar: {self.ACCEPTED_STR: 0, self.WRONG_ANSWER_STR: 0, self.RUNTIME_ERROR_STR: 0, self.TIME_LIMIT_EXCEEDED_STR: 0, self.UNKNOWN_ERROR_STR: 0} for jar in jar_list}
 
 
-        print(f"Starting tests for {len(jar_list)} jar file(s)...")
+        if self.corpus_dir is not None:
+            # With the oracle, answers are keyed by oracle.py instead of std.jar
+            self.corpus = corpus.Corpus(self.corpus_dir, oracle.__file__ if self.use_oracle else 'std.jar')
+            print(f"Using the corpus in {self.corpus_dir}: stored inputs and std.jar answers are reused.")
 
-        for i in range(self.testcase_count):
-            test_num = i + 1
+        print(f"Starting tests for {len(jar_list)} jar file(s) with {self.workers} worker(s), "
+              f"time limit {self.time_limit:.1f}s per run...")
+        if self.use_oracle:
+            print("Standard answers are generated by oracle.py instead of std.jar.")
+
+        # std.jar and every student jar of a testcase run as separate jobs, several testcases at once;
+        # the results come back in testcase order and are judged here one testcase at a time.
+        for test_num, job_results in executor.run_cases(self.prepare_cases(generator, jar_list), self.workers):
             print(f"\n--- Testcase {test_num}/{self.testcase_count} ---")
-            sys.stdout.flush() # Ensure header prints immediately
-
-            generator.reset()
-            # Consider adding a small number of initial people/relations?
-            # generator.add_operations(10) # Example pre-population
-            generator.add_operations(self.instruction_count)
-
-            input_filename = f"test{test_num}.txt"
-            answer_filename = f"test_ans{test_num}.txt"
-            input_filepath = os.path.join('input', input_filename)
-            answer_filepath = os.path.join('answer', answer_filename)
-
-            # Generate input file
-            instrs = generator.get_result()
-            try:
-                with open(input_filepath, 'w') as f:
-                    for instr in instrs:
-                        f.write(instr + '\n')
-            except IOError as e:
-                print(f"Error writing input file {input_filepath}: {e}")
-                continue # Skip to next test case
-
-            # Generate standard answer
-            print(f"  Generating standard answer for {input_filename}...")
-            sys.stdout.flush()
-            std_command = f"java -jar std.jar < \"{input_filepath}\" > \"{answer_filepath}\""
-            # print(f"  Running: {std_command}") # Debug command
-            std_return_code = os.system(std_command)
-
-            if std_return_code != 0:
-                print(f"  Error: std.jar runtime error (code {std_return_code}) on {input_filename}. Skipping comparison for this case.")
-                # Clean up potentially partial answer file?
-                if os.path.exists(answer_filepath):
-                     try:
-                         os.remove(answer_filepath)
-                     except OSError:
-                         pass
-                continue # Skip comparison for this test case
-
-            print(f"  Standard answer generated: {answer_filename}")
+            input_filepath, answer_filepath = self.case_paths(test_num)
+            input_filename = os.path.basename(input_filepath)
+            answer_filename = os.path.basename(answer_filepath)
+
+            if executor.STD not in job_results:
+                print(f"  Standard answer reused from the corpus: {answer_filename}")
+            else:
+                std_return_code = job_results[executor.STD].return_code
+
+                if job_results[executor.STD].timed_out or std_return_code != 0:
+                    if job_results[executor.STD].timed_out:
+                        print(f"  Error: std.jar exceeded the time limit on {input_filename}. Skipping comparison for this case.")
+                    else:
+                        print(f"  Error: std.jar runtime error (code {std_return_code}) on {input_filename}. Skipping comparison for this case.")
+                    # Clean up potentially partial answer file
+                    if os.path.exists(self.std_output_path(test_num)):
+                         try:
+                             os.remove(self.std_output_path(test_num))
+                         except OSError:
+                             pass
+                    continue # Skip comparison for this test case
+                if self.corpus is not None:
+                    self.corpus.store_answer(test_num)
+
+                print(f"  Standard answer generated: {answer_filename}")
             sys.stdout.flush()
 
             # Test each student jar
@@ -114,37 +140,30 @@ class Tester:
 
             testcase_results = {}
             for jar_filename in jar_list:
-                output_filename = f"test{test_num}_{jar_filename}.txt"
-                output_filepath = os.path.join('output', output_filename)
-                jar_filepath = os.path.join('jar', jar_filename)
+                output_filepath = os.path.join('output', f"test{test_num}_{jar_filename}.txt")
 
                 print(f"  Testing {jar_filename}...")
-                sys.stdout.flush()
-
-                # Run student jar
-                run_command = f"java -jar \"{jar_filepath}\" < \"{input_filepath}\" > \"{output_filepath}\""
-                # print(f"    Running: {run_command}") # Debug command
-                start_time = time.time()
-                return_code = os.system(run_command)
-                end_time = time.time()
-                exec_time = end_time - start_time
+                return_code = job_results[jar_filename].return_code
+                exec_time = job_results[jar_filename].seconds
                 print(f"    Finished in {exec_time:.2f}s (Return Code: {return_code})")
                 sys.stdout.flush()
 
 
                 # Judge the result
                 result_code = self.UNKNOWN_ERROR_STR # Default to unknown
-                if return_code != 0:
+                if job_results[jar_filename].timed_out:
+                    result_code = self.TIME_LIMIT_EXCEEDED_STR
+                    print(f"    Result: {result_code} (limit {self.time_limit:.1f}s)")
+                    sys.stdout.flush()
+                elif return_code != 0:
                     result_code = self.RUNTIME_ERROR_STR
                     print(f"    Result: {result_code}")
                     sys.stdout.flush()
                 else:
-                    # Compare output with standard answer
+                    # Compare output with standard answer line by line (trailing whitespace ignored)
                     try:
-                        with open(output_filepath, 'r') as f_out, open(answer_filepath, 'r') as f_ans:
-                            output_content = f_out.read()
-                            answer_content = f_ans.read()
-                        if output_content == answer_content:
+                        divergence = compare.compare_files(output_filepath, answer_filepath, input_filepath)
+                        if divergence is None:
                             result_code = self.ACCEPTED_STR
                             print(f"    Result: {result_code}")
                             sys.stdout.flush()
@@ -153,9 +172,8 @@ class Tester:
                         else:
                             result_code = self.WRONG_ANSWER_STR
                             print(f"    Result: {result_code} (Output differs from {answer_filename})")
+                            print(divergence.describe("      "))
                             sys.stdout.flush()
-                            # Consider adding diff command here if needed
-                            # os.system(f"diff \"{answer_filepath}\" \"{output_filepath}\"")
 
                     except IOError as e:
                         print(f"    Error comparing files for {jar_filename}: {e}")
@@ -184,6 +202,54 @@ class Tester:
             print(f"  -------------------")
         print("===============================")
 
+    def case_paths(self, test_num: int):
+        """(input file, answer file) of a testcase, in the corpus when there is one."""
+        if self.corpus is not None:
+            return self.corpus.input_path(test_num), self.corpus.answer_path(test_num)
+        return os.path.join('input', f"test{test_num}.txt"), os.path.join('answer', f"test_ans{test_num}.txt")
+
+    def std_output_path(self, test_num: int) -> str:
+        """Where std.jar writes its answer (in the corpus it is moved to case_paths() once std.jar succeeded)."""
+        if self.corpus is not None:
+            return self.corpus.pending_answer_path(test_num)
+        return self.case_paths(test_num)[1]
+
+    def prepare_cases(self, generator, jar_list):
+        """Generates the input of each testcase and yields (test_num, jobs) for executor.run_cases."""
+        for i in range(self.testcase_count):
+            test_num = i + 1
+
+            if self.corpus is None or not self.corpus.has_input(test_num, self.instruction_count):
+                if self.corpus is not None:
+                    random.seed(self.corpus.seed(test_num)) # Recorded in the corpus manifest
+                generator.reset()
+                generator.add_operations(self.instruction_count)
+
+                # Generate input file
+                instrs = generator.get_result()
+                try:
+                    if self.corpus is not None:
+                        self.corpus.store_input(test_num, self.instruction_count, instrs)
+                    else:
+                        with open(self.case_paths(test_num)[0], 'w') as f:
+                            for instr in instrs:
+                                f.write(instr + '\n')
+                except IOError as e:
+                    print(f"Error writing input file of testcase {test_num}: {e}")
+                    continue # Skip to next test case
+
+            input_filepath, answer_filepath = self.case_paths(test_num)
+            jobs = []
+            if self.corpus is None or not self.corpus.has_answer(test_num):
+                std_command = oracle_command() if self.use_oracle else java_command('std.jar')
+                jobs.append(executor.Job(test_num, executor.STD, std_command, input_filepath,
+                                         self.std_output_path(test_num), self.time_limit))
+            for jar_filename in jar_list:
+                output_filepath = os.path.join('output', f"test{test_num}_{jar_filename}.txt")
+                jobs.append(executor.Job(test_num, jar_filename, java_command(os.path.join('jar', jar_filename)),
+                                         input_filepath, output_filepath, self.time_limit))
+            yield test_num, jobs
+
 
 if __name__ == '__main__':
     # Example usage: Run 10 testcases with 1000 instructions each
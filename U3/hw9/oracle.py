@@ -0,0 +1,371 @@
+# oracle.py
+"""
+In-process reference implementation of the hw9 network, used instead of
+std.jar when main.USE_ORACLE is set.
+
+run() reads an input and yields the line std.jar prints for each instruction:
+"Ok" for ap/ar/mr/at/dt/att/dft/ln, the value of a query, or the message of the
+exception the JML specifies, with the same global and per-id counters.
+Queries do not scan the network:
+- qci: union-find over the relations, rebuilt on the next qci after mr removed one
+- qts: triangle count, updated when a relation is added or removed
+- qtav: member count, age sum and age square sum of every tag
+- qba: a max-heap of (value, id) per person; stale entries are dropped when queried
+
+`python oracle.py < input > answer` runs it like `java -jar std.jar`.
+"""
+import heapq
+import sys
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+LOAD_NETWORK = ("ln", "load_network")
+TAG_CAPACITY = 1000  # att only adds a person to a tag with fewer members
+
+
+class NetworkError(Exception):
+    """A JML exceptional behavior; str() is the line std.jar prints."""
+
+
+class ExceptionCounter:
+    """The static counters of one exception class: total count and count per id."""
+    name: str
+    count: int
+    by_id: Dict[int, int]
+
+    def __init__(self, name: str):
+        self.name = name
+        self.count = 0
+        self.by_id = {}
+
+    def _bump(self, id: int) -> int:
+        self.by_id[id] = self.by_id.get(id, 0) + 1
+        return self.by_id[id]
+
+    def one(self, id: int) -> NetworkError:
+        self.count += 1
+        times = self._bump(id)
+        return NetworkError(f"{self.name}-{self.count}, {id}-{times}")
+
+    def two(self, id1: int, id2: int) -> NetworkError:
+        """Two-id exceptions print the smaller id first and count an id only once when both are equal."""
+        if id1 > id2:
+            id1, id2 = id2, id1
+        self.count += 1
+        self._bump(id1)
+        if id1 != id2:
+            self._bump(id2)
+        return NetworkError(f"{self.name}-{self.count}, {id1}-{self.by_id[id1]}, {id2}-{self.by_id[id2]}")
+
+
+class Tag:
+    id: int
+    members: Set[int]
+    age_sum: int
+    age_square_sum: int
+
+    def __init__(self, id: int):
+        self.id = id
+        self.members = set()
+        self.age_sum = 0
+        self.age_square_sum = 0
+
+    def add(self, person: "Person"):
+        self.members.add(person.id)
+        self.age_sum += person.age
+        self.age_square_sum += person.age * person.age
+
+    def remove(self, person: "Person"):
+        self.members.discard(person.id)
+        self.age_sum -= person.age
+        self.age_square_sum -= person.age * person.age
+
+    def age_var(self) -> int:
+        """Integer Σ(age - mean)² / n with the integer mean, as Tag.getAgeVar computes it."""
+        n = len(self.members)
+        if n == 0:
+            return 0
+        mean = self.age_sum // n
+        return (self.age_square_sum - 2 * mean * self.age_sum + n * mean * mean) // n
+
+
+class Person:
+    id: int
+    name: str
+    age: int
+    values: Dict[int, int]  # acquaintance id -> value
+    tags: Dict[int, Tag]
+    member_of: Dict[int, Set[int]]  # owner id -> ids of the owner's tags this person is in
+    best: List[Tuple[int, int]]  # heap of (-value, acquaintance id), possibly stale
+
+    def __init__(self, id: int, name: str, age: int):
+        self.id = id
+        self.name = name
+        self.age = age
+        self.values = {}
+        self.tags = {}
+        self.member_of = {}
+        self.best = []
+
+    def set_value(self, other: int, value: int):
+        self.values[other] = value
+        heapq.heappush(self.best, (-value, other))
+
+    def best_acquaintance(self) -> int:
+        best = self.best
+        while best:
+            value, other = best[0]
+            if self.values.get(other) == -value:
+                return other
+            heapq.heappop(best)
+        raise AssertionError("best_acquaintance of a person without acquaintances")
+
+
+class Network:
+    persons: Dict[int, Person]
+    triple_sum: int
+
+    def __init__(self):
+        self.persons = {}
+        self.triple_sum = 0
+        self._parent: Dict[int, int] = {}
+        self._parent_stale = False
+        self.epi = ExceptionCounter("epi")
+        self.pinf = ExceptionCounter("pinf")
+        self.er = ExceptionCounter("er")
+        self.rnf = ExceptionCounter("rnf")
+        self.eti = ExceptionCounter("eti")
+        self.tinf = ExceptionCounter("tinf")
+        self.anf = ExceptionCounter("anf")
+
+    # --- union-find for qci ---
+
+    def _find(self, id: int) -> int:
+        parent = self._parent
+        while parent[id] != id:
+            parent[id] = parent[parent[id]]
+            id = parent[id]
+        return id
+
+    def _union(self, id1: int, id2: int):
+        root1, root2 = self._find(id1), self._find(id2)
+        if root1 != root2:
+            self._parent[root1] = root2
+
+    def _rebuild_parents(self):
+        self._parent = {id: id for id in self.persons}
+        for person in self.persons.values():
+            for other in person.values:
+                if other > person.id:
+                    self._union(person.id, other)
+        self._parent_stale = False
+
+    # --- lookups raising the JML exceptions ---
+
+    def _person(self, id: int) -> Person:
+        person = self.persons.get(id)
+        if person is None:
+            raise self.pinf.one(id)
+        return person
+
+    def _linked(self, person1: Person, person2: Person) -> bool:
+        return person1 is person2 or person2.id in person1.values
+
+    # --- relations ---
+
+    def _link(self, person1: Person, person2: Person, value: int):
+        small, large = sorted((person1.values, person2.values), key=len)
+        self.triple_sum += sum(1 for other in small if other in large)
+        person1.set_value(person2.id, value)
+        person2.set_value(person1.id, value)
+        if not self._parent_stale:
+            self._union(person1.id, person2.id)
+
+    def _unlink(self, person1: Person, person2: Person):
+        del person1.values[person2.id]
+        del person2.values[person1.id]
+        small, large = sorted((person1.values, person2.values), key=len)
+        self.triple_sum -= sum(1 for other in small if other in large)
+        self._parent_stale = True
+        for owner, member in ((person1, person2), (person2, person1)):
+            for tag_id in member.member_of.pop(owner.id, ()):
+                owner.tags[tag_id].remove(member)
+
+    def add_person(self, id: int, name: str, age: int):
+        if id in self.persons:
+            raise self.epi.one(id)
+        self.persons[id] = Person(id, name, age)
+        self._parent[id] = id
+
+    def add_relation(self, id1: int, id2: int, value: int):
+        person1, person2 = self._person(id1), self._person(id2)
+        if self._linked(person1, person2):
+            raise self.er.two(id1, id2)
+        self._link(person1, person2, value)
+
+    def modify_relation(self, id1: int, id2: int, value: int):
+        person1, person2 = self._person(id1), self._person(id2)
+        if id1 == id2:
+            raise self.epi.one(id1)
+        if id2 not in person1.values:
+            raise self.rnf.two(id1, id2)
+        new_value = person1.values[id2] + value
+        if new_value > 0:
+            person1.set_value(id2, new_value)
+            person2.set_value(id1, new_value)
+        else:
+            self._unlink(person1, person2)
+
+    def query_value(self, id1: int, id2: int) -> int:
+        person1, person2 = self._person(id1), self._person(id2)
+        if not self._linked(person1, person2):
+            raise self.rnf.two(id1, id2)
+        return person1.values.get(id2, 0)
+
+    def is_circle(self, id1: int, id2: int) -> bool:
+        self._person(id1)
+        self._person(id2)
+        if self._parent_stale:
+            self._rebuild_parents()
+        return self._find(id1) == self._find(id2)
+
+    def query_triple_sum(self) -> int:
+        return self.triple_sum
+
+    # --- tags ---
+
+    def add_tag(self, person_id: int, tag_id: int):
+        person = self._person(person_id)
+        if tag_id in person.tags:
+            raise self.eti.one(tag_id)
+        person.tags[tag_id] = Tag(tag_id)
+
+    def del_tag(self, person_id: int, tag_id: int):
+        person = self._person(person_id)
+        tag = person.tags.pop(tag_id, None)
+        if tag is None:
+            raise self.tinf.one(tag_id)
+        for member_id in tag.members:
+            owned = self.persons[member_id].member_of[person_id]
+            owned.discard(tag_id)
+            if not owned:
+                del self.persons[member_id].member_of[person_id]
+
+    def add_person_to_tag(self, id1: int, id2: int, tag_id: int):
+        person1, person2 = self._person(id1), self._person(id2)
+        if id1 == id2:
+            raise self.epi.one(id1)
+        if id1 not in person2.values:
+            raise self.rnf.two(id1, id2)
+        tag = person2.tags.get(tag_id)
+        if tag is None:
+            raise self.tinf.one(tag_id)
+        if id1 in tag.members:
+            raise self.epi.one(id1)
+        if len(tag.members) < TAG_CAPACITY:
+            tag.add(person1)
+            person1.member_of.setdefault(id2, set()).add(tag_id)
+
+    def del_person_from_tag(self, id1: int, id2: int, tag_id: int):
+        person1, person2 = self._person(id1), self._person(id2)
+        tag = person2.tags.get(tag_id)
+        if tag is None:
+            raise self.tinf.one(tag_id)
+        if id1 not in tag.members:
+            raise self.pinf.one(id1)
+        tag.remove(person1)
+        owned = person1.member_of[id2]
+        owned.discard(tag_id)
+        if not owned:
+            del person1.member_of[id2]
+
+    def query_tag_age_var(self, person_id: int, tag_id: int) -> int:
+        tag = self._person(person_id).tags.get(tag_id)
+        if tag is None:
+            raise self.tinf.one(tag_id)
+        return tag.age_var()
+
+    def query_best_acquaintance(self, id: int) -> int:
+        person = self._person(id)
+        if not person.values:
+            raise self.anf.one(id)
+        return person.best_acquaintance()
+
+    def load_network(self, ids: List[int], names: List[str], ages: List[int], rows: List[List[int]]):
+        """`ln`: adds the persons, then row i gives the values between person i+1 and persons 0..i (0: no relation)."""
+        for id, name, age in zip(ids, names, ages):
+            self.add_person(id, name, age)
+        for i, row in enumerate(rows):
+            for j, value in enumerate(row):
+                if value != 0:
+                    self.add_relation(ids[i + 1], ids[j], value)
+
+
+# command -> (Network method name, argument parsers)
+COMMANDS = {
+    "ap": ("add_person", (int, str, int)),
+    "ar": ("add_relation", (int, int, int)),
+    "mr": ("modify_relation", (int, int, int)),
+    "at": ("add_tag", (int, int)),
+    "dt": ("del_tag", (int, int)),
+    "att": ("add_person_to_tag", (int, int, int)),
+    "dft": ("del_person_from_tag", (int, int, int)),
+    "qv": ("query_value", (int, int)),
+    "qci": ("is_circle", (int, int)),
+    "qts": ("query_triple_sum", ()),
+    "qtav": ("query_tag_age_var", (int, int)),
+    "qba": ("query_best_acquaintance", (int,)),
+}
+
+
+def _format(result) -> str:
+    if result is None:
+        return "Ok"
+    if isinstance(result, bool):
+        return "true" if result else "false"
+    return str(result)
+
+
+def _read_load_network(person_count: int, lines: Iterator[str]):
+    """The ids, names, ages and relation rows that follow `ln person_count`."""
+    if person_count <= 0:
+        return [], [], [], []
+    ids = [int(x) for x in next(lines, "").split()]
+    names = next(lines, "").split()
+    ages = [int(x) for x in next(lines, "").split()]
+    rows = [[int(x) for x in next(lines, "").split()] for _ in range(person_count - 1)]
+    return ids, names, ages, rows
+
+
+def run(lines: Iterable[str], network: Optional[Network] = None) -> Iterator[str]:
+    """The output line of each instruction in `lines`."""
+    network = Network() if network is None else network
+    lines = iter(lines)
+    for line in lines:
+        parts = line.split()
+        if not parts:
+            continue
+        command = parts[0]
+        try:
+            if command in LOAD_NETWORK:
+                network.load_network(*_read_load_network(int(parts[1]), lines))
+                result = None
+            else:
+                method, parsers = COMMANDS[command]
+                args = [parse(arg) for parse, arg in zip(parsers, parts[1:])]
+                result = getattr(network, method)(*args)
+        except NetworkError as e:
+            yield str(e)
+        else:
+            yield _format(result)
+
+
+def answer_file(input_path: str, output_path: str):
+    with open(input_path, 'r', encoding='utf-8') as f, open(output_path, 'w', encoding='utf-8') as out:
+        for line in run(f):
+            out.write(line + '\n')
+
+
+if __name__ == '__main__':
+    out = sys.stdout
+    for output_line in run(sys.stdin):
+        out.write(output_line + '\n')
@@ -0,0 +1,165 @@
+# run.py
+"""
+Benchmark suite for the checker, generator and runner stages (no JVM needed).
+
+    python bench/run.py                      # all workloads, compare with bench/baseline.json
+    python bench/run.py --quick              # smallest size of every workload only
+    python bench/run.py --full               # also the largest sizes (1M lines, 30k hw10 / 100k hw11 instructions)
+    python bench/run.py --only hw7.          # workloads whose name starts with "hw7."
+    python bench/run.py --save-baseline      # store this run as the new baseline
+
+Each (workload, size) is timed at least REPEAT times and for at least
+MIN_TIMED_SECONDS, so millisecond-sized runs are repeated enough to be stable
+(best run counts), and then run once more under tracemalloc for the peak traced
+memory. Results are written as JSON (bench/results.json). A result counts as a
+regression when its ops/s drops, or its peak memory grows, by more than
+--threshold relative to the baseline; the exit code is 1 if there is any
+regression. Sizes whose baseline run took less than MIN_COMPARED_SECONDS are
+too noisy for the ops/s check and only have their memory compared; the larger
+sizes of the same workload still cover them. Baselines are machine-specific:
+save one on the machine you compare on.
+"""
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+from typing import Dict, List, Optional
+
+import workloads
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_RESULTS = os.path.join(BENCH_DIR, "results.json")
+DEFAULT_BASELINE = os.path.join(BENCH_DIR, "baseline.json")
+REPEAT = 3
+MIN_TIMED_SECONDS = 0.2  # keep repeating short runs until one size has used this much time (as timeit.autorange)
+MAX_TIMED_SECONDS = 10.0  # stop repeating once one size has used this much time
+MIN_COMPARED_SECONDS = 0.05  # sizes with a faster baseline run are not compared for ops/s
+THRESHOLD = 0.25
+
+
+def result_key(name: str, size: int) -> str:
+    return f"{name}[{size}]"
+
+
+def measure(workload: workloads.Workload, size: int, repeat: int, memory: bool) -> Dict:
+    best = None
+    ops = 0
+    spent = 0.0
+    runs = 0
+    state = workload.setup(size)
+    while runs < repeat or spent < MIN_TIMED_SECONDS:
+        start = time.perf_counter()
+        ops = workload.run(state)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+        spent += elapsed
+        runs += 1
+        if spent > MAX_TIMED_SECONDS:
+            break
+    result = {"unit": workload.unit, "ops": ops, "seconds": best, "ops_per_sec": ops / best if best > 0 else None}
+    if memory:
+        tracemalloc.start()
+        workload.run(state)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        result["peak_bytes"] = peak
+    return result
+
+
+def compare(results: Dict[str, Dict], baseline: Dict[str, Dict], threshold: float) -> List[str]:
+    """Returns one line per regressed metric."""
+    regressions = []
+    for key, result in results.items():
+        base = baseline.get(key)
+        if base is None:
+            continue
+        long_enough = (base.get("seconds") or 0) >= MIN_COMPARED_SECONDS
+        if long_enough and base.get("ops_per_sec") and result.get("ops_per_sec") is not None:
+            change = result["ops_per_sec"] / base["ops_per_sec"] - 1
+            if change < -threshold:
+                regressions.append(f"{key}: {result['ops_per_sec']:.0f} {result['unit']}/s vs "
+                                   f"{base['ops_per_sec']:.0f} baseline ({change:+.0%})")
+        if base.get("peak_bytes") and result.get("peak_bytes") is not None:
+            change = result["peak_bytes"] / base["peak_bytes"] - 1
+            if change > threshold:
+                regressions.append(f"{key}: peak {result['peak_bytes']} B vs {base['peak_bytes']} B baseline ({change:+.0%})")
+    return regressions
+
+
+def git_revision() -> Optional[str]:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=BENCH_DIR, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the fixed-seed benchmark suite.")
+    parser.add_argument("--only", default="", help="Run only workloads whose name starts with this prefix.")
+    parser.add_argument("--quick", action="store_true", help="Run only the smallest size of every workload.")
+    parser.add_argument("--full", action="store_true", help="Also run the largest sizes (several minutes more).")
+    parser.add_argument("--repeat", type=int, default=REPEAT, help="Minimum timed runs per size (best counts).")
+    parser.add_argument("--no-memory", action="store_true", help="Skip the tracemalloc run.")
+    parser.add_argument("--output", default=DEFAULT_RESULTS, help="Where to write the JSON results.")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE, help="Baseline JSON to compare with.")
+    parser.add_argument("--threshold", type=float, default=THRESHOLD,
+                        help="Relative ops/s drop or peak memory growth that counts as a regression.")
+    parser.add_argument("--save-baseline", action="store_true", help="Also write the results to --baseline.")
+    args = parser.parse_args()
+
+    results: Dict[str, Dict] = {}
+    started = time.perf_counter()
+    for workload in workloads.WORKLOADS:
+        if not workload.name.startswith(args.only):
+            continue
+        sizes = workload.sizes[:1] if args.quick else workload.sizes + (workload.fullSizes if args.full else ())
+        for size in sizes:
+            key = result_key(workload.name, size)
+            result = measure(workload, size, args.repeat, not args.no_memory)
+            results[key] = result
+            memory = f", peak {result['peak_bytes'] / 2 ** 20:.2f} MiB" if "peak_bytes" in result else ""
+            print(f"{key:<34} {result['ops_per_sec']:>12.0f} {workload.unit}/s  ({result['seconds']:.3f} s{memory})",
+                  flush=True)
+
+    report = {
+        "meta": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "revision": git_revision(),
+            "date": time.strftime("%Y-%m-%d %H:%M:%S"),
+            "seed": workloads.SEED,
+            "wall_seconds": time.perf_counter() - started,
+        },
+        "results": results,
+    }
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print(f"Results written to {args.output} ({report['meta']['wall_seconds']:.0f} s).")
+
+    if args.save_baseline:
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"Baseline saved to {args.baseline}.")
+        return 0
+    if not os.path.isfile(args.baseline):
+        print(f"No baseline at {args.baseline}; run with --save-baseline to create one.")
+        return 0
+    with open(args.baseline, "r", encoding="utf-8") as f:
+        baseline = json.load(f)
+    regressions = compare(results, baseline["results"], args.threshold)
+    if regressions:
+        print(f"Regressions against {args.baseline} (threshold {args.threshold:.0%}):")
+        for line in regressions:
+            print(f"  {line}")
+        return 1
+    print(f"No regressions against {args.baseline} (threshold {args.threshold:.0%}).")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,277 @@
+# workloads.py
+"""
+Fixed-seed synthetic workloads for bench/run.py.
+
+Every workload is set up once outside the timed region (setup; run must not
+mutate that state) and returns the number of operations it performed (run), so
+results are comparable as ops/s.
+Nothing here needs a JVM: the U2 checker is fed logs from a small elevator
+simulator that only produces valid output, and the U4 LibraryState is driven
+by a reference "library" that accepts every request its own pre-checks allow.
+"""
+import contextlib
+import datetime
+import functools
+import heapq
+import importlib
+import io
+import os
+import random
+import sys
+from typing import Callable, Dict, List, Tuple
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SEED = 20250401
+
+HW7_DIR = os.path.join("U2", "hw7", "高并发+GUI")
+
+_currentDir = None
+_repoModules: List[str] = []
+
+
+def import_from(rel_dir: str, name: str):
+    """
+    Imports module `name` from a repo directory. The homework directories reuse
+    module names (generator, operation, objects, ...), so modules loaded from a
+    different directory are dropped from sys.modules first.
+    """
+    global _currentDir
+    directory = os.path.join(REPO_ROOT, rel_dir)
+    if _currentDir != directory:
+        for module_name in _repoModules:
+            sys.modules.pop(module_name, None)
+        _repoModules.clear()
+        if _currentDir in sys.path:
+            sys.path.remove(_currentDir)
+        sys.path.insert(0, directory)
+        _currentDir = directory
+    module = importlib.import_module(name)
+    for module_name, loaded in list(sys.modules.items()):
+        path = getattr(loaded, "__file__", None) or ""
+        if os.path.abspath(path).startswith(directory + os.sep) and module_name not in _repoModules:
+            _repoModules.append(module_name)
+    return module
+
+
+class Workload:
+    name: str
+    directory: str
+    unit: str
+    sizes: Tuple[int, ...]
+    fullSizes: Tuple[int, ...]  # extra sizes that only run with --full
+    setup: Callable[[int], object]
+    run: Callable[[object], int]
+
+    def __init__(self, name: str, directory: str, unit: str, sizes: Tuple[int, ...],
+                 setup: Callable[[int], object], run: Callable[[object], int], full_sizes: Tuple[int, ...] = ()):
+        self.name = name
+        self.directory = directory
+        self.unit = unit
+        self.sizes = sizes
+        self.fullSizes = full_sizes
+        self.setup = setup
+        self.run = run
+
+
+# --- U2 hw7: a simulator producing valid elevator logs ---
+
+def _format_floor(floor: int) -> str:
+    return f"F{floor}" if floor >= 1 else f"B{1 - floor}"
+
+
+def _format_ticks(ticks: int) -> str:
+    return f"[{ticks // 10000:>5}.{ticks % 10000:04d}]"
+
+
+@functools.lru_cache(maxsize=3)  # the parse and check workloads share the logs
+def simulate_elevator_log(min_lines: int, seed: int = SEED) -> Tuple[List[str], List[str]]:
+    """
+    Returns (stdin lines, output lines) of a run that passes Checker.check, with
+    at least min_lines output lines. Each passenger is served alone by one of the
+    six elevators (round robin): RECEIVE, move to the origin, OPEN/IN/CLOSE, move
+    to the destination, OPEN/OUT-S/CLOSE, respecting the 0.4 s move and door times.
+    """
+    rng = random.Random(seed)
+    input_lines = []
+    elevator_events: List[List[Tuple[int, str]]] = [[] for _ in range(6)]
+    elevator_time = [0] * 6
+    elevator_floor = [1] * 6
+    arrive = 10000
+    lines = 0
+    index = 0
+    while lines < min_lines:
+        index += 1
+        arrive += rng.randint(0, 3) * 1000
+        from_floor = rng.randint(-3, 7)
+        to_floor = rng.choice([f for f in range(-3, 8) if f != from_floor])
+        input_lines.append(f"[{arrive // 10000}.{arrive % 10000 // 1000}]{index}-PRI-{rng.randint(1, 100)}"
+                           f"-FROM-{_format_floor(from_floor)}-TO-{_format_floor(to_floor)}")
+        e = index % 6
+        events = elevator_events[e]
+        t = max(arrive, elevator_time[e]) + 1000
+        events.append((t, f"RECEIVE-{index}-{e + 1}"))
+        floor = elevator_floor[e]
+        for target, person_op in ((from_floor, f"IN-{index}"), (to_floor, f"OUT-S-{index}")):
+            step = 1 if target > floor else -1
+            while floor != target:
+                floor += step
+                t += 4000
+                events.append((t, f"ARRIVE-{_format_floor(floor)}-{e + 1}"))
+            events.append((t, f"OPEN-{_format_floor(floor)}-{e + 1}"))
+            events.append((t, f"{person_op}-{_format_floor(floor)}-{e + 1}"))
+            t += 4000
+            events.append((t, f"CLOSE-{_format_floor(floor)}-{e + 1}"))
+        elevator_time[e] = t
+        elevator_floor[e] = floor
+        lines = sum(len(events) for events in elevator_events)
+    merged = heapq.merge(*elevator_events, key=lambda event: event[0])
+    return input_lines, [f"{_format_ticks(t)}{body}" for t, body in merged]
+
+
+def _hw7_log(size: int):
+    return simulate_elevator_log(size)
+
+
+def _run_operation_parse(state) -> int:
+    Operation = import_from(HW7_DIR, "Operation")
+    _, lines = state
+    for line in lines:
+        Operation.Operation.parse(line)
+    return len(lines)
+
+
+def _setup_checker(size: int):
+    Checker = import_from(HW7_DIR, "Checker")
+    input_lines, output_lines = simulate_elevator_log(size)
+    records = Checker.parseInputText("\n".join(input_lines))
+    operations = [Checker.Operation.parse(line) for line in output_lines]
+    return records, operations
+
+
+def _run_checker(state) -> int:
+    Checker = import_from(HW7_DIR, "Checker")
+    records, operations = state
+    checker = Checker.createChecker(records, operations)
+    checker.check()
+    checker.calcPerfomanceInfo()
+    return len(operations)
+
+
+def _setup_input_parse(size: int):
+    gen = import_from(HW7_DIR, "gen")
+    return "\n".join(gen.generate_stress_data(size, seed=SEED)) + "\n"
+
+
+def _run_input_parse(text) -> int:
+    Checker = import_from(HW7_DIR, "Checker")
+    records = Checker.parseInputText(text)
+    return len(records.persons) + len(records.scheRequests) + len(records.updateRequests)
+
+
+def _run_gen_stress(size: int) -> int:
+    gen = import_from(HW7_DIR, "gen")
+    return len(gen.generate_stress_data(size, seed=SEED))
+
+
+def _run_gen_hw7_data(cases: int) -> int:
+    gen = import_from(HW7_DIR, "gen")
+    random.seed(SEED)
+    with contextlib.redirect_stdout(io.StringIO()), contextlib.redirect_stderr(io.StringIO()):
+        for _ in range(cases):
+            gen.generate_hw7_data(total_requests_target=100, mutual_mode=True, pattern="dense", max_time_override=2)
+    return cases
+
+
+# --- U3: instruction generators ---
+
+def _u3_generator_run(rel_dir: str, method: str) -> Callable[[int], int]:
+    def run(size: int) -> int:
+        generator = import_from(rel_dir, "generator")
+        random.seed(SEED)
+        with contextlib.redirect_stdout(io.StringIO()):
+            g = generator.Generator()
+            getattr(g, method)(size)
+        return len(g.get_result())
+    return run
+
+
+# --- U4 hw15: LibraryState driven by a reference library ---
+
+U4_DIR = os.path.join("U4", "hw15")
+
+
+def _library_moves(state, date: str) -> List[str]:
+    """Organizing moves of a library that puts every book back on its (hot) shelf."""
+    moves = []
+    for book in state.all_book_copies.values():
+        if book.location in ("bro", "rr", "bs", "hbs"):
+            target = "hbs" if book.isbn in state.hot_isbns_from_last_cycle else "bs"
+            if book.location != target:
+                moves.append(f"[{date}] move {book.id} from {book.location} to {target}")
+    return [str(len(moves)), *moves]
+
+
+def _run_library(commands: int) -> int:
+    checker = import_from(U4_DIR, "checker")
+    random.seed(SEED)
+    checker.errors.clear()
+    state = checker.LibraryState()
+    state.generate_initial_inventory(num_isbn_types_range=(20, 40), copies_per_isbn_range=(1, 4))
+    with contextlib.redirect_stdout(io.StringIO()):
+        for _ in range(commands):
+            cmd = checker.generate_next_command_str(state)
+            date, student_id, action, item, _ = checker.parse_command_from_line(cmd)
+            if student_id == "OPEN":
+                state.process_open_event(cmd, _library_moves(state, date))
+            elif student_id == "CLOSE":
+                state.process_close_event(cmd, _library_moves(state, date))
+            elif action == "borrowed" and state.pre_check_borrow(student_id, item)[0]:
+                state.post_check_borrow_accept(cmd, student_id, item, state.get_book_copy_on_shelf(item).id)
+            elif action == "returned" and state.pre_check_return(student_id, item)[0]:
+                book = state.all_book_copies[item]
+                due = book.borrow_date + datetime.timedelta(days=30 if book.type == "B" else 60)
+                overdue = "overdue" if state.current_date > due else "not overdue"
+                state.post_check_return_accept(cmd, student_id, item, overdue)
+            elif action == "read" and state.pre_check_read(student_id, item)[0]:
+                state.post_check_read_accept(cmd, student_id, item, state.get_book_copy_on_shelf(item).id)
+            elif action == "restored" and state.pre_check_restore(student_id, item)[0]:
+                state.post_check_restore_accept(cmd, student_id, item)
+            elif action == "ordered" and state.pre_check_order(student_id, item)[0]:
+                state.post_check_order_accept(cmd, student_id, item)
+            elif action == "queried" and item == "credit score":
+                student = state.get_student(student_id, False)
+                state.post_check_queried_credit(cmd, student_id, str(student.credits if student else 100))
+    if checker.errors:
+        raise Exception(f"reference library disagrees with LibraryState: {checker.errors[0]}")
+    return commands
+
+
+def _identity(size: int) -> int:
+    return size
+
+
+WORKLOADS: List[Workload] = [
+    Workload("hw7.operation_parse", HW7_DIR, "lines", (1_000, 100_000), _hw7_log, _run_operation_parse,
+             full_sizes=(1_000_000,)),
+    Workload("hw7.checker_check", HW7_DIR, "lines", (1_000, 100_000), _setup_checker, _run_checker,
+             full_sizes=(1_000_000,)),
+    Workload("hw7.input_parse", HW7_DIR, "lines", (1_000, 100_000), _setup_input_parse, _run_input_parse,
+             full_sizes=(1_000_000,)),
+    Workload("hw7.gen_stress", HW7_DIR, "requests", (1_000, 100_000), _identity, _run_gen_stress,
+             full_sizes=(1_000_000,)),
+    Workload("hw7.gen_hw7_data", HW7_DIR, "cases", (100,), _identity, _run_gen_hw7_data),
+    # hw9's Generator scans all person pairs when adding a relation: 10k instructions take minutes.
+    Workload("hw9.generator", os.path.join("U3", "hw9"), "instructions", (1_000, 3_000),
+             _identity, _u3_generator_run(os.path.join("U3", "hw9"), "add_operations")),
+    # hw10's Generator loops forever once all 1000 person ids exist (around 40k instructions).
+    Workload("hw10.generator", os.path.join("U3", "hw10"), "instructions", (10_000,),
+             _identity, _u3_generator_run(os.path.join("U3", "hw10"), "add_operations"), full_sizes=(30_000,)),
+    Workload("hw11.generator", os.path.join("U3", "hw11"), "instructions", (10_000, 50_000),
+             _identity, _u3_generator_run(os.path.join("U3", "hw11"), "add_operations_randomly"),
+             full_sizes=(100_000,)),
+    Workload("hw15.library_state", U4_DIR, "commands", (10_000, 100_000), _identity, _run_library),
+]
+
+
+def by_name() -> Dict[str, Workload]:
+    return {workload.name: workload for workload in WORKLOADS}